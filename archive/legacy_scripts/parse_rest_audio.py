@@ -3,149 +3,286 @@
 Parse REST API responses and extract audio data from Gemini TTS
 """
 
+import argparse
 import json
 import base64
+import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import BinaryIO, Iterator, List, Dict, Any, Optional, Tuple
 
+# Bytes read from the response file per step of the streaming parser
+READ_BLOCK_SIZE = 1024 * 1024
 
-def extract_audio_data_from_response(response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Extract audio data from Gemini REST API response"""
-    audio_chunks = []
-    
-    try:
-        # Navigate through the response structure
-        if 'candidates' in response_data:
-            for candidate in response_data['candidates']:
-                if 'content' in candidate and 'parts' in candidate['content']:
-                    for part in candidate['content']['parts']:
-                        # Look for inline data (audio)
-                        if 'inlineData' in part:
-                            inline_data = part['inlineData']
-                            if 'data' in inline_data and 'mimeType' in inline_data:
-                                audio_chunks.append({
-                                    'data': inline_data['data'],
-                                    'mime_type': inline_data['mimeType'],
-                                    'type': 'base64'
-                                })
-                        # Look for text responses
-                        elif 'text' in part:
-                            print(f"Text response: {part['text'][:100]}...")
-    except Exception as e:
-        print(f"Error extracting audio data: {e}")
-    
-    return audio_chunks
+# Written next to the outputs once every chunk of a response is extracted
+EXTRACTION_MARKER_SUFFIX = '.done'
 
+# Determine file extension from mime type
+AUDIO_EXTENSIONS = {
+    'audio/wav': '.wav',
+    'audio/mp3': '.mp3',
+    'audio/mpeg': '.mp3',
+    'audio/ogg': '.ogg',
+    'audio/webm': '.webm',
+    'audio/mp4': '.mp4',
+    'audio/L16': '.pcm'
+}
 
-def extract_audio_from_streaming_response(response_text: str) -> List[Dict[str, Any]]:
-    """Extract audio data from streaming response (multiple JSON objects)"""
-    audio_chunks = []
-    
-    # Split response by lines and try to parse each as JSON
-    lines = response_text.strip().split('\n')
-    
-    for line in lines:
-        if line.strip():
-            try:
-                # Try to parse each line as JSON
-                data = json.loads(line)
-                chunks = extract_audio_data_from_response(data)
-                audio_chunks.extend(chunks)
-            except json.JSONDecodeError:
-                # Skip non-JSON lines
+_STRING_SPECIAL_RE = re.compile(rb'["\\]')
+_WHITESPACE_RE = re.compile(rb'\s+')
+
+
+class _Base64FileSink:
+    """Decode a base64 string piecewise straight into a file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.carry = b''
+        self.size = 0
+
+    def write(self, piece: bytes) -> None:
+        data = self.carry + piece
+        usable = len(data) - len(data) % 4
+        if usable:
+            decoded = base64.b64decode(data[:usable])
+            self.file.write(decoded)
+            self.size += len(decoded)
+        self.carry = data[usable:]
+
+    def close(self) -> None:
+        if self.carry.strip(b'='):
+            decoded = base64.b64decode(self.carry + b'=' * (-len(self.carry) % 4))
+            self.file.write(decoded)
+            self.size += len(decoded)
+        self.carry = b''
+        self.file.close()
+
+
+def iter_response_strings(stream: BinaryIO,
+                          stream_keys: Tuple[bytes, ...] = (b'data',),
+                          block_size: int = READ_BLOCK_SIZE) -> Iterator[Tuple[str, Any, Any]]:
+    """Incrementally scan JSON, JSON Lines or SSE responses for string values
+
+    Yields ('value', key, text) for string values of ordinary keys, and
+    ('start', key, None) / ('piece', key, raw_bytes) / ('end', key, None)
+    for values of stream_keys, which are never held in memory as a whole.
+    Only string tokens are interpreted; the rest of the JSON structure is
+    skipped, so memory use is bounded by block_size.
+    """
+    buf = b''
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        block = stream.read(block_size)
+        if not block:
+            eof = True
+            return False
+        buf = buf[pos:] + block
+        pos = 0
+        return True
+
+    # Structural bytes since the last string, whitespace removed, truncated
+    separator = b''
+    previous_string: Optional[bytes] = None
+
+    while True:
+        quote = buf.find(b'"', pos)
+        if quote < 0:
+            separator = (separator + _WHITESPACE_RE.sub(b'', buf[pos:]))[:2]
+            pos = len(buf)
+            if not fill():
+                return
+            continue
+
+        separator = (separator + _WHITESPACE_RE.sub(b'', buf[pos:quote]))[:2]
+        key = previous_string if separator == b':' else None
+        pos = quote + 1
+
+        streaming = key in stream_keys
+        if streaming:
+            yield 'start', key.decode(), None
+        raw_parts: List[bytes] = []
+
+        # Read until the closing quote, honouring escapes
+        while True:
+            match = _STRING_SPECIAL_RE.search(buf, pos)
+            if match is None:
+                piece = buf[pos:]
+                pos = len(buf)
+                if piece:
+                    if streaming:
+                        yield 'piece', key.decode(), piece
+                    else:
+                        raw_parts.append(piece)
+                if not fill():
+                    raise ValueError("Truncated response: unterminated JSON string")
                 continue
-    
-    return audio_chunks
 
+            end = match.start()
+            piece = buf[pos:end]
+            if piece:
+                if streaming:
+                    yield 'piece', key.decode(), piece
+                else:
+                    raw_parts.append(piece)
+
+            if buf[end:end + 1] == b'"':
+                pos = end + 1
+                break
+
+            # Backslash escape; make sure the escaped byte is buffered
+            pos = end
+            while len(buf) - pos < 2:
+                if not fill():
+                    raise ValueError("Truncated response: dangling escape")
+            escape = buf[pos:pos + 2]
+            if streaming:
+                # Base64 only ever needs an escaped slash; drop line-wrapping escapes
+                if escape == b'\\/':
+                    yield 'piece', key.decode(), b'/'
+            else:
+                raw_parts.append(escape)
+            pos += 2
+
+        if streaming:
+            yield 'end', key.decode(), None
+            previous_string = None
+        else:
+            raw = b''.join(raw_parts)
+            previous_string = raw
+            if key is not None:
+                yield 'value', key.decode(), json.loads(b'"' + raw + b'"')
+
+        separator = b''
+
+
+def extract_audio_streaming(file_path: str,
+                            output_base: str,
+                            block_size: int = READ_BLOCK_SIZE,
+                            quiet: bool = False) -> Dict[str, Any]:
+    """Stream audio out of a captured REST response file
+
+    Each inlineData.data payload is decoded in pieces directly into its own
+    output file, named <output_base>_<n> with an extension from its MIME
+    type. Text parts are collected as they are encountered.
+    """
+    file_info = {
+        'file_size': os.path.getsize(file_path),
+        'audio_files': [],
+        'audio_bytes': 0,
+        'text_responses': []
+    }
+
+    pending_mime: Optional[str] = None
+    unresolved: Optional[_Base64FileSink] = None
+    sink: Optional[_Base64FileSink] = None
+
+    def finalize(done: _Base64FileSink, mime_type: Optional[str]) -> None:
+        base_type = (mime_type or '').split(';')[0].strip()
+        extension = AUDIO_EXTENSIONS.get(base_type, AUDIO_EXTENSIONS.get(mime_type, '.bin'))
+        final_path = done.path[:-len('.part')] + extension
+        os.replace(done.path, final_path)
+        file_info['audio_files'].append(final_path)
+        file_info['audio_bytes'] += done.size
+        if not quiet:
+            print(f"✓ Saved audio file: {final_path} ({done.size} bytes)")
+
+    with open(file_path, 'rb') as f:
+        for event, key, value in iter_response_strings(f, block_size=block_size):
+            if event == 'value' and key == 'mimeType':
+                if unresolved is not None:
+                    # data came before mimeType in this part
+                    finalize(unresolved, value)
+                    unresolved = None
+                else:
+                    pending_mime = value
+            elif event == 'value' and key == 'text':
+                file_info['text_responses'].append(value)
+                if not quiet:
+                    print(f"Text response: {value[:100]}...")
+            elif event == 'start':
+                if unresolved is not None:
+                    finalize(unresolved, None)
+                    unresolved = None
+                index = len(file_info['audio_files']) + 1
+                sink = _Base64FileSink(f"{output_base}_{index}.part")
+            elif event == 'piece':
+                sink.write(value)
+            elif event == 'end':
+                sink.close()
+                if pending_mime is not None:
+                    finalize(sink, pending_mime)
+                    pending_mime = None
+                else:
+                    unresolved = sink
+                sink = None
+
+    if unresolved is not None:
+        finalize(unresolved, None)
 
-def save_audio_data(audio_data_b64: str, mime_type: str, output_file: str) -> str:
-    """Save base64 encoded audio data to file"""
+    return file_info
+
+
+def extract_and_mark(file_path: str, output_base: str, quiet: bool = False) -> Dict[str, Any]:
+    """extract_audio_streaming, then write the completion marker
+
+    The marker (<output_base>.done) lists the extracted files and is only
+    written after the last of them, so a run that stops partway leaves no
+    marker and the file is extracted again next time.
+    """
+    marker = Path(output_base + EXTRACTION_MARKER_SUFFIX)
+    marker.unlink(missing_ok=True)
+    file_info = extract_audio_streaming(file_path, output_base, quiet=quiet)
+
+    partial = marker.with_name(marker.name + '.part')
+    partial.write_text(json.dumps({'audio_files': [Path(p).name for p in file_info['audio_files']]}))
+    os.replace(partial, marker)
+    return file_info
+
+
+def extraction_is_current(response_file: Path, output_base: str) -> bool:
+    """Check whether a complete extraction of response_file exists and is newer"""
+    marker = Path(output_base + EXTRACTION_MARKER_SUFFIX)
     try:
-        # Decode base64 data
-        audio_bytes = base64.b64decode(audio_data_b64)
-        
-        # Determine file extension from mime type
-        ext_map = {
-            'audio/wav': '.wav',
-            'audio/mp3': '.mp3',
-            'audio/mpeg': '.mp3',
-            'audio/ogg': '.ogg',
-            'audio/webm': '.webm',
-            'audio/mp4': '.mp4',
-            'audio/L16': '.pcm'
-        }
-        
-        file_extension = ext_map.get(mime_type, '.bin')
-        if not output_file.endswith(file_extension):
-            output_file += file_extension
-        
-        # Save to file
-        with open(output_file, 'wb') as f:
-            f.write(audio_bytes)
-        
-        file_size = len(audio_bytes)
-        print(f"✓ Saved audio file: {output_file} ({file_size} bytes)")
-        return output_file
-        
-    except Exception as e:
-        print(f"❌ Error saving audio data: {e}")
-        return None
+        names = json.loads(marker.read_text())['audio_files']
+        outputs = [marker] + [marker.parent / name for name in names]
+        oldest = min(p.stat().st_mtime for p in outputs)
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+    return oldest >= response_file.stat().st_mtime
 
 
-def analyze_response_file(file_path: str) -> Dict[str, Any]:
-    """Analyze a REST API response file"""
-    print(f"\n📊 Analyzing: {file_path}")
-    
+def _extract_worker(response_file: str, output_base: str) -> Dict[str, Any]:
+    """Process pool entry point: extract one response file quietly"""
+    start = time.perf_counter()
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        file_info = {
-            'file_size': len(content),
-            'is_json': False,
-            'is_streaming': False,
-            'audio_chunks': [],
-            'text_responses': []
-        }
-        
-        # Check if it's streaming response (multiple JSON objects)
-        if content.strip().startswith('{') and '\n{' in content:
-            file_info['is_streaming'] = True
-            print("  - Detected streaming response format")
-            audio_chunks = extract_audio_from_streaming_response(content)
-        else:
-            # Try to parse as single JSON
-            try:
-                data = json.loads(content)
-                file_info['is_json'] = True
-                print("  - Valid JSON format detected")
-                audio_chunks = extract_audio_data_from_response(data)
-            except json.JSONDecodeError:
-                print("  - Not valid JSON format")
-                audio_chunks = []
-        
-        file_info['audio_chunks'] = audio_chunks
-        print(f"  - Found {len(audio_chunks)} audio chunks")
-        
-        # Look for text responses
-        if 'text' in content.lower():
-            # Extract text responses using regex
-            text_matches = re.findall(r'"text":\s*"([^"]*)"', content)
-            file_info['text_responses'] = text_matches
-            if text_matches:
-                print(f"  - Found {len(text_matches)} text responses")
-        
-        return file_info
-        
-    except Exception as e:
-        print(f"❌ Error analyzing file: {e}")
-        return None
+        file_info = extract_and_mark(response_file, output_base, quiet=True)
+        file_info['error'] = None
+    except (OSError, ValueError) as e:
+        file_info = {'file_size': 0, 'audio_files': [], 'audio_bytes': 0,
+                     'text_responses': [], 'error': str(e)}
+    file_info['file'] = response_file
+    file_info['elapsed'] = time.perf_counter() - start
+    return file_info
 
 
-def process_all_response_files(output_dir: str = ".tmp/outputs"):
-    """Process all JSON response files in the output directory"""
+def process_all_response_files(output_dir: str = ".tmp/outputs",
+                               jobs: Optional[int] = None,
+                               force: bool = False):
+    """Process all JSON response files in the output directory
+
+    jobs > 1 spreads files over a process pool (0 means one per CPU).
+    Files already extracted completely (see extraction_is_current) are
+    skipped unless force is set.
+    """
     output_path = Path(output_dir)
     if not output_path.exists():
         print(f"❌ Output directory not found: {output_dir}")
@@ -161,60 +298,104 @@ def process_all_response_files(output_dir: str = ".tmp/outputs"):
     
     print(f"📁 Found {len(response_files)} response files to process")
     
+    work = []
+    skipped = 0
+    for response_file in sorted(response_files):
+        output_base = str(output_path / f"{response_file.stem}_audio")
+        if not force and extraction_is_current(response_file, output_base):
+            skipped += 1
+            continue
+        work.append((str(response_file), output_base))
+    
+    if skipped:
+        print(f"⏭️  Skipping {skipped} files with up-to-date extracted audio")
+    
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    
     all_audio_files = []
+    input_bytes = 0
+    audio_bytes = 0
+    start = time.perf_counter()
     
-    for response_file in response_files:
-        print(f"\n{'='*60}")
-        file_info = analyze_response_file(str(response_file))
-        
-        if file_info and file_info['audio_chunks']:
-            print(f"\n🎵 Extracting audio from {response_file.name}...")
+    if jobs and jobs > 1 and len(work) > 1:
+        print(f"⚙️  Extracting with {jobs} worker processes")
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_extract_worker, path, base) for path, base in work]
+            for future in as_completed(futures):
+                file_info = future.result()
+                if file_info['error']:
+                    print(f"❌ {Path(file_info['file']).name}: {file_info['error']}")
+                    continue
+                print(f"  ✓ {Path(file_info['file']).name}: {len(file_info['audio_files'])} audio chunks "
+                      f"in {file_info['elapsed']:.2f}s")
+                all_audio_files.extend(file_info['audio_files'])
+                input_bytes += file_info['file_size']
+                audio_bytes += file_info['audio_bytes']
+    else:
+        for response_file, output_base in work:
+            print(f"\n{'='*60}")
+            print(f"\n📊 Analyzing: {response_file}")
+            
+            try:
+                file_info = extract_and_mark(response_file, output_base)
+            except (OSError, ValueError) as e:
+                print(f"❌ Error processing file: {e}")
+                continue
             
-            for i, chunk in enumerate(file_info['audio_chunks']):
-                output_name = f"{response_file.stem}_audio_{i+1}"
-                output_file = str(response_path := output_path / output_name)
-                
-                saved_file = save_audio_data(
-                    chunk['data'], 
-                    chunk['mime_type'], 
-                    output_file
-                )
-                
-                if saved_file:
-                    all_audio_files.append(saved_file)
+            print(f"  - Found {len(file_info['audio_files'])} audio chunks")
+            all_audio_files.extend(file_info['audio_files'])
+            input_bytes += file_info['file_size']
+            audio_bytes += file_info['audio_bytes']
+    
+    elapsed = max(time.perf_counter() - start, 1e-9)
     
     print(f"\n{'='*60}")
     print(f"✅ Processing complete!")
     print(f"📁 Total audio files extracted: {len(all_audio_files)}")
+    print(f"⏱️  {len(work)} files in {elapsed:.2f}s: {len(work) / elapsed:.1f} files/s, "
+          f"{input_bytes / elapsed / 1e6:.1f} MB/s read, {audio_bytes / elapsed / 1e6:.1f} MB/s audio")
     
     if all_audio_files:
         print("\nExtracted audio files:")
-        for audio_file in all_audio_files:
+        for audio_file in sorted(all_audio_files):
             print(f"  - {audio_file}")
 
 
 def main():
     """Main function to parse REST API responses"""
+    parser = argparse.ArgumentParser(description="Extract audio from Gemini REST API responses")
+    parser.add_argument("file", nargs="?", help="Single response file to process")
+    parser.add_argument("-d", "--output-dir", default=".tmp/outputs",
+                        help="Directory of response files to process (default: .tmp/outputs)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Worker processes for directory mode, 0 = one per CPU (default: 1)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-extract files even if their audio is up to date")
+    args = parser.parse_args()
+    
     print("🔊 Gemini REST API Audio Parser")
     print("=================================")
     
-    if len(sys.argv) > 1:
+    if args.file:
         # Process specific file
-        file_path = sys.argv[1]
+        file_path = args.file
         if not Path(file_path).exists():
             print(f"❌ File not found: {file_path}")
             return 1
         
-        file_info = analyze_response_file(file_path)
+        print(f"\n📊 Analyzing: {file_path}")
+        print(f"\n🎵 Extracting audio data...")
+        try:
+            file_info = extract_audio_streaming(file_path, "extracted_audio")
+        except (OSError, ValueError) as e:
+            print(f"❌ Error processing file: {e}")
+            return 1
         
-        if file_info and file_info['audio_chunks']:
-            print(f"\n🎵 Extracting audio data...")
-            for i, chunk in enumerate(file_info['audio_chunks']):
-                output_name = f"extracted_audio_{i+1}"
-                save_audio_data(chunk['data'], chunk['mime_type'], output_name)
+        print(f"  - Found {len(file_info['audio_files'])} audio chunks")
     else:
         # Process all files in output directory
-        process_all_response_files()
+        process_all_response_files(args.output_dir, jobs=args.jobs, force=args.force)
     
     return 0
 
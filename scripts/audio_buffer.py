@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+PCM audio with its format attached
+An AudioBuffer carries sample rate, bit depth and channel count next to
+the PCM, so the MIME type is parsed once when audio arrives instead of
+by every helper it passes through. Durations come from the byte count,
+time slices are memoryviews over the same storage, and WAV files are
+written with one writev() of header and data instead of concatenating
+them first.
+"""
+
+import os
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple, Union
+
+from wav_io import build_wav_header
+
+DEFAULT_SAMPLE_RATE = 24000
+DEFAULT_BITS_PER_SAMPLE = 16
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+@lru_cache(maxsize=64)
+def parse_audio_mime_type(mime_type: str) -> Tuple[int, int]:
+    """(sample_rate, bits_per_sample) from a MIME type such as audio/L16;rate=24000"""
+    bits_per_sample = DEFAULT_BITS_PER_SAMPLE
+    rate = DEFAULT_SAMPLE_RATE
+
+    for param in mime_type.split(";"):
+        param = param.strip()
+        if param.lower().startswith("rate="):
+            try:
+                rate = int(param.split("=", 1)[1])
+            except (ValueError, IndexError):
+                pass
+        elif param.startswith("audio/L"):
+            try:
+                bits_per_sample = int(param.split("L", 1)[1])
+            except (ValueError, IndexError):
+                pass
+
+    return rate, bits_per_sample
+
+
+def write_all(fd: int, buffers: Iterable[BytesLike]) -> int:
+    """Write buffers back to back with writev(), resuming after short writes"""
+    views = [memoryview(b).cast("B") for b in buffers if len(b)]
+    total = 0
+    while views:
+        if hasattr(os, "writev"):
+            written = os.writev(fd, views)
+        else:
+            written = os.write(fd, views[0])
+        total += written
+        while views and written >= len(views[0]):
+            written -= len(views.pop(0))
+        if written:
+            views[0] = views[0][written:]
+    return total
+
+
+class AudioBuffer:
+    """PCM samples plus their format
+
+    Buffers built from a bytearray (or empty) own their storage and can be
+    appended to in place; anything else is wrapped read-only without
+    copying and is copied once on the first append. Slices borrow the
+    storage, so release them before appending to the buffer they came from.
+    """
+
+    __slots__ = ("pcm", "sample_rate", "bits_per_sample", "num_channels")
+
+    def __init__(self,
+                 pcm: Optional[BytesLike] = None,
+                 sample_rate: int = DEFAULT_SAMPLE_RATE,
+                 bits_per_sample: int = DEFAULT_BITS_PER_SAMPLE,
+                 num_channels: int = 1):
+        if pcm is None:
+            pcm = bytearray()
+        self.pcm: Union[bytearray, memoryview] = pcm if isinstance(pcm, bytearray) else memoryview(pcm)
+        self.sample_rate = sample_rate
+        self.bits_per_sample = bits_per_sample
+        self.num_channels = num_channels
+
+    @classmethod
+    def from_mime(cls, mime_type: str, pcm: Optional[BytesLike] = None) -> "AudioBuffer":
+        """Buffer in the format described by a raw PCM MIME type"""
+        sample_rate, bits_per_sample = parse_audio_mime_type(mime_type)
+        return cls(pcm, sample_rate, bits_per_sample)
+
+    @property
+    def format(self) -> Tuple[int, int, int]:
+        return (self.sample_rate, self.bits_per_sample, self.num_channels)
+
+    @property
+    def block_align(self) -> int:
+        return self.num_channels * (self.bits_per_sample // 8)
+
+    @property
+    def byte_rate(self) -> int:
+        return self.sample_rate * self.block_align
+
+    @property
+    def num_frames(self) -> int:
+        return len(self.pcm) // self.block_align
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds, from the byte count alone"""
+        return len(self.pcm) / self.byte_rate
+
+    @property
+    def data(self) -> memoryview:
+        """The PCM as a memoryview, without copying"""
+        return memoryview(self.pcm)
+
+    def __len__(self) -> int:
+        return len(self.pcm)
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.pcm)
+
+    def __repr__(self) -> str:
+        return (f"AudioBuffer({self.duration:.3f}s, {self.sample_rate} Hz, "
+                f"{self.bits_per_sample}-bit, {self.num_channels} ch)")
+
+    def frames(self, start: int, end: Optional[int] = None) -> "AudioBuffer":
+        """Zero-copy view of frames [start, end)"""
+        block_align = self.block_align
+        stop = len(self.pcm) if end is None else end * block_align
+        view = memoryview(self.pcm)[start * block_align:stop]
+        return AudioBuffer(view, self.sample_rate, self.bits_per_sample, self.num_channels)
+
+    def slice(self, start_seconds: float, end_seconds: Optional[float] = None) -> "AudioBuffer":
+        """Zero-copy view of the audio between two times, rounded to whole frames"""
+        end = None if end_seconds is None else int(round(end_seconds * self.sample_rate))
+        return self.frames(int(round(start_seconds * self.sample_rate)), end)
+
+    def release(self) -> None:
+        """Give up a borrowed view so the buffer it came from can grow again"""
+        if isinstance(self.pcm, memoryview):
+            self.pcm.release()
+            self.pcm = memoryview(b"")
+
+    def append(self, audio: Union["AudioBuffer", BytesLike]) -> "AudioBuffer":
+        """Append PCM or a same-format buffer in place"""
+        if isinstance(audio, AudioBuffer):
+            if audio.format != self.format:
+                raise ValueError(f"Cannot append {audio.format} audio to {self.format} audio "
+                                 "(sample_rate, bits_per_sample, num_channels)")
+            audio = audio.pcm
+        if not isinstance(self.pcm, bytearray):
+            self.pcm = bytearray(self.pcm)
+        self.pcm += audio
+        return self
+
+    def append_silence(self, seconds: float) -> "AudioBuffer":
+        """Append exact digital silence for the given duration"""
+        if seconds <= 0:
+            return self
+        size = int(round(seconds * self.sample_rate)) * self.block_align
+        # 8-bit PCM is unsigned, so its zero level is 0x80
+        return self.append(b"\x80" * size if self.bits_per_sample == 8 else bytes(size))
+
+    def wav_header(self) -> bytes:
+        return build_wav_header(len(self.pcm), self.sample_rate, self.bits_per_sample, self.num_channels)
+
+    def to_wav(self) -> bytes:
+        """Complete WAV file contents; prefer write_wav() for files"""
+        return self.wav_header() + self.pcm
+
+    def write_wav(self, fd: int) -> int:
+        """Write header and PCM to fd in one writev() call where possible"""
+        return write_all(fd, (self.wav_header(), self.pcm))
+
+    def save_wav(self, path: Union[str, os.PathLike]) -> str:
+        with open(path, "wb", buffering=0) as f:
+            self.write_wav(f.fileno())
+        return os.fspath(path)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Spill-to-disk accumulator for synthesized audio
+Long episodes are gathered in an AudioSpool instead of a list of chunks:
+PCM stays in one growing bytearray until it passes the spill threshold,
+then moves to a temp file that later writes reach directly. Saving copies
+from the file kernel-side (wav_io.copy_range), so a spilled episode never
+has to be held in memory again.
+"""
+
+import mmap
+import os
+import tempfile
+from typing import Optional, Union
+
+from tts_logging import get_logger
+from wav_io import copy_range
+
+SPILL_MB_ENV = "GEMINI_TTS_SPILL_MB"
+SPILL_DIR_ENV = "GEMINI_TTS_SPILL_DIR"
+
+# 256 MiB is roughly 90 minutes of 24 kHz 16-bit mono audio
+DEFAULT_SPILL_MB = 256.0
+
+logger = get_logger("spool")
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def spill_threshold_from_env() -> Optional[int]:
+    """Spill threshold in bytes from GEMINI_TTS_SPILL_MB; 0 disables spilling"""
+    megabytes = float(os.getenv(SPILL_MB_ENV, DEFAULT_SPILL_MB))
+    return int(megabytes * 1024 * 1024) if megabytes > 0 else None
+
+
+class AudioSpool:
+    """Append-only byte store that moves from memory to a temp file past a threshold
+
+    Views returned by view() borrow the storage; release them before
+    writing again or closing.
+    """
+
+    __slots__ = ("threshold", "directory", "size", "path", "_buffer", "_file", "_mmap")
+
+    def __init__(self, threshold: Optional[int] = None, directory: Optional[str] = None):
+        self.threshold = threshold
+        self.directory = directory
+        self.size = 0
+        self.path: Optional[str] = None
+        self._buffer = bytearray()
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def write(self, data: BytesLike) -> None:
+        if self._file is not None:
+            self._release_view()
+            self._file.write(data)
+        else:
+            self._buffer += data
+            if self.threshold is not None and len(self._buffer) > self.threshold:
+                self.spill()
+        self.size += len(data)
+
+    def spill(self) -> None:
+        """Move buffered audio to a temp file; later writes go straight to it"""
+        if self._file is not None:
+            return
+        fd, self.path = tempfile.mkstemp(prefix="gemini_tts_", suffix=".pcm", dir=self.directory)
+        self._file = os.fdopen(fd, "wb+")
+        self._file.write(self._buffer)
+        logger.info("💾 Spilled %.1f MiB of audio to %s", len(self._buffer) / (1024 * 1024), self.path,
+                    extra={"spill_bytes": len(self._buffer), "spill_path": self.path})
+        # Drop the in-memory copy, not just its contents
+        self._buffer = bytearray()
+
+    def view(self) -> memoryview:
+        """All audio written so far, without copying"""
+        if self._file is None:
+            return memoryview(self._buffer)
+        if self._mmap is None:
+            self._file.flush()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)[:self.size]
+
+    def copy_to(self, dst_fd: int, offset: int = 0, count: Optional[int] = None) -> None:
+        """Write a byte range to dst_fd at its current position"""
+        count = self.size - offset if count is None else count
+        if count <= 0:
+            return
+        if self._file is None:
+            view = memoryview(self._buffer)[offset:offset + count]
+            while view:
+                view = view[os.write(dst_fd, view):]
+            return
+        self._file.flush()
+        copy_range(self._file.fileno(), dst_fd, offset, count)
+
+    def _release_view(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def close(self) -> None:
+        """Free the buffer and delete the temp file, if any"""
+        self._release_view()
+        self._buffer = bytearray()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.unlink(self.path)
+
+    def __enter__(self) -> "AudioSpool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
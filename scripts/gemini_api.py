@@ -1,31 +1,270 @@
 #!/usr/bin/env python3
 """
 Gemini API wrapper for podcast generation and TTS
+Lightweight REST/SSE client over a pooled requests.Session, so callers
+don't need to import the google-genai SDK
 """
 
+import base64
+import json
 import os
 import requests
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from typing import Optional, Callable, Dict, Any, Iterable, Iterator, List, Sequence, Tuple, Union
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com"
+API_VERSION = "v1beta"
+
+# Overrides the API host, e.g. to point at the local stand-in (gemini_standin.py)
+BASE_URL_ENV = "GEMINI_API_BASE_URL"
+DEFAULT_POOL_SIZE = 10
+
+# (connect, read) timeouts in seconds; read applies between streamed bytes
+DEFAULT_TIMEOUT = (10.0, 120.0)
+
+# Request templates kept per (voice | speaker map, temperature)
+CONFIG_CACHE_SIZE = 256
+
+# Stands in for the request text while a payload template is serialized
+_TEXT_SLOT = "\x00text\x00"
+
+
+class GeminiAPIError(RuntimeError):
+    """HTTP or payload error returned by the Gemini REST API"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def iter_sse_data(lines: Iterable[bytes]) -> Iterator[str]:
+    """Yield the data payload of each server-sent event"""
+    data_lines: List[str] = []
+    for raw_line in lines:
+        line = raw_line.decode("utf-8") if isinstance(raw_line, bytes) else raw_line
+        line = line.rstrip("\r")
+
+        if not line:
+            if data_lines:
+                yield "\n".join(data_lines)
+                data_lines = []
+            continue
+
+        if line.startswith(":"):
+            continue  # SSE comment / keep-alive
+
+        field, _, value = line.partition(":")
+        if field == "data":
+            data_lines.append(value[1:] if value.startswith(" ") else value)
+
+    if data_lines:
+        yield "\n".join(data_lines)
+
+
+def speech_generation_config(voice_name: Optional[str] = None,
+                             speaker_voices: Optional[Sequence[Tuple[str, str]]] = None,
+                             temperature: float = 0.8) -> Dict[str, Any]:
+    """Build the REST generationConfig for single or multi-speaker speech"""
+    if speaker_voices:
+        speech_config = {
+            "multiSpeakerVoiceConfig": {
+                "speakerVoiceConfigs": [
+                    {
+                        "speaker": speaker,
+                        "voiceConfig": {"prebuiltVoiceConfig": {"voiceName": voice}},
+                    }
+                    for speaker, voice in speaker_voices
+                ]
+            }
+        }
+    else:
+        speech_config = {
+            "voiceConfig": {"prebuiltVoiceConfig": {"voiceName": voice_name or "Zephyr"}}
+        }
+
+    return {
+        "temperature": temperature,
+        "responseModalities": ["AUDIO"],
+        "speechConfig": speech_config,
+    }
+
+
+@lru_cache(maxsize=CONFIG_CACHE_SIZE)
+def speech_payload_template(voice_name: Optional[str],
+                            speaker_voices: Optional[Tuple[Tuple[str, str], ...]],
+                            temperature: float) -> Tuple[str, str]:
+    """JSON before and after the text of a speech request, serialized once per voice setup"""
+    payload = {
+        "contents": [{"role": "user", "parts": [{"text": _TEXT_SLOT}]}],
+        "generationConfig": speech_generation_config(voice_name, speaker_voices, temperature),
+    }
+    prefix, suffix = json.dumps(payload).split(json.dumps(_TEXT_SLOT))
+    return prefix, suffix
+
+
+def speech_payload(text: str,
+                   voice_name: Optional[str] = "Zephyr",
+                   speaker_voices: Optional[Sequence[Tuple[str, str]]] = None,
+                   temperature: float = 0.8) -> str:
+    """Serialized streamGenerateContent body for a speech request"""
+    if speaker_voices:
+        speaker_voices = tuple((speaker, voice) for speaker, voice in speaker_voices)
+    prefix, suffix = speech_payload_template(voice_name, speaker_voices or None, temperature)
+    return prefix + json.dumps(text) + suffix
+
 
 class GeminiAPI:
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 model: Optional[str] = None,
+                 base_url: Optional[str] = None,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT):
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
         if not self.api_key:
             raise ValueError("Gemini API key not found in environment variables")
-        
+
         self.model = model or os.getenv('GEMINI_TTS_MODEL', 'gemini-2.5-flash-preview-tts')
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta"
-        
-    def generate_text(self, prompt: str, model: Optional[str] = None) -> str:
+        self.text_model = os.getenv('GEMINI_TEXT_MODEL', 'gemini-2.5-flash')
+        self.base_url = (base_url or os.getenv(BASE_URL_ENV) or DEFAULT_BASE_URL).rstrip("/")
+        self.timeout = timeout
+
+        # Keep-alive connections are reused across requests and threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "x-goog-api-key": self.api_key,
+            "Content-Type": "application/json",
+        })
+
+    def _url(self, model: str, method: str) -> str:
+        return f"{self.base_url}/{API_VERSION}/models/{model}:{method}"
+
+    def _post(self, url: str, payload: Union[Dict[str, Any], str], stream: bool = False,
+              params: Optional[Dict[str, str]] = None) -> requests.Response:
+        data = payload if isinstance(payload, str) else json.dumps(payload)
+        response = self.session.post(url, data=data, params=params,
+                                     stream=stream, timeout=self.timeout)
+        return self._check(response)
+
+    def _check(self, response: requests.Response) -> requests.Response:
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("error", {}).get("message", response.text)
+            except ValueError:
+                message = response.text
+            response.close()
+            raise GeminiAPIError(f"Gemini API error {response.status_code}: {message}",
+                                 status_code=response.status_code)
+        return response
+
+    def list_models(self, page_size: int = 1000) -> List[Dict[str, Any]]:
+        """Every model visible to the API key, following nextPageToken"""
+        url = f"{self.base_url}/{API_VERSION}/models"
+        params = {"pageSize": str(page_size)}
+        models: List[Dict[str, Any]] = []
+        while True:
+            response = self._check(self.session.get(url, params=params, timeout=self.timeout))
+            body = response.json()
+            models.extend(body.get("models") or ())
+            if not body.get("nextPageToken"):
+                return models
+            params["pageToken"] = body["nextPageToken"]
+
+    def stream_generate_content(self, payload: Union[Dict[str, Any], str],
+                                model: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """POST streamGenerateContent with SSE and yield each parsed response chunk
+
+        payload is a request dict or an already serialized JSON body.
+        """
+        url = self._url(model or self.model, "streamGenerateContent")
+        response = self._post(url, payload, stream=True, params={"alt": "sse"})
+        try:
+            for data in iter_sse_data(response.iter_lines(chunk_size=64 * 1024)):
+                try:
+                    chunk = json.loads(data)
+                except ValueError as e:
+                    raise GeminiAPIError(f"Malformed SSE payload: {e}") from e
+                if "error" in chunk:
+                    error = chunk["error"]
+                    raise GeminiAPIError(f"Gemini API error: {error.get('message', error)}",
+                                         status_code=error.get("code"))
+                yield chunk
+        finally:
+            response.close()
+
+    def stream_speech(self,
+                      text: str,
+                      voice_name: Optional[str] = "Zephyr",
+                      speaker_voices: Optional[Sequence[Tuple[str, str]]] = None,
+                      temperature: float = 0.8,
+                      model: Optional[str] = None,
+                      on_built: Optional[Callable[[], None]] = None) -> Iterator[Tuple[bytes, str]]:
+        """Stream synthesized audio as (pcm_bytes, mime_type) pairs as they arrive
+
+        on_built is called once the payload is ready, just before sending.
+        """
+        payload = speech_payload(text, voice_name, speaker_voices, temperature)
+        if on_built is not None:
+            on_built()
+
+        for chunk in self.stream_generate_content(payload, model=model):
+            for candidate in chunk.get("candidates") or ():
+                for part in (candidate.get("content") or {}).get("parts") or ():
+                    inline_data = part.get("inlineData")
+                    if inline_data and inline_data.get("data"):
+                        yield (base64.b64decode(inline_data["data"]),
+                               inline_data.get("mimeType", "audio/wav"))
+
+    def generate_text(self, prompt: str, model: Optional[str] = None,
+                      temperature: float = 0.8) -> str:
         """Generate text using Gemini API"""
-        model = model or self.model
-        # Implementation will be added based on your examples
-        pass
-    
-    def text_to_speech(self, text: str, voice: str = "default") -> bytes:
-        """Convert text to speech using Gemini TTS"""
-        # Implementation will be added based on your examples
-        pass
+        payload = {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": {"temperature": temperature},
+        }
+        response = self._post(self._url(model or self.text_model, "generateContent"), payload)
+        result = response.json()
+
+        texts = []
+        for candidate in result.get("candidates") or ():
+            for part in (candidate.get("content") or {}).get("parts") or ():
+                if "text" in part:
+                    texts.append(part["text"])
+        return "".join(texts)
+
+    def stream_text(self, prompt: str, model: Optional[str] = None,
+                    temperature: float = 0.8) -> Iterator[str]:
+        """Generate text with streamGenerateContent, yielding each part as it arrives"""
+        payload = {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": {"temperature": temperature},
+        }
+        for chunk in self.stream_generate_content(payload, model=model or self.text_model):
+            for candidate in chunk.get("candidates") or ():
+                for part in (candidate.get("content") or {}).get("parts") or ():
+                    if part.get("text"):
+                        yield part["text"]
+
+    def text_to_speech(self, text: str, voice: str = "Zephyr", temperature: float = 0.8) -> bytes:
+        """Convert text to speech using Gemini TTS, returning raw PCM"""
+        audio = b"".join(pcm for pcm, _ in self.stream_speech(text, voice_name=voice,
+                                                              temperature=temperature))
+        if not audio:
+            raise RuntimeError("No audio data generated")
+        return audio
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "GeminiAPI":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 if __name__ == "__main__":
     # Basic test
@@ -33,4 +272,4 @@ if __name__ == "__main__":
         gemini = GeminiAPI()
         print("Gemini API initialized successfully")
     except ValueError as e:
-        print(f"Error: {e}")
\ No newline at end of file
+        print(f"Error: {e}")
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Deterministic local stand-in for the Gemini REST API
+Emulates streamGenerateContent/generateContent for TTS and text models with
+configurable latency, throughput, error, 429 and stall injection, so
+GeminiTTS, GeminiAPI and the bash tools can be benchmarked offline.
+
+Point clients at it with:
+    export GEMINI_API_BASE_URL=http://127.0.0.1:8089
+"""
+
+import argparse
+import base64
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+BASE_URL_ENV = "GEMINI_API_BASE_URL"
+DEFAULT_PORT = 8089
+
+STANDIN_MODELS = (
+    "gemini-2.5-flash-preview-tts",
+    "gemini-2.5-pro-preview-tts",
+    "gemini-2.5-flash",
+    "gemini-2.5-pro",
+)
+
+TONE_HZ = 220.0
+TONE_AMPLITUDE = 0.25
+
+
+class StandInConfig(NamedTuple):
+    """Latency, throughput and fault injection settings"""
+    ttfc_seconds: float = 0.3
+    # 4x real time for 24 kHz 16-bit mono
+    bytes_per_second: float = 192000.0
+    chunk_seconds: float = 0.5
+    # Speech rate used to size generated audio from the request text
+    chars_per_second: float = 15.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    stall_rate: float = 0.0
+    stall_seconds: float = 5.0
+    seed: int = 0
+    sample_rate: int = 24000
+
+
+def _tone(sample_rate: int) -> bytes:
+    """One second of a quiet sine tone as 16-bit little-endian PCM"""
+    peak = TONE_AMPLITUDE * 32767
+    samples = array("h", (int(peak * math.sin(2 * math.pi * TONE_HZ * i / sample_rate))
+                          for i in range(sample_rate)))
+    return samples.tobytes()
+
+
+def synthesize_pcm(text: str, config: StandInConfig, tone: Optional[bytes] = None) -> bytes:
+    """Deterministic PCM whose duration follows the text length"""
+    tone = tone or _tone(config.sample_rate)
+    seconds = max(0.5, len(text) / config.chars_per_second)
+    size = int(seconds * config.sample_rate) * 2
+    repeats = size // len(tone) + 1
+    return (tone * repeats)[:size]
+
+
+def script_for_prompt(prompt: str) -> str:
+    """Canned two-speaker script so text generation works offline"""
+    topic = " ".join(prompt.split()[:8]) or "the topic"
+    turns = [
+        f"Host: Welcome to the show. Today we are talking about {topic}.",
+        "Guest: Thanks for having me, it is a subject I care about a lot.",
+        "Host: Let's start with the basics. Why does it matter?",
+        "Guest: Mostly because small details add up over time.",
+        "Host: That is a great place to wrap up. Thanks for listening!",
+    ]
+    return "\n".join(turns) + "\n"
+
+
+def _request_text(payload: Dict[str, Any]) -> str:
+    return "".join(
+        part.get("text", "")
+        for content in payload.get("contents") or ()
+        for part in content.get("parts") or ()
+    )
+
+
+def _error_body(code: int, status: str, message: str) -> Dict[str, Any]:
+    error: Dict[str, Any] = {"code": code, "message": message, "status": status}
+    if code == 429:
+        error["details"] = [{
+            "@type": "type.googleapis.com/google.rpc.RetryInfo",
+            "retryDelay": "1s",
+        }]
+    return {"error": error}
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: StandInConfig):
+        super().__init__(address, _StandInHandler)
+        self.config = config
+        self.tone = _tone(config.sample_rate)
+        self.lock = threading.Lock()
+        self.attempts: Dict[int, int] = {}
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0,
+                      "stalls": 0, "audio_bytes": 0}
+
+    def count(self, key: str, amount: int = 1) -> None:
+        with self.lock:
+            self.stats[key] += amount
+
+    def roll(self, body: bytes) -> random.Random:
+        """Per-request RNG keyed by body and attempt, independent of arrival order"""
+        key = zlib.crc32(body)
+        with self.lock:
+            attempt = self.attempts.get(key, 0) + 1
+            self.attempts[key] = attempt
+        return random.Random(f"{self.config.seed}:{key}:{attempt}")
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _StandInHTTPServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # keep benchmark output clean
+
+    # -- responses ---------------------------------------------------------
+
+    def _send_json(self, code: int, body: Dict[str, Any],
+                   headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, code: int, status: str, message: str) -> None:
+        headers = {"Retry-After": "1"} if code == 429 else None
+        self._send_json(code, _error_body(code, status, message), headers)
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    # -- routing -----------------------------------------------------------
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path.rstrip("/").endswith("/models"):
+            models = [{"name": f"models/{name}", "displayName": name} for name in STANDIN_MODELS]
+            self._send_json(200, {"models": models})
+        else:
+            self._send_error(404, "NOT_FOUND", f"Unknown path: {path}")
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.server.count("requests")
+
+        query = parse_qs(url.query)
+        if not (self.headers.get("x-goog-api-key") or query.get("key")):
+            self._send_error(403, "PERMISSION_DENIED", "Method doesn't allow unregistered callers")
+            return
+
+        model, _, method = url.path.rpartition("/models/")[2].partition(":")
+        if method not in ("streamGenerateContent", "generateContent"):
+            self._send_error(404, "NOT_FOUND", f"Unknown method: {url.path}")
+            return
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            self._send_error(400, "INVALID_ARGUMENT", "Invalid JSON payload")
+            return
+
+        config = self.server.config
+        rng = self.server.roll(body)
+        fault = rng.random()
+        if fault < config.rate_limit_rate:
+            self.server.count("rate_limited")
+            self._send_error(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (stand-in)")
+            return
+        if fault < config.rate_limit_rate + config.error_rate:
+            self.server.count("errors")
+            self._send_error(500, "INTERNAL", "An internal error has occurred (stand-in)")
+            return
+
+        text = _request_text(payload)
+        parts = (self._audio_parts(text) if "tts" in model
+                 else self._text_parts(script_for_prompt(text)))
+
+        if method == "generateContent":
+            time.sleep(config.ttfc_seconds)
+            merged = list(parts)
+            if "tts" in model:
+                audio = b"".join(base64.b64decode(p["inlineData"]["data"]) for p in merged)
+                merged = [{"inlineData": {"mimeType": merged[0]["inlineData"]["mimeType"],
+                                          "data": base64.b64encode(audio).decode("ascii")}}]
+            else:
+                merged = [{"text": "".join(p["text"] for p in merged)}]
+            self._send_json(200, self._response(merged))
+            return
+
+        stall_at = rng.randrange(len(parts)) if rng.random() < config.stall_rate else None
+        self._stream(parts, sse=query.get("alt") == ["sse"], stall_at=stall_at)
+
+    # -- generation --------------------------------------------------------
+
+    def _audio_parts(self, text: str) -> List[Dict[str, Any]]:
+        config = self.server.config
+        pcm = synthesize_pcm(text, config, self.server.tone)
+        step = max(2, int(config.chunk_seconds * config.sample_rate) * 2)
+        mime_type = f"audio/L16;codec=pcm;rate={config.sample_rate}"
+        return [
+            {"inlineData": {"mimeType": mime_type,
+                            "data": base64.b64encode(pcm[i:i + step]).decode("ascii")}}
+            for i in range(0, len(pcm), step)
+        ]
+
+    @staticmethod
+    def _text_parts(script: str) -> List[Dict[str, Any]]:
+        lines = script.splitlines(keepends=True)
+        return [{"text": "".join(lines[i:i + 2])} for i in range(0, len(lines), 2)]
+
+    @staticmethod
+    def _response(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {"candidates": [{"content": {"role": "model", "parts": parts}, "index": 0}]}
+
+    def _frames(self, parts: List[Dict[str, Any]], sse: bool) -> Iterator[Tuple[bytes, int]]:
+        """Encoded response frames with the payload bytes each one carries"""
+        for i, part in enumerate(parts):
+            data = json.dumps(self._response([part])).encode("utf-8")
+            size = len(part.get("inlineData", {}).get("data", "")) * 3 // 4 or len(part.get("text", ""))
+            if sse:
+                yield b"data: " + data + b"\r\n\r\n", size
+            else:
+                yield (b"[" if i == 0 else b",\r\n") + data, size
+        if not sse:
+            yield b"]", 0
+
+    def _stream(self, parts: List[Dict[str, Any]], sse: bool, stall_at: Optional[int]) -> None:
+        config = self.server.config
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if sse else "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        time.sleep(config.ttfc_seconds)
+        started = time.monotonic()
+        sent = 0
+        try:
+            for i, (frame, size) in enumerate(self._frames(parts, sse)):
+                if i == stall_at:
+                    self.server.count("stalls")
+                    time.sleep(config.stall_seconds)
+                    started += config.stall_seconds
+                delay = started + sent / config.bytes_per_second - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                self._write_chunk(frame)
+                sent += size
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+            return
+        self.server.count("audio_bytes", sent if parts and "inlineData" in parts[0] else 0)
+
+
+class GeminiStandIn:
+    """Run the stand-in server on a background thread"""
+
+    def __init__(self, config: Optional[StandInConfig] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StandInConfig()
+        self.httpd = _StandInHTTPServer((host, port), self.config)
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self.httpd.lock:
+            return dict(self.httpd.stats)
+
+    def env(self) -> Dict[str, str]:
+        """Environment overrides that point clients at this server"""
+        return {BASE_URL_ENV: self.url}
+
+    def start(self) -> "GeminiStandIn":
+        self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                       kwargs={"poll_interval": 0.05}, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self) -> "GeminiStandIn":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Gemini API stand-in for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--ttfc", type=float, default=StandInConfig.ttfc_seconds,
+                        help="Seconds before the first chunk (default: %(default)s)")
+    parser.add_argument("--bytes-per-second", type=float, default=StandInConfig.bytes_per_second,
+                        help="Audio bytes streamed per second (default: %(default)s)")
+    parser.add_argument("--chunk-seconds", type=float, default=StandInConfig.chunk_seconds,
+                        help="Audio seconds per streamed chunk (default: %(default)s)")
+    parser.add_argument("--chars-per-second", type=float, default=StandInConfig.chars_per_second,
+                        help="Speech rate used to size generated audio (default: %(default)s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests failing with 429")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="Fraction of streams that stall once")
+    parser.add_argument("--stall-seconds", type=float, default=StandInConfig.stall_seconds)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = StandInConfig(
+        ttfc_seconds=args.ttfc,
+        bytes_per_second=args.bytes_per_second,
+        chunk_seconds=args.chunk_seconds,
+        chars_per_second=args.chars_per_second,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        stall_rate=args.stall_rate,
+        stall_seconds=args.stall_seconds,
+        seed=args.seed,
+    )
+    server = GeminiStandIn(config, host=args.host, port=args.port)
+    print(f"🧪 Gemini stand-in listening on {server.url}")
+    print(f"   export {BASE_URL_ENV}={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n📊 {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,136 +7,427 @@ Based on the working example with multi-speaker support
 import base64
 import mimetypes
 import os
-import struct
-from typing import Optional, List, Dict, Any, Union
+import sys
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Callable, Iterator, NamedTuple, Union, Sequence, Tuple
 from pathlib import Path
 
-try:
-    from google import genai
-    from google.genai import types
-except ImportError:
-    print("Installing required dependencies...")
-    os.system("pip install google-genai")
-    from google import genai
-    from google.genai import types
+# google-genai is imported on first use (see _load_sdk) so REST-backend
+# workers never pay for importing the SDK
+genai = None
+types = None
+
+# Helper modules live next to this file
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pause_markers import (
+    DEFAULT_PAUSE_SECONDS,
+    has_pause_markers,
+    render_silence,
+    split_at_pauses,
+)
+from request_packing import (
+    DEFAULT_MAX_PACK_CHARS,
+    DEFAULT_MAX_PACK_ITEMS,
+    pack_texts,
+    plan_packs,
+    split_packed_audio,
+)
+from audio_buffer import AudioBuffer, parse_audio_mime_type
+from audio_spool import SPILL_DIR_ENV, AudioSpool, spill_threshold_from_env
+from gemini_api import BASE_URL_ENV, CONFIG_CACHE_SIZE, GeminiAPI, speech_payload_template
+from silence import trim_bounds
+from tts_cassette import CassettePlayer, CassetteRecorder
+from tts_metrics import TTSMetrics, default_metrics
+from tts_logging import get_logger
+from tts_timing import StreamTimer, TimingHook, log_timing
+import model_discovery
+import tracing
+from wav_io import build_wav_header
+
+logger = get_logger("tts")
+
+BACKENDS = ("sdk", "rest", "replay")
+
+# Audio analysed at each end when trimming a spilled episode
+TRIM_SCAN_SECONDS = 60.0
+
+
+def _load_sdk() -> None:
+    """Import google-genai, installing it if missing"""
+    global genai, types
+    if genai is not None and types is not None:
+        return
+
+    try:
+        from google import genai as sdk_genai
+        from google.genai import types as sdk_types
+    except ImportError:
+        logger.warning("Installing required dependencies...")
+        os.system("pip install google-genai")
+        from google import genai as sdk_genai
+        from google.genai import types as sdk_types
+
+    # Keep anything already bound (e.g. patched in tests)
+    if genai is None:
+        genai = sdk_genai
+    if types is None:
+        types = sdk_types
+
+
+def _no_report() -> None:
+    """Cache probe used when metrics are off"""
+
+
+class SpeechRequest(NamedTuple):
+    """Voice selection and sampling settings shared by a synthesis call"""
+    voice_name: Optional[str] = None
+    speaker_voices: Tuple[Tuple[str, str], ...] = ()
+    temperature: float = 0.8
 
 
 class GeminiTTS:
     """Gemini TTS API wrapper for podcast generation"""
     
-    # Available voice names
+    # Available voice names, extended by model discovery (see model_discovery)
     AVAILABLE_VOICES = ["Zephyr", "Puck", "Charon", "Kore", "Uranus", "Fenrir"]
+    VOICE_SET = frozenset(AVAILABLE_VOICES)
+    _discovery_loaded = False
     
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
-        """Initialize Gemini TTS client"""
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 model: Optional[str] = None,
+                 local_pauses: Optional[bool] = None,
+                 pause_seconds: Optional[float] = None,
+                 trim_silence: Optional[bool] = None,
+                 backend: Optional[str] = None,
+                 cassette: Optional[str] = None,
+                 record: Optional[str] = None,
+                 replay_time_scale: Optional[float] = None,
+                 spill_mb: Optional[float] = None):
+        """Initialize Gemini TTS client
+
+        With local_pauses enabled, [pause] markers and ellipses are stripped
+        from requests and rendered as exact silence when audio is assembled.
+        With trim_silence enabled, saved clips lose their leading and
+        trailing silence. backend selects the google-genai SDK ("sdk") or the
+        lightweight pooled REST client ("rest"). record appends every live
+        stream to a cassette file; the "replay" backend streams answers back
+        from cassette instead of calling the API, with recorded delays
+        multiplied by replay_time_scale. Episode audio beyond spill_mb
+        (default: $GEMINI_TTS_SPILL_MB or 256, 0 = never) is buffered in a
+        temp file instead of memory.
+        """
+        self.backend = (backend or os.getenv('GEMINI_TTS_BACKEND', 'sdk')).lower()
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{self.backend}'. Choose from: {list(BACKENDS)}")
+
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
-        if not self.api_key:
+        if not self.api_key and self.backend != "replay":
             raise ValueError("Gemini API key not found in environment variables")
         
         self.model = model or os.getenv('GEMINI_TTS_MODEL', 'gemini-2.5-pro-preview-tts')
-        self.client = genai.Client(api_key=self.api_key)
+        self.text_model = os.getenv('GEMINI_TEXT_MODEL', 'gemini-2.5-flash')
+
+        self.client = None
+        self.api = None
+        self.player = None
+        self.recorder = None
+        if self.backend == "replay":
+            cassette = cassette or os.getenv('GEMINI_TTS_CASSETTE')
+            if not cassette:
+                raise ValueError("The replay backend needs a cassette file (GEMINI_TTS_CASSETTE)")
+            if replay_time_scale is None:
+                replay_time_scale = float(os.getenv('GEMINI_TTS_REPLAY_TIME_SCALE', '1.0'))
+            self.player = CassettePlayer(cassette, time_scale=replay_time_scale)
+        elif self.backend == "rest":
+            self.api = GeminiAPI(api_key=self.api_key, model=self.model)
+        else:
+            _load_sdk()
+            base_url = os.getenv(BASE_URL_ENV)
+            if base_url:
+                self.client = genai.Client(api_key=self.api_key,
+                                           http_options=types.HttpOptions(base_url=base_url))
+            else:
+                self.client = genai.Client(api_key=self.api_key)
+
+        record = record or os.getenv('GEMINI_TTS_RECORD')
+        if record and self.player is None:
+            self.recorder = CassetteRecorder(record)
+
+        if local_pauses is None:
+            local_pauses = os.getenv('GEMINI_TTS_LOCAL_PAUSES', '').lower() in ('1', 'true', 'yes')
+        self.local_pauses = local_pauses
+        self.pause_seconds = (pause_seconds if pause_seconds is not None
+                              else float(os.getenv('GEMINI_TTS_PAUSE_SECONDS', DEFAULT_PAUSE_SECONDS)))
+
+        if trim_silence is None:
+            trim_silence = os.getenv('GEMINI_TTS_TRIM_SILENCE', '').lower() in ('1', 'true', 'yes')
+        self.trim_silence = trim_silence
+
+        if spill_mb is None:
+            self.spill_threshold = spill_threshold_from_env()
+        else:
+            self.spill_threshold = int(spill_mb * 1024 * 1024) if spill_mb > 0 else None
+        self.spill_dir = os.getenv(SPILL_DIR_ENV) or None
+
+        # SDK configs are immutable once built, so each voice setup is built once
+        self._sdk_config = lru_cache(maxsize=CONFIG_CACHE_SIZE)(self._build_sdk_config)
+
+        # Called with a RequestTiming after every request (see tts_timing)
+        self.timing_hooks: List[TimingHook] = []
+        if os.getenv('GEMINI_TTS_TIMING', '').lower() in ('1', 'true', 'yes', 'log'):
+            self.timing_hooks.append(log_timing)
+        if tracing.enabled():
+            self.timing_hooks.append(tracing.trace_timing)
+
+        self.metrics: Optional[TTSMetrics] = None
+        metrics = default_metrics()
+        if metrics is not None:
+            self.enable_metrics(metrics)
+
+    @classmethod
+    def use_voices(cls, voices: Sequence[str]) -> None:
+        """Add voices to AVAILABLE_VOICES, keeping the built-in ones first"""
+        cls.AVAILABLE_VOICES = list(dict.fromkeys([*cls.AVAILABLE_VOICES, *voices]))
+        cls.VOICE_SET = frozenset(cls.AVAILABLE_VOICES)
+
+    @classmethod
+    def load_discovered_voices(cls) -> None:
+        """Add the voices from the discovery cache, once per process; never calls the API
+
+        Called by command-line entry points, so library use and tests never
+        depend on the repo's discovery file.
+        """
+        if cls._discovery_loaded:
+            return
+        cls._discovery_loaded = True
+        discovery = model_discovery.load_cached()
+        if discovery is not None and discovery.voices:
+            cls.use_voices(discovery.voices)
+
+    def close(self) -> None:
+        """Close the replay cassette and the pooled REST connections"""
+        if self.player is not None:
+            self.player.close()
+            self.player = None
+        if self.api is not None:
+            self.api.close()
+
+    def __enter__(self) -> "GeminiTTS":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add_timing_hook(self, hook: TimingHook) -> None:
+        """Register a callback, log writer or metrics sink for request timings"""
+        self.timing_hooks.append(hook)
+
+    def enable_metrics(self, metrics: TTSMetrics) -> None:
+        """Feed request counters, histograms and the in-flight gauge to metrics"""
+        self.metrics = metrics
+        self.timing_hooks.append(metrics)
     
-    def save_audio_file(self, file_path: str, audio_data: bytes, mime_type: str) -> str:
-        """Save audio data to file, converting to WAV if needed"""
-        file_extension = mimetypes.guess_extension(mime_type)
+    def save_audio_file(self,
+                        file_path: str,
+                        audio_data: Union[bytes, AudioBuffer, AudioSpool],
+                        mime_type: Optional[str] = None,
+                        trim: Optional[bool] = None) -> str:
+        """Save audio data to file, converting to WAV if needed
+
+        Raw PCM (an AudioBuffer, or bytes with a PCM mime_type) is written
+        behind a WAV header; other formats are written as they are. With
+        trim (default: self.trim_silence), leading and trailing silence is
+        cut from raw PCM before the WAV header is written.
+        """
+        if trim is None:
+            trim = self.trim_silence
+        if isinstance(audio_data, AudioSpool):
+            return self._save_spool(file_path, audio_data, mime_type, trim)
         
+        file_extension = mimetypes.guess_extension(mime_type) if mime_type else None
+        
+        if file_extension is not None:
+            if not file_path.endswith(file_extension):
+                file_path += file_extension
+            with open(file_path, "wb") as f:
+                f.write(audio_data.data if isinstance(audio_data, AudioBuffer) else audio_data)
+            return file_path
+        
+        if not isinstance(audio_data, AudioBuffer):
+            audio_data = AudioBuffer.from_mime(mime_type or "", audio_data)
+        if trim:
+            audio_data = audio_data.frames(*trim_bounds(audio_data.data, *audio_data.format))
+        
+        if not file_path.endswith(".wav"):
+            file_path += ".wav"
+        
+        return audio_data.save_wav(file_path)
+    
+    def _save_spool(self, file_path: str, spool: AudioSpool, mime_type: str, trim: bool) -> str:
+        """Write spooled audio behind its WAV header without loading it into memory"""
+        file_extension = mimetypes.guess_extension(mime_type) if mime_type else None
+        start, end = 0, len(spool)
+        header = b""
+
         if file_extension is None:
             file_extension = ".wav"
-            audio_data = self._convert_to_wav(audio_data, mime_type)
-        
+            audio = AudioBuffer.from_mime(mime_type or "", spool.view())
+            try:
+                if trim:
+                    first, last = trim_bounds(audio.data, *audio.format,
+                                              scan_seconds=TRIM_SCAN_SECONDS if spool.spilled else None)
+                    start, end = first * audio.block_align, max(first, last) * audio.block_align
+            finally:
+                audio.release()
+            header = build_wav_header(end - start, *audio.format)
+
         if not file_path.endswith(file_extension):
             file_path += file_extension
-        
-        with open(file_path, "wb") as f:
-            f.write(audio_data)
-        
+
+        with open(file_path, "wb", buffering=0) as f:
+            f.write(header)
+            spool.copy_to(f.fileno(), start, end - start)
+
         return file_path
-    
+
     def _convert_to_wav(self, audio_data: bytes, mime_type: str) -> bytes:
         """Convert audio data to WAV format with proper header"""
-        parameters = self._parse_audio_mime_type(mime_type)
-        bits_per_sample = parameters["bits_per_sample"]
-        sample_rate = parameters["rate"]
-        num_channels = 1
-        data_size = len(audio_data)
-        bytes_per_sample = bits_per_sample // 8
-        block_align = num_channels * bytes_per_sample
-        byte_rate = sample_rate * block_align
-        chunk_size = 36 + data_size
-
-        # Create WAV header
-        header = struct.pack(
-            "<4sI4s4sIHHIIHH4sI",
-            b"RIFF",          # ChunkID
-            chunk_size,       # ChunkSize
-            b"WAVE",          # Format
-            b"fmt ",          # Subchunk1ID
-            16,               # Subchunk1Size
-            1,                # AudioFormat (PCM)
-            num_channels,     # NumChannels
-            sample_rate,      # SampleRate
-            byte_rate,        # ByteRate
-            block_align,      # BlockAlign
-            bits_per_sample,  # BitsPerSample
-            b"data",          # Subchunk2ID
-            data_size         # Subchunk2Size
-        )
-        return header + audio_data
+        return AudioBuffer.from_mime(mime_type, audio_data).to_wav()
     
     def _parse_audio_mime_type(self, mime_type: str) -> Dict[str, int]:
         """Parse bits per sample and rate from audio MIME type"""
-        bits_per_sample = 16
-        rate = 24000
-
-        parts = mime_type.split(";")
-        for param in parts:
-            param = param.strip()
-            if param.lower().startswith("rate="):
-                try:
-                    rate_str = param.split("=", 1)[1]
-                    rate = int(rate_str)
-                except (ValueError, IndexError):
-                    pass
-            elif param.startswith("audio/L"):
-                try:
-                    bits_per_sample = int(param.split("L", 1)[1])
-                except (ValueError, IndexError):
-                    pass
-
+        rate, bits_per_sample = parse_audio_mime_type(mime_type)
         return {"bits_per_sample": bits_per_sample, "rate": rate}
     
-    def generate_speech(self, 
-                       text: str, 
-                       voice_name: str = "Zephyr",
-                       temperature: float = 0.8,
-                       output_file: Optional[str] = None) -> str:
-        """Generate speech from text using single voice"""
-        
-        if voice_name not in self.AVAILABLE_VOICES:
+    def _check_voice(self, voice_name: str) -> None:
+        if voice_name not in self.VOICE_SET:
             raise ValueError(f"Voice '{voice_name}' not available. Choose from: {self.AVAILABLE_VOICES}")
-        
+
+    def _build_sdk_config(self, request: SpeechRequest) -> Any:
+        """Build the google-genai request config for a speech request"""
+        _load_sdk()
+        if request.speaker_voices:
+            speech_config = types.SpeechConfig(
+                multi_speaker_voice_config=types.MultiSpeakerVoiceConfig(
+                    speaker_voice_configs=[
+                        types.SpeakerVoiceConfig(
+                            speaker=speaker,
+                            voice_config=types.VoiceConfig(
+                                prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=voice_name)
+                            ),
+                        )
+                        for speaker, voice_name in request.speaker_voices
+                    ]
+                )
+            )
+        else:
+            speech_config = types.SpeechConfig(
+                voice_config=types.VoiceConfig(
+                    prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=request.voice_name)
+                )
+            )
+
+        return types.GenerateContentConfig(
+            temperature=request.temperature,
+            response_modalities=["audio"],
+            speech_config=speech_config,
+        )
+
+    def _stream_chunks(self, text: str, request: SpeechRequest) -> Iterator[Tuple[bytes, str]]:
+        """Yield (audio_bytes, mime_type) for each streamed chunk of one request"""
+        timer = StreamTimer() if self.timing_hooks else None
+
+        if self.player is not None:
+            chunks = self.player.play(self.model, text, request)
+        else:
+            chunks = self._live_chunks(text, request, timer)
+            if self.recorder is not None:
+                chunks = self.recorder.record(self.model, text, request, chunks)
+
+        if timer is None:
+            return chunks
+        return self._timed_chunks(chunks, timer, len(text))
+
+    def _timed_chunks(self, chunks: Iterator[Tuple[bytes, str]], timer: StreamTimer,
+                      chars: int) -> Iterator[Tuple[bytes, str]]:
+        """Pass chunks through a StreamTimer and report the timing to every hook"""
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.request_started()
+        timer.restart()
+        error = None
+        completed = False
+        try:
+            yield from timer.wrap(chunks)
+            completed = True
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            if metrics is not None:
+                metrics.request_finished()
+            if completed or error is not None:
+                parameters = self._parse_audio_mime_type(timer.mime_type or "audio/L16;rate=24000")
+                timing = timer.result(self.model, self.backend, chars,
+                                      parameters["rate"] * parameters["bits_per_sample"] // 8,
+                                      error=error)
+                for hook in self.timing_hooks:
+                    try:
+                        hook(timing)
+                    except Exception as e:
+                        logger.warning("⚠️ Timing hook failed: %s", e)
+
+    def _cache_probe(self, cache: str, cached: Callable) -> Callable[[], None]:
+        """Callable reporting to metrics whether cached (an lru_cache) has hit since now"""
+        metrics = self.metrics
+        if metrics is None:
+            return _no_report
+        misses = cached.cache_info().misses
+
+        def report() -> None:
+            metrics.cache_lookup(cache, hit=cached.cache_info().misses == misses)
+        return report
+
+    def _live_chunks(self, text: str, request: SpeechRequest,
+                     timer: Optional[StreamTimer] = None) -> Iterator[Tuple[bytes, str]]:
+        """Stream one request from the API backend"""
+        if self.backend == "rest":
+            report = self._cache_probe("rest_payload", speech_payload_template)
+
+            def on_built() -> None:
+                report()
+                if timer is not None:
+                    timer.mark_built()
+
+            yield from self.api.stream_speech(
+                text,
+                voice_name=request.voice_name,
+                speaker_voices=request.speaker_voices or None,
+                temperature=request.temperature,
+                model=self.model,
+                on_built=on_built,
+            )
+            return
+
         contents = [
             types.Content(
                 role="user",
                 parts=[types.Part.from_text(text=text)],
             ),
         ]
-        
-        generate_content_config = types.GenerateContentConfig(
-            temperature=temperature,
-            response_modalities=["audio"],
-            speech_config=types.SpeechConfig(
-                voice_config=types.VoiceConfig(
-                    prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=voice_name)
-                )
-            ),
-        )
 
-        audio_chunks = []
+        report = self._cache_probe("sdk_config", self._sdk_config)
+        config = self._sdk_config(request)
+        report()
+        if timer is not None:
+            timer.mark_built()
+
         for chunk in self.client.models.generate_content_stream(
             model=self.model,
             contents=contents,
-            config=generate_content_config,
+            config=config,
         ):
             if (chunk.candidates and 
                 chunk.candidates[0].content and 
@@ -145,32 +436,187 @@ class GeminiTTS:
                 chunk.candidates[0].content.parts[0].inline_data.data):
                 
                 inline_data = chunk.candidates[0].content.parts[0].inline_data
-                audio_chunks.append(inline_data.data)
+                mime_type = inline_data.mime_type if isinstance(inline_data.mime_type, str) else None
+                yield inline_data.data, mime_type
+
+    def _synthesize(self, text: str, request: SpeechRequest) -> Tuple[AudioBuffer, str]:
+        """Stream a single request and return the combined audio and its MIME type"""
+        audio_chunks = []
+        mime_type = None
+        for data, chunk_mime_type in self._stream_chunks(text, request):
+            audio_chunks.append(data)
+            mime_type = mime_type or chunk_mime_type
         
         if not audio_chunks:
             raise RuntimeError("No audio data generated")
         
-        # Combine all audio chunks
-        combined_audio = b''.join(audio_chunks)
+        # One exact-size copy into storage the buffer can keep appending to
+        mime_type = mime_type or "audio/wav"
+        return AudioBuffer.from_mime(mime_type, bytearray().join(audio_chunks)), mime_type
+
+    def _synthesize_into(self, spool: AudioSpool, text: str, request: SpeechRequest) -> str:
+        """Stream a single request straight into spool and return its MIME type"""
+        start_size = len(spool)
+        mime_type = None
+        for data, chunk_mime_type in self._stream_chunks(text, request):
+            spool.write(data)
+            mime_type = mime_type or chunk_mime_type
+
+        if len(spool) == start_size:
+            raise RuntimeError("No audio data generated")
+
+        return mime_type or "audio/wav"
+
+    def stream_speech(self,
+                      text: str,
+                      voice_name: str = "Zephyr",
+                      temperature: float = 0.8) -> Iterator[bytes]:
+        """Yield audio chunks for text as soon as they arrive from the API"""
+        self._check_voice(voice_name)
+
+        request = SpeechRequest(voice_name=voice_name, temperature=temperature)
+        for data, _ in self._stream_chunks(text, request):
+            yield data
+
+    def _synthesize_with_pauses(self,
+                                text: str,
+                                request: SpeechRequest,
+                                speaker_labels: Optional[Sequence[str]] = None) -> Tuple[AudioSpool, str]:
+        """Synthesize text into a spool, rendering pause markers as local silence when enabled
+
+        The caller owns the returned spool and must close it.
+        """
+        spool = AudioSpool(self.spill_threshold, self.spill_dir)
+        try:
+            if not self.local_pauses or not has_pause_markers(text):
+                return spool, self._synthesize_into(spool, text, request)
+
+            segments = split_at_pauses(text, pause_seconds=self.pause_seconds,
+                                       speaker_labels=speaker_labels)
+
+            # Silence has to match the PCM format returned by the model, which
+            # is known once the first segment has been synthesized
+            mime_type = None
+            audio_format = None
+            pending = 0.0
+            for segment in segments:
+                if segment.text:
+                    if mime_type is None:
+                        audio, mime_type = self._synthesize(segment.text, request)
+                        audio_format = audio.format
+                        spool.write(render_silence(pending, *audio_format))
+                        spool.write(audio.pcm)
+                        del audio
+                    else:
+                        spool.write(render_silence(pending, *audio_format))
+                        self._synthesize_into(spool, segment.text, request)
+                    pending = 0.0
+                pending += segment.pause_after
+
+            if mime_type is None:
+                raise RuntimeError("No audio data generated")
+
+            spool.write(render_silence(pending, *audio_format))
+            return spool, mime_type
+        except BaseException:
+            spool.close()
+            raise
+
+    def synthesize_speech(self,
+                          text: str,
+                          voice_name: str = "Zephyr",
+                          temperature: float = 0.8) -> Tuple[AudioSpool, str]:
+        """Synthesize text with a single voice into a spool the caller must close"""
+        self._check_voice(voice_name)
+
+        request = SpeechRequest(voice_name=voice_name, temperature=temperature)
+        return self._synthesize_with_pauses(text, request)
+
+    def generate_speech(self, 
+                       text: str, 
+                       voice_name: str = "Zephyr",
+                       temperature: float = 0.8,
+                       output_file: Optional[str] = None) -> str:
+        """Generate speech from text using single voice"""
+        
+        spool, mime_type = self.synthesize_speech(text, voice_name, temperature)
         
         # Save to file
         if output_file is None:
             output_file = f"output_single_{voice_name.lower()}"
         
-        saved_file = self.save_audio_file(output_file, combined_audio, "audio/wav")
-        print(f"✓ Generated speech saved to: {saved_file}")
+        with spool:
+            saved_file = self.save_audio_file(output_file, spool, mime_type)
+        logger.info("✓ Generated speech saved to: %s", saved_file,
+                    extra={"output": saved_file, "voice": voice_name, "chars": len(text)})
         
         return saved_file
     
-    def generate_podcast_interview(self,
-                                  script: str,
-                                  speaker_configs: List[Dict[str, str]],
-                                  temperature: float = 1.0,
-                                  output_file: Optional[str] = None) -> str:
-        """Generate multi-speaker podcast interview"""
+    def generate_speech_batch(self,
+                              texts: Sequence[str],
+                              voice_name: str = "Zephyr",
+                              temperature: float = 0.8,
+                              output_dir: str = ".",
+                              prefix: str = "clip",
+                              pack: bool = True,
+                              max_pack_items: int = DEFAULT_MAX_PACK_ITEMS,
+                              max_pack_chars: int = DEFAULT_MAX_PACK_CHARS) -> List[str]:
+        """Generate one clip per text, packing short texts into shared requests
+
+        Each pack is split back into clips at the silences between items. If
+        the split does not yield exactly one clip per item, the pack's items
+        are synthesized individually instead.
+        """
+        self._check_voice(voice_name)
+
+        request = SpeechRequest(voice_name=voice_name, temperature=temperature)
+
+        if pack:
+            groups = plan_packs(texts, max_items=max_pack_items, max_chars=max_pack_chars)
+        else:
+            groups = [[index] for index in range(len(texts))]
+
+        os.makedirs(output_dir, exist_ok=True)
+        saved_files: List[Optional[str]] = [None] * len(texts)
+
+        for group in groups:
+            clips = None
+            if len(group) > 1:
+                packed_audio, mime_type = self._synthesize(
+                    pack_texts([texts[i] for i in group]), request
+                )
+                clips = split_packed_audio(packed_audio.data, len(group),
+                                           sample_rate=packed_audio.sample_rate,
+                                           bits_per_sample=packed_audio.bits_per_sample,
+                                           num_channels=packed_audio.num_channels)
+                if clips is None:
+                    logger.warning("⚠️ Packed request did not split into %d clips, "
+                                   "falling back to individual requests", len(group),
+                                   extra={"clips": [i + 1 for i in group]})
+                else:
+                    clips = [(clip, mime_type) for clip in clips]
+
+            if clips is None:
+                clips = [self._synthesize(texts[i], request) for i in group]
+
+            for index, (audio, mime_type) in zip(group, clips):
+                output_file = os.path.join(output_dir, f"{prefix}_{index + 1:04d}")
+                saved_files[index] = self.save_audio_file(output_file, audio, mime_type)
+                logger.debug("Saved clip %d: %s", index + 1, saved_files[index],
+                             extra={"clip": index + 1, "output": saved_files[index]})
+
+        logger.info("✓ Generated %d clips (%d packs) in: %s", len(texts), len(groups), output_dir,
+                    extra={"clips": len(texts), "packs": len(groups), "output_dir": output_dir})
+        return saved_files
+
+    def synthesize_podcast(self,
+                           script: str,
+                           speaker_configs: List[Dict[str, str]],
+                           temperature: float = 1.0) -> Tuple[AudioSpool, str]:
+        """Synthesize a multi-speaker script into a spool the caller must close"""
         
         # Validate speaker configurations
-        speaker_voice_configs = []
+        speaker_voices = []
         for config in speaker_configs:
             speaker = config.get('speaker')
             voice_name = config.get('voice', 'Zephyr')
@@ -178,62 +624,32 @@ class GeminiTTS:
             if speaker is None:
                 raise ValueError("Each speaker config must have a 'speaker' field")
             
-            if voice_name not in self.AVAILABLE_VOICES:
-                raise ValueError(f"Voice '{voice_name}' not available. Choose from: {self.AVAILABLE_VOICES}")
+            self._check_voice(voice_name)
             
-            speaker_voice_configs.append(
-                types.SpeakerVoiceConfig(
-                    speaker=speaker,
-                    voice_config=types.VoiceConfig(
-                        prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=voice_name)
-                    ),
-                )
-            )
+            speaker_voices.append((speaker, voice_name))
         
-        contents = [
-            types.Content(
-                role="user",
-                parts=[types.Part.from_text(text=script)],
-            ),
-        ]
-        
-        generate_content_config = types.GenerateContentConfig(
-            temperature=temperature,
-            response_modalities=["audio"],
-            speech_config=types.SpeechConfig(
-                multi_speaker_voice_config=types.MultiSpeakerVoiceConfig(
-                    speaker_voice_configs=speaker_voice_configs
-                )
-            ),
-        )
+        request = SpeechRequest(speaker_voices=tuple(speaker_voices), temperature=temperature)
 
-        audio_chunks = []
-        for chunk in self.client.models.generate_content_stream(
-            model=self.model,
-            contents=contents,
-            config=generate_content_config,
-        ):
-            if (chunk.candidates and 
-                chunk.candidates[0].content and 
-                chunk.candidates[0].content.parts and
-                chunk.candidates[0].content.parts[0].inline_data and
-                chunk.candidates[0].content.parts[0].inline_data.data):
-                
-                inline_data = chunk.candidates[0].content.parts[0].inline_data
-                audio_chunks.append(inline_data.data)
-        
-        if not audio_chunks:
-            raise RuntimeError("No audio data generated")
+        speaker_labels = [speaker for speaker, _ in speaker_voices]
+        return self._synthesize_with_pauses(script, request, speaker_labels=speaker_labels)
+
+    def generate_podcast_interview(self,
+                                  script: str,
+                                  speaker_configs: List[Dict[str, str]],
+                                  temperature: float = 1.0,
+                                  output_file: Optional[str] = None) -> str:
+        """Generate multi-speaker podcast interview"""
         
-        # Combine all audio chunks
-        combined_audio = b''.join(audio_chunks)
+        spool, mime_type = self.synthesize_podcast(script, speaker_configs, temperature)
         
         # Save to file
         if output_file is None:
             output_file = "output_podcast_interview"
         
-        saved_file = self.save_audio_file(output_file, combined_audio, "audio/wav")
-        print(f"✓ Generated podcast interview saved to: {saved_file}")
+        with spool:
+            saved_file = self.save_audio_file(output_file, spool, mime_type)
+        logger.info("✓ Generated podcast interview saved to: %s", saved_file,
+                    extra={"output": saved_file, "speakers": len(speaker_configs), "chars": len(script)})
         
         return saved_file
     
@@ -250,6 +666,16 @@ For interview style, include:
 
 Make it engaging and informative with natural transitions."""
 
+        return self.generate_text(prompt, temperature=0.8)
+
+    def generate_text(self, prompt: str, temperature: float = 0.8, model: Optional[str] = None) -> str:
+        """Generate text, such as a podcast script, with a Gemini text model"""
+        if self.backend == "replay":
+            raise RuntimeError("Cassettes only hold speech; use the sdk or rest backend for scripts")
+        model = model or self.text_model
+        if self.backend == "rest":
+            return self.api.generate_text(prompt, model=model, temperature=temperature)
+
         contents = [
             types.Content(
                 role="user",
@@ -258,19 +684,44 @@ Make it engaging and informative with natural transitions."""
         ]
         
         response = self.client.models.generate_content(
-            model="gemini-2.5-pro-preview-tts",
+            model=model,
             contents=contents,
-            config=types.GenerateContentConfig(temperature=0.8)
+            config=types.GenerateContentConfig(temperature=temperature)
         )
         
         return response.text
 
+    def stream_text(self, prompt: str, temperature: float = 0.8, model: Optional[str] = None) -> Iterator[str]:
+        """Generate text like generate_text, yielding it piece by piece as the model writes"""
+        if self.backend == "replay":
+            raise RuntimeError("Cassettes only hold speech; use the sdk or rest backend for scripts")
+        model = model or self.text_model
+        if self.backend == "rest":
+            yield from self.api.stream_text(prompt, model=model, temperature=temperature)
+            return
+
+        contents = [
+            types.Content(
+                role="user",
+                parts=[types.Part.from_text(text=prompt)],
+            ),
+        ]
+        for chunk in self.client.models.generate_content_stream(
+            model=model,
+            contents=contents,
+            config=types.GenerateContentConfig(temperature=temperature)
+        ):
+            if chunk.text:
+                yield chunk.text
+
 
 def main():
     """Test the Gemini TTS functionality"""
     print("🎙️ Testing Gemini TTS Podcast Generator")
     print("=" * 40)
     
+    GeminiTTS.load_discovered_voices()
+
     try:
         tts = GeminiTTS()
         print("✓ Gemini TTS client initialized")
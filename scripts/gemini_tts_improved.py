@@ -16,31 +16,37 @@ from pathlib import Path
 scripts_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, scripts_dir)
 
+import model_discovery
+from tts_logging import emit_result, get_logger, log_context
+
+logger = get_logger("improved")
+
 try:
     from gemini_tts import GeminiTTS
-    import google.generativeai as genai
 except ImportError as e:
-    print(f"Import error: {e}")
-    print("Please ensure google-generativeai is installed: pip install google-generativeai")
+    logger.error(f"Import error: {e}")
+    logger.error("Please ensure google-genai is installed: pip install google-genai")
     sys.exit(1)
 
 def test_api_connectivity(api_key, model):
-    """Test if Gemini API is accessible and has TTS models"""
-    try:
-        genai.configure(api_key=api_key)
-        models = genai.list_models()
-        tts_models = [m for m in models if 'tts' in m.name.lower()]
-
-        if not tts_models:
-            print(f"No TTS models found. Available models: {[m.name for m in models[:5]]}")
-            return False
-
-        print(f"API connectivity test passed. Found {len(tts_models)} TTS models")
-        return True
-    except Exception as e:
-        print(f"API connectivity test failed: {e}")
+    """Test if Gemini API is accessible and has TTS models
+
+    Answered from the model discovery cache; the API is only queried when
+    the cached state has expired.
+    """
+    discovery = model_discovery.check_health(api_key)
+    if not discovery.healthy:
+        logger.error(f"API connectivity test failed: {discovery.error}")
         return False
 
+    if model and model not in discovery.tts_models:
+        logger.warning(f"Model {model} is not among the discovered TTS models: "
+                       f"{', '.join(discovery.tts_models)}")
+    GeminiTTS.use_voices(discovery.voices)
+    logger.info(f"API connectivity test passed. Found {len(discovery.tts_models)} TTS models",
+                extra={"checked_at": discovery.checked_at})
+    return True
+
 def generate_tts_with_retry(api_key, model, text, voice_name, temperature, pace, max_retries=3):
     """Generate TTS with retry logic and exponential backoff"""
 
@@ -48,17 +54,20 @@ def generate_tts_with_retry(api_key, model, text, voice_name, temperature, pace,
     try:
         tts = GeminiTTS(api_key=api_key, model=model)
     except Exception as e:
-        print(f"Failed to initialize TTS: {e}")
+        logger.error(f"Failed to initialize TTS: {e}")
         return None
 
-    print(f"Generating TTS for text length: {len(text)} characters")
+    logger.info(f"Generating TTS for text length: {len(text)} characters")
 
     for attempt in range(max_retries):
         try:
             if attempt > 0:
                 # Add jitter and exponential backoff
                 delay = (2 ** attempt) + random.uniform(0, 1)
-                print(f"Retry attempt {attempt + 1}/{max_retries} after {delay:.1f}s delay...")
+                logger.info(f"Retry attempt {attempt + 1}/{max_retries} after {delay:.1f}s delay...",
+                            extra={"attempt": attempt + 1, "delay": delay})
+                if tts.metrics is not None:
+                    tts.metrics.retry("gemini_tts_improved")
                 time.sleep(delay)
 
             # Generate content
@@ -70,15 +79,15 @@ def generate_tts_with_retry(api_key, model, text, voice_name, temperature, pace,
             )
 
             if filename and Path(filename).exists():
-                print(f"Successfully generated: {filename}")
+                logger.info(f"Successfully generated: {filename}", extra={"output": filename})
                 return filename
             else:
                 raise Exception(f"Generation returned invalid filename: {filename}")
 
         except Exception as e:
-            print(f"Attempt {attempt + 1} failed: {e}")
+            logger.warning(f"Attempt {attempt + 1} failed: {e}", extra={"attempt": attempt + 1})
             if attempt == max_retries - 1:
-                print("All retry attempts failed")
+                logger.error("All retry attempts failed")
                 return None
 
     return None
@@ -102,29 +111,31 @@ def main():
     try:
         text = base64.b64decode(encoded_text).decode('utf-8')
     except Exception as e:
-        print(f"Failed to decode text: {e}")
+        logger.error(f"Failed to decode text: {e}")
+        emit_result("failure", error=f"failed to decode text: {e}")
         sys.exit(1)
 
     # Test API connectivity first
     if not test_api_connectivity(api_key, model):
-        print("API connectivity test failed")
+        emit_result("failure", error="API connectivity test failed")
         sys.exit(1)
 
     # Generate TTS
-    filename = generate_tts_with_retry(
-        api_key=api_key,
-        model=model,
-        text=text,
-        voice_name=voice_name,
-        temperature=temperature,
-        pace=pace
-    )
+    with log_context(voice=voice_name, chars=len(text)):
+        filename = generate_tts_with_retry(
+            api_key=api_key,
+            model=model,
+            text=text,
+            voice_name=voice_name,
+            temperature=temperature,
+            pace=pace
+        )
 
     if filename:
-        print(f"SUCCESS: {filename}")
+        emit_result("success", output=filename)
         sys.exit(0)
     else:
-        print("FAILURE: TTS generation failed")
+        emit_result("failure", error="TTS generation failed")
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Load-testing harness for GeminiTTS
+Runs concurrent synthetic jobs against the local stand-in server (or any
+GEMINI_API_BASE_URL) and reports latency percentiles, throughput and peak
+memory.
+"""
+
+import json
+import math
+import os
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from gemini_api import BASE_URL_ENV
+from gemini_standin import GeminiStandIn, StandInConfig
+from gemini_tts import GeminiTTS, SpeechRequest
+
+DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+DEFAULT_JOBS = 50
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MEAN_CHARS = 200
+
+# Spread of the lognormal text-length distribution (sigma of log length)
+LOGNORMAL_SIGMA = 0.6
+
+WORDS = ("the", "podcast", "episode", "listeners", "today", "we", "talk", "about",
+         "speech", "models", "latency", "and", "why", "it", "matters", "for", "everyone",
+         "streaming", "audio", "quality", "guest", "host", "question", "answer")
+
+
+class JobResult(NamedTuple):
+    """Timings of one synthetic job, in seconds"""
+    chars: int
+    ttfc: Optional[float]
+    total: float
+    audio_seconds: float
+    error: Optional[str] = None
+
+
+def text_lengths(count: int, distribution: str = "lognormal",
+                 mean_chars: int = DEFAULT_MEAN_CHARS, seed: int = 0) -> List[int]:
+    """Draw job text lengths from the named distribution"""
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{distribution}'. Choose from: {list(DISTRIBUTIONS)}")
+
+    rng = random.Random(seed)
+    if distribution == "fixed":
+        return [mean_chars] * count
+    if distribution == "uniform":
+        return [rng.randint(max(1, mean_chars // 2), mean_chars * 3 // 2) for _ in range(count)]
+
+    # Lognormal with the requested mean: exp(mu + sigma^2 / 2) == mean_chars
+    mu = math.log(mean_chars) - LOGNORMAL_SIGMA ** 2 / 2
+    return [max(1, int(rng.lognormvariate(mu, LOGNORMAL_SIGMA))) for _ in range(count)]
+
+
+def synthetic_text(chars: int, rng: random.Random) -> str:
+    """Sentence-like text of exactly chars characters"""
+    words = []
+    size = 0
+    while size < chars:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:chars]
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Linearly interpolated percentile, q in [0, 100]"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": sum(values) / len(values) if values else None,
+        "max": max(values) if values else None,
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_job(tts: GeminiTTS, text: str, request: SpeechRequest) -> JobResult:
+    """Stream one request and time its first chunk and completion"""
+    start = time.perf_counter()
+    ttfc = None
+    audio_bytes = 0
+    mime_type = None
+    try:
+        for data, chunk_mime_type in tts._stream_chunks(text, request):
+            if ttfc is None:
+                ttfc = time.perf_counter() - start
+            audio_bytes += len(data)
+            mime_type = mime_type or chunk_mime_type
+    except Exception as e:
+        return JobResult(len(text), ttfc, time.perf_counter() - start, 0.0,
+                         error=type(e).__name__)
+
+    parameters = tts._parse_audio_mime_type(mime_type or "audio/L16;rate=24000")
+    bytes_per_second = parameters["rate"] * parameters["bits_per_sample"] // 8
+    return JobResult(len(text), ttfc, time.perf_counter() - start, audio_bytes / bytes_per_second)
+
+
+@contextmanager
+def _environment(overrides: Dict[str, str]) -> Iterator[None]:
+    saved = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_load(jobs: int = DEFAULT_JOBS,
+             concurrency: int = DEFAULT_CONCURRENCY,
+             distribution: str = "lognormal",
+             mean_chars: int = DEFAULT_MEAN_CHARS,
+             voice_name: str = "Zephyr",
+             backend: Optional[str] = None,
+             standin_config: Optional[StandInConfig] = None,
+             base_url: Optional[str] = None,
+             seed: int = 0) -> Dict[str, Any]:
+    """Run the load test and return the report
+
+    Without base_url a stand-in server is started for the duration of the
+    run using standin_config.
+    """
+    rng = random.Random(seed)
+    texts = [synthetic_text(n, rng) for n in text_lengths(jobs, distribution, mean_chars, seed)]
+    request = SpeechRequest(voice_name=voice_name)
+
+    server = None
+    if base_url is None:
+        server = GeminiStandIn(standin_config or StandInConfig(seed=seed)).start()
+        base_url = server.url
+
+    overrides = {BASE_URL_ENV: base_url}
+    if not os.getenv("GEMINI_API_KEY"):
+        overrides["GEMINI_API_KEY"] = "standin-key"
+
+    try:
+        with _environment(overrides):
+            tts = GeminiTTS(backend=backend)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                results = list(pool.map(lambda text: run_job(tts, text, request), texts))
+            wall = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.stop()
+
+    succeeded = [r for r in results if r.error is None]
+    errors: Dict[str, int] = {}
+    for r in results:
+        if r.error is not None:
+            errors[r.error] = errors.get(r.error, 0) + 1
+    audio_seconds = sum(r.audio_seconds for r in succeeded)
+
+    return {
+        "config": {
+            "jobs": jobs,
+            "concurrency": concurrency,
+            "distribution": distribution,
+            "mean_chars": mean_chars,
+            "backend": tts.backend,
+            "base_url": base_url,
+            "seed": seed,
+            "standin": (standin_config or StandInConfig(seed=seed))._asdict() if server else None,
+        },
+        "completed": len(succeeded),
+        "errors": errors,
+        "wall_seconds": wall,
+        "jobs_per_second": len(succeeded) / wall,
+        "audio_seconds": audio_seconds,
+        "audio_seconds_per_second": audio_seconds / wall,
+        "ttfc_seconds": summarize([r.ttfc for r in succeeded if r.ttfc is not None]),
+        "latency_seconds": summarize([r.total for r in succeeded]),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 1000:.0f} ms"
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Human-readable summary of a load report"""
+    config = report["config"]
+    ttfc = report["ttfc_seconds"]
+    latency = report["latency_seconds"]
+    errors = ", ".join(f"{name}: {count}" for name, count in report["errors"].items()) or "none"
+    return "\n".join([
+        f"📊 {config['jobs']} jobs, concurrency {config['concurrency']}, "
+        f"{config['distribution']} text lengths (mean {config['mean_chars']} chars), "
+        f"{config['backend']} backend",
+        f"  Completed:      {report['completed']} in {report['wall_seconds']:.2f}s (errors: {errors})",
+        f"  TTFC:           p50 {_ms(ttfc['p50'])}, p95 {_ms(ttfc['p95'])}, p99 {_ms(ttfc['p99'])}",
+        f"  Latency:        p50 {_ms(latency['p50'])}, p95 {_ms(latency['p95'])}, p99 {_ms(latency['p99'])}",
+        f"  Throughput:     {report['jobs_per_second']:.2f} jobs/s, "
+        f"{report['audio_seconds_per_second']:.1f} audio-s/s",
+        f"  Peak RSS:       {report['peak_rss_mb']:.1f} MiB",
+    ])
+
+
+def write_report(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Peak-memory benchmark for long-form synthesis
+Renders 15/60/180-minute episodes against the local stand-in and records
+peak RSS and the tracemalloc peak of the synthesizing process. Each
+episode runs in a fresh child process so its peaks are not masked by
+earlier episodes or by the stand-in, which serves from the parent.
+
+An episode is one generate_speech() call over a script of one-minute
+turns separated by [pause] markers, so it is assembled from many
+requests the way long podcasts are.
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from gemini_api import BASE_URL_ENV
+from gemini_standin import GeminiStandIn, StandInConfig
+from load_bench import peak_rss_mb, synthetic_text
+
+EPISODE_MINUTES = {"15min": 15, "60min": 60, "180min": 180}
+TURN_SECONDS = 60
+
+# Fast stream: the benchmark measures buffering, not waiting
+MEM_STANDIN = StandInConfig(ttfc_seconds=0.0, bytes_per_second=200_000_000.0, chunk_seconds=0.5)
+
+
+def episode_script(minutes: float, chars_per_second: float, seed: int = 0) -> str:
+    """Alternating Host/Guest turns of TURN_SECONDS each, split by [pause] markers"""
+    rng = random.Random(seed)
+    turn_chars = int(TURN_SECONDS * chars_per_second)
+    turns = max(1, int(round(minutes * 60 / TURN_SECONDS)))
+    return " [pause] ".join(
+        f"{'Host' if i % 2 == 0 else 'Guest'}: {synthetic_text(turn_chars, rng)}"
+        for i in range(turns)
+    )
+
+
+def measure_episode(minutes: float, spill_mb: Optional[float], trace_malloc: bool = True,
+                    chars_per_second: float = MEM_STANDIN.chars_per_second) -> Dict[str, Any]:
+    """Render one episode in this process and report its memory peaks
+
+    Expects GEMINI_API_BASE_URL to point at a stand-in.
+    """
+    from gemini_tts import GeminiTTS
+
+    script = episode_script(minutes, chars_per_second)
+    tts = GeminiTTS(api_key=os.getenv("GEMINI_API_KEY") or "bench-key", backend="rest",
+                    local_pauses=True, spill_mb=spill_mb or 0)
+    baseline_rss = peak_rss_mb()
+
+    if trace_malloc:
+        tracemalloc.start()
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        path = tts.generate_speech(script, output_file=os.path.join(workdir, "episode"))
+        elapsed = time.perf_counter() - start
+        audio_bytes = os.path.getsize(path)
+    traced_peak = tracemalloc.get_traced_memory()[1] if trace_malloc else None
+    if trace_malloc:
+        tracemalloc.stop()
+
+    mb = 1024 * 1024
+    return {
+        "minutes": minutes,
+        "spill_mb": spill_mb,
+        "audio_mb": audio_bytes / mb,
+        "seconds": elapsed,
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": peak_rss_mb(),
+        "tracemalloc_peak_mb": traced_peak / mb if traced_peak is not None else None,
+    }
+
+
+def run_mem(episodes: Optional[Sequence[str]] = None,
+            spill_mb: Optional[float] = None,
+            trace_malloc: bool = True,
+            standin_config: StandInConfig = MEM_STANDIN) -> Dict[str, Dict[str, Any]]:
+    """Measure each episode size in its own child process"""
+    episodes = list(episodes or EPISODE_MINUTES)
+    for name in episodes:
+        if name not in EPISODE_MINUTES:
+            raise ValueError(f"Unknown episode '{name}'. Choose from: {list(EPISODE_MINUTES)}")
+
+    results = {}
+    with GeminiStandIn(standin_config) as server:
+        env = dict(os.environ, **{BASE_URL_ENV: server.url})
+        env.setdefault("GEMINI_API_KEY", "bench-key")
+        for name in episodes:
+            command = [sys.executable, str(Path(__file__).resolve()), "--child",
+                       str(EPISODE_MINUTES[name]), str(spill_mb or 0),
+                       "1" if trace_malloc else "0", str(standin_config.chars_per_second)]
+            child = subprocess.run(command, env=env, capture_output=True, text=True)
+            if child.returncode != 0:
+                raise RuntimeError(f"{name} episode failed: {child.stderr.strip()}")
+            results[name] = json.loads(child.stdout.strip().splitlines()[-1])
+    return results
+
+
+def format_mem(results: Dict[str, Dict[str, Any]]) -> str:
+    """Table of peaks per episode; growth is peak RSS over the pre-synthesis RSS per MiB of audio"""
+    spill = next(iter(results.values()))["spill_mb"] if results else None
+    lines = [f"📊 Peak memory per episode (spill threshold: {f'{spill:g} MiB' if spill else 'off'})",
+             f"  {'episode':<8} {'audio':>10} {'time':>8} {'peak RSS':>11} {'tracemalloc':>12} {'growth/audio':>13}"]
+    for name, r in results.items():
+        growth = (r["peak_rss_mb"] - r["baseline_rss_mb"]) / r["audio_mb"] if r["audio_mb"] else 0.0
+        traced = "-" if r["tracemalloc_peak_mb"] is None else f"{r['tracemalloc_peak_mb']:.1f} MiB"
+        lines.append(f"  {name:<8} {r['audio_mb']:>6.1f} MiB {r['seconds']:>7.1f}s "
+                     f"{r['peak_rss_mb']:>7.1f} MiB {traced:>12} {growth:>12.2f}x")
+    return "\n".join(lines)
+
+
+def _child_main(argv: Sequence[str]) -> int:
+    minutes, spill_mb, trace_malloc, chars_per_second = argv
+    os.environ.setdefault("GEMINI_TTS_LOG_LEVEL", "warning")
+    result = measure_episode(float(minutes), float(spill_mb) or None, trace_malloc == "1",
+                             chars_per_second=float(chars_per_second))
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        sys.exit(_child_main(sys.argv[2:]))
+    print(format_mem(run_mem()))
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the audio hot paths
+Each case is sized by episode length, assuming the API streams about half a
+second of 24 kHz 16-bit mono PCM per chunk, so a 60-minute episode is 7200
+chunks. The same cases run under pytest-benchmark (tests/benchmarks) and
+from `podcast_cli.py bench micro`.
+"""
+
+import base64
+import json
+import os
+import statistics
+import tempfile
+import timeit
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from gemini_api import GeminiAPI, speech_payload
+from gemini_tts import GeminiTTS, SpeechRequest
+
+MIME_TYPE = "audio/L16;codec=pcm;rate=24000"
+SAMPLE_RATE = 24000
+BYTES_PER_SECOND = SAMPLE_RATE * 2
+CHUNK_SECONDS = 0.5
+CHUNK_BYTES = int(BYTES_PER_SECOND * CHUNK_SECONDS)
+
+# Episode name -> length in seconds
+EPISODES = {"1min": 60, "15min": 15 * 60, "60min": 60 * 60}
+
+# Benchmarked callable and the number of audio bytes it processes per call
+Prepared = Tuple[Callable[[], Any], int]
+
+
+class MicroCase(NamedTuple):
+    """A benchmark case; setup builds the callable for a number of chunks"""
+    name: str
+    setup: Callable[[int], Prepared]
+    per_episode: bool = True
+
+
+def chunk_count(episode: str) -> int:
+    return int(EPISODES[episode] / CHUNK_SECONDS)
+
+
+def make_chunks(count: int) -> List[bytes]:
+    """Distinct PCM chunks so nothing is shared between them"""
+    return [bytes([i % 251]) * CHUNK_BYTES for i in range(count)]
+
+
+def _bench_tts() -> GeminiTTS:
+    return GeminiTTS(api_key="bench-key", backend="rest")
+
+
+class _FakeModels:
+    def __init__(self, chunks: Sequence[Any]):
+        self.chunks = chunks
+
+    def generate_content_stream(self, **kwargs: Any) -> Sequence[Any]:
+        return self.chunks
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, lines: Sequence[bytes]):
+        self.lines = lines
+
+    def iter_lines(self, chunk_size: int = 512):
+        return iter(self.lines)
+
+    def close(self) -> None:
+        pass
+
+
+def _sdk_chunk(data: bytes) -> SimpleNamespace:
+    """Object shaped like a google-genai streaming response chunk"""
+    inline_data = SimpleNamespace(data=data, mime_type=MIME_TYPE)
+    part = SimpleNamespace(inline_data=inline_data)
+    candidate = SimpleNamespace(content=SimpleNamespace(parts=[part]))
+    return SimpleNamespace(candidates=[candidate])
+
+
+def _sdk_extraction(count: int, timed: bool) -> Prepared:
+    tts = GeminiTTS(api_key="bench-key", backend="sdk")
+    tts.client = SimpleNamespace(models=_FakeModels([_sdk_chunk(c) for c in make_chunks(count)]))
+    if timed:
+        tts.add_timing_hook(lambda timing: None)
+    request = SpeechRequest(voice_name="Zephyr")
+    return (lambda: tts._synthesize("benchmark", request)), count * CHUNK_BYTES
+
+
+def setup_sdk_chunk_extraction(count: int) -> Prepared:
+    """GeminiTTS pulling inline audio out of SDK response objects"""
+    return _sdk_extraction(count, timed=False)
+
+
+def setup_timed_chunk_extraction(count: int) -> Prepared:
+    """SDK chunk extraction with a timing hook registered"""
+    return _sdk_extraction(count, timed=True)
+
+
+def setup_join(count: int) -> Prepared:
+    chunks = make_chunks(count)
+    return (lambda: b"".join(chunks)), count * CHUNK_BYTES
+
+
+def setup_convert_to_wav(count: int) -> Prepared:
+    tts = _bench_tts()
+    pcm = b"".join(make_chunks(count))
+    return (lambda: tts._convert_to_wav(pcm, MIME_TYPE)), len(pcm)
+
+
+def setup_parse_mime_type(count: int) -> Prepared:
+    tts = _bench_tts()
+    return (lambda: tts._parse_audio_mime_type(MIME_TYPE)), 0
+
+
+def setup_sdk_request_config(count: int) -> Prepared:
+    """Per-call SDK request config for a small clip"""
+    tts = GeminiTTS(api_key="bench-key", backend="sdk")
+    return (lambda: tts._sdk_config(SpeechRequest(voice_name="Zephyr", temperature=0.8))), 0
+
+
+def setup_rest_request_payload(count: int) -> Prepared:
+    """Per-call REST request body for a small clip"""
+    return (lambda: speech_payload("Welcome back to the show.", "Zephyr", None, 0.8)), 0
+
+
+def setup_save_audio_file(count: int) -> Prepared:
+    tts = _bench_tts()
+    pcm = b"".join(make_chunks(count))
+    # Removed once the benchmarked callable (and so this closure) is collected
+    workdir = tempfile.TemporaryDirectory(prefix="micro_bench_")
+    path = os.path.join(workdir.name, "episode")
+    return (lambda: workdir and tts.save_audio_file(path, pcm, MIME_TYPE)), len(pcm)
+
+
+def setup_rest_decode(count: int) -> Prepared:
+    """GeminiAPI parsing SSE events and base64-decoding their audio"""
+    api = GeminiAPI(api_key="bench-key")
+    lines = []
+    for chunk in make_chunks(count):
+        event = {"candidates": [{"content": {"parts": [
+            {"inlineData": {"mimeType": MIME_TYPE, "data": base64.b64encode(chunk).decode("ascii")}}
+        ]}}]}
+        lines.append(b"data: " + json.dumps(event).encode("ascii"))
+        lines.append(b"")
+    api.session.post = lambda *args, **kwargs: _FakeResponse(lines)
+    return (lambda: sum(len(pcm) for pcm, _ in api.stream_speech("benchmark"))), count * CHUNK_BYTES
+
+
+CASES = (
+    MicroCase("sdk_chunk_extraction", setup_sdk_chunk_extraction),
+    MicroCase("timed_chunk_extraction", setup_timed_chunk_extraction),
+    MicroCase("join_chunks", setup_join),
+    MicroCase("convert_to_wav", setup_convert_to_wav),
+    MicroCase("parse_audio_mime_type", setup_parse_mime_type, per_episode=False),
+    MicroCase("sdk_request_config", setup_sdk_request_config, per_episode=False),
+    MicroCase("rest_request_payload", setup_rest_request_payload, per_episode=False),
+    MicroCase("save_audio_file", setup_save_audio_file),
+    MicroCase("rest_base64_decode", setup_rest_decode),
+)
+
+
+def run_case(case: MicroCase, episode: str, repeat: int = 5) -> Dict[str, Any]:
+    """Time one case with timeit, reporting per-call seconds and MB/s"""
+    fn, nbytes = case.setup(chunk_count(episode))
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    best = min(times)
+    return {
+        "min_seconds": best,
+        "median_seconds": statistics.median(times),
+        "calls_per_repeat": number,
+        "mb_per_second": nbytes / best / 1e6 if nbytes else None,
+    }
+
+
+def run_micro(cases: Optional[Sequence[str]] = None,
+              episodes: Optional[Sequence[str]] = None,
+              repeat: int = 5) -> Dict[str, Dict[str, Any]]:
+    """Run the selected cases; results are keyed "case[episode]" """
+    results = {}
+    for case in CASES:
+        if cases and case.name not in cases:
+            continue
+        for episode in (episodes or EPISODES) if case.per_episode else ["1min"]:
+            key = f"{case.name}[{episode}]" if case.per_episode else case.name
+            results[key] = run_case(case, episode, repeat=repeat)
+    return results
+
+
+def format_micro(results: Dict[str, Dict[str, Any]]) -> str:
+    """Table of per-call times and throughput"""
+    lines = [f"{'case':<34} {'min':>12} {'median':>12} {'MB/s':>10}"]
+    for key, result in results.items():
+        throughput = result["mb_per_second"]
+        lines.append(f"{key:<34} {result['min_seconds'] * 1e3:>9.3f} ms "
+                     f"{result['median_seconds'] * 1e3:>9.3f} ms "
+                     f"{'-' if throughput is None else f'{throughput:.0f}':>10}")
+    return "\n".join(lines)
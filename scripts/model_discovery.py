@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Cached model and voice discovery
+The TTS models visible to an API key are looked up with one list_models
+call and kept, with the voices they offer and whether the check passed,
+in a small JSON file (GEMINI_TTS_DISCOVERY_FILE, default
+.tmp/discovery.json) for GEMINI_TTS_DISCOVERY_TTL seconds. An expired
+healthy entry keeps being served while a background thread refreshes it,
+so only a first run, or a run after a failed check, waits on the API.
+Entries record a hash of the API key they were checked with; a different
+key is checked afresh rather than trusting another key's result.
+
+The models endpoint does not describe voices. Every Gemini TTS model
+offers the same prebuilt voices, so those are reported whenever at least
+one TTS model is available.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from gemini_api import BASE_URL_ENV, DEFAULT_BASE_URL, GeminiAPI
+from tts_logging import get_logger
+from tts_metrics import default_metrics
+
+DISCOVERY_FILE_ENV = "GEMINI_TTS_DISCOVERY_FILE"
+DISCOVERY_TTL_ENV = "GEMINI_TTS_DISCOVERY_TTL"
+
+DEFAULT_DISCOVERY_FILE = Path(__file__).resolve().parent.parent / ".tmp" / "discovery.json"
+DEFAULT_TTL_SECONDS = 6 * 3600.0
+
+# Failed checks are retried this soon, so an outage is not cached for hours
+FAILURE_TTL_SECONDS = 60.0
+
+# A refresh lock older than this was left by a process that died mid-refresh
+LOCK_STALE_SECONDS = 120.0
+
+# How long an exiting process waits for its background refresh to land
+EXIT_WAIT_SECONDS = 3.0
+
+PREBUILT_VOICES = (
+    "Zephyr", "Puck", "Charon", "Kore", "Fenrir", "Leda", "Orus", "Aoede",
+    "Callirrhoe", "Autonoe", "Enceladus", "Iapetus", "Umbriel", "Algieba",
+    "Despina", "Erinome", "Algenib", "Rasalgethi", "Laomedeia", "Achernar",
+    "Alnilam", "Schedar", "Gacrux", "Pulcherrima", "Achird", "Zubenelgenubi",
+    "Vindemiatrix", "Sadachbia", "Sadaltager", "Sulafat",
+)
+
+logger = get_logger("discovery")
+
+
+class Discovery(NamedTuple):
+    """Outcome of one models lookup"""
+    checked_at: float
+    base_url: str
+    healthy: bool
+    tts_models: Tuple[str, ...] = ()
+    voices: Tuple[str, ...] = ()
+    error: Optional[str] = None
+    # key_id() of the API key the lookup was made with
+    key_id: str = ""
+
+    def expired(self, ttl: float, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return now - self.checked_at >= (ttl if self.healthy else FAILURE_TTL_SECONDS)
+
+
+def discovery_path() -> str:
+    return os.getenv(DISCOVERY_FILE_ENV) or str(DEFAULT_DISCOVERY_FILE)
+
+
+def discovery_ttl() -> float:
+    return float(os.getenv(DISCOVERY_TTL_ENV, DEFAULT_TTL_SECONDS))
+
+
+def key_id(api_key: Optional[str]) -> str:
+    """Short fingerprint of an API key, safe to store in the cache file"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16] if api_key else ""
+
+
+def resolve_base_url(base_url: Optional[str] = None) -> str:
+    return (base_url or os.getenv(BASE_URL_ENV) or DEFAULT_BASE_URL).rstrip("/")
+
+
+def load_cached(path: Optional[str] = None) -> Optional[Discovery]:
+    """The cached discovery, or None if there is none or it cannot be read"""
+    try:
+        with open(path or discovery_path(), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return Discovery(
+            checked_at=float(data["checked_at"]),
+            base_url=data["base_url"],
+            healthy=bool(data["healthy"]),
+            tts_models=tuple(data.get("tts_models") or ()),
+            voices=tuple(data.get("voices") or ()),
+            error=data.get("error"),
+            key_id=data.get("key_id") or "",
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save(discovery: Discovery, path: Optional[str] = None) -> None:
+    """Replace the cache file atomically, so readers never see half a file"""
+    path = path or discovery_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(discovery._asdict(), f)
+    os.replace(temp_path, path)
+
+
+def fetch(api: GeminiAPI) -> Discovery:
+    """Look up TTS models with a single list_models call"""
+    now = time.time()
+    api_key_id = key_id(api.api_key)
+    try:
+        models = api.list_models()
+    except Exception as e:
+        return Discovery(now, api.base_url, False, error=f"{type(e).__name__}: {e}", key_id=api_key_id)
+
+    names = [model.get("name", "").rpartition("/")[2] for model in models]
+    tts_models = tuple(sorted(name for name in names if "tts" in name.lower()))
+    if not tts_models:
+        return Discovery(now, api.base_url, False,
+                         error=f"No TTS models found. Available models: {names[:5]}", key_id=api_key_id)
+    return Discovery(now, api.base_url, True, tts_models, PREBUILT_VOICES, key_id=api_key_id)
+
+
+def refresh(api: GeminiAPI, path: Optional[str] = None) -> Discovery:
+    """Run the lookup now and cache its outcome, failures included"""
+    discovery = fetch(api)
+    save(discovery, path)
+    logger.debug("Discovery refreshed: %s", "healthy" if discovery.healthy else discovery.error,
+                 extra={"healthy": discovery.healthy, "tts_models": list(discovery.tts_models)})
+    return discovery
+
+
+def _acquire_lock(lock_path: str) -> bool:
+    for _ in range(2):
+        try:
+            os.close(os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) < LOCK_STALE_SECONDS:
+                    return False
+                os.unlink(lock_path)
+            except OSError:
+                return False
+    return False
+
+
+def refresh_in_background(api_factory: Callable[[], GeminiAPI],
+                          path: Optional[str] = None) -> Optional[threading.Thread]:
+    """Refresh on a daemon thread unless another process is already refreshing"""
+    path = path or discovery_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    lock_path = path + ".lock"
+    if not _acquire_lock(lock_path):
+        return None
+
+    def run() -> None:
+        try:
+            with api_factory() as api:
+                refresh(api, path)
+        except Exception as e:
+            logger.debug("Background discovery refresh failed: %s", e)
+        finally:
+            try:
+                os.unlink(lock_path)
+            except OSError:
+                pass
+
+    thread = threading.Thread(target=run, name="gemini-discovery", daemon=True)
+    thread.start()
+    atexit.register(thread.join, EXIT_WAIT_SECONDS)
+    return thread
+
+
+def current(api_key: Optional[str] = None,
+            base_url: Optional[str] = None,
+            path: Optional[str] = None,
+            ttl: Optional[float] = None,
+            block: bool = True) -> Optional[Discovery]:
+    """Discovery state, answered from the cache whenever possible
+
+    A healthy entry past its TTL is returned as is while it is refreshed
+    in the background. With nothing usable cached (no entry, an entry for
+    another base URL or API key, or an expired failure) the lookup runs inline when
+    block is set; otherwise it is started in the background and the
+    stale entry, if any, is returned.
+    """
+    path = path or discovery_path()
+    ttl = discovery_ttl() if ttl is None else ttl
+    base_url = resolve_base_url(base_url)
+    api_key = api_key or os.getenv("GEMINI_API_KEY")
+
+    # Entries from before keys were recorded have no key_id and never match
+    cached = load_cached(path)
+    if cached is not None and (cached.base_url != base_url or not api_key
+                               or cached.key_id != key_id(api_key)):
+        cached = None
+    fresh = cached is not None and not cached.expired(ttl)
+    metrics = default_metrics()
+    if metrics is not None:
+        metrics.cache_lookup("discovery", hit=fresh)
+    if fresh:
+        return cached
+
+    def api_factory() -> GeminiAPI:
+        return GeminiAPI(api_key=api_key, base_url=base_url)
+
+    if not block or (cached is not None and cached.healthy):
+        if api_key:
+            refresh_in_background(api_factory, path)
+        return cached
+
+    with api_factory() as api:
+        return refresh(api, path)
+
+
+def check_health(api_key: Optional[str] = None,
+                 base_url: Optional[str] = None,
+                 path: Optional[str] = None,
+                 ttl: Optional[float] = None) -> Discovery:
+    """Preflight that costs an API round trip only when the cached state has expired"""
+    try:
+        return current(api_key, base_url, path, ttl, block=True)
+    except ValueError as e:
+        # No API key
+        return Discovery(time.time(), resolve_base_url(base_url), False, error=str(e))
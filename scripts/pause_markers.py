@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Local pause rendering for TTS scripts
+Splits text at [pause] / ellipsis markers so silence is generated locally
+instead of being synthesized by the model
+"""
+
+import re
+from typing import List, NamedTuple, Optional, Sequence
+
+# Default pause lengths in seconds
+DEFAULT_PAUSE_SECONDS = 0.75
+SHORT_PAUSE_SECONDS = 0.35
+LONG_PAUSE_SECONDS = 1.5
+ELLIPSIS_PAUSE_SECONDS = 0.4
+
+# [pause], [pauses], [short pause], [long pause], [pause 2s], [pause=500ms]
+# and "..." / "…" ellipses
+PAUSE_MARKER_RE = re.compile(
+    r"\[\s*(?P<kind>short|long)?\s*paus(?:e|es|ed)"
+    r"(?:\s*[:=]?\s*(?P<value>\d+(?:\.\d+)?)\s*(?P<unit>ms|s)?)?\s*\]"
+    r"|(?P<ellipsis>\.\.\.+|…)",
+    re.IGNORECASE,
+)
+
+SPEAKER_LABEL_RE = re.compile(r"^\s*([^\n:]{1,40}):", re.MULTILINE)
+
+
+class PauseSegment(NamedTuple):
+    """Text to synthesize followed by locally rendered silence"""
+    text: str
+    pause_after: float
+
+
+def _marker_seconds(match: "re.Match[str]",
+                    pause_seconds: float,
+                    ellipsis_seconds: float) -> float:
+    """Resolve the silence duration requested by a single marker"""
+    if match.group("ellipsis"):
+        return ellipsis_seconds
+
+    value = match.group("value")
+    if value is not None:
+        seconds = float(value)
+        if (match.group("unit") or "s").lower() == "ms":
+            seconds /= 1000.0
+        return seconds
+
+    kind = (match.group("kind") or "").lower()
+    if kind == "short":
+        return SHORT_PAUSE_SECONDS
+    if kind == "long":
+        return LONG_PAUSE_SECONDS
+    return pause_seconds
+
+
+def has_pause_markers(text: str, include_ellipsis: bool = True) -> bool:
+    """Check whether text contains any marker that would be rendered locally"""
+    for match in PAUSE_MARKER_RE.finditer(text):
+        if include_ellipsis or not match.group("ellipsis"):
+            return True
+    return False
+
+
+def split_at_pauses(text: str,
+                    pause_seconds: float = DEFAULT_PAUSE_SECONDS,
+                    ellipsis_seconds: float = ELLIPSIS_PAUSE_SECONDS,
+                    include_ellipsis: bool = True,
+                    speaker_labels: Optional[Sequence[str]] = None) -> List[PauseSegment]:
+    """Split text at pause markers, stripping them from the synthesized text
+
+    Consecutive markers are merged into a single pause. A leading pause is
+    returned as a segment with empty text. When speaker_labels is given
+    (multi-speaker scripts), a segment that continues a turn after a pause
+    is prefixed with the label of the speaker who was talking.
+    """
+    segments: List[PauseSegment] = []
+    current_text = ""
+    current_pause = 0.0
+    position = 0
+
+    for match in PAUSE_MARKER_RE.finditer(text):
+        if match.group("ellipsis") and not include_ellipsis:
+            continue
+
+        chunk = text[position:match.start()].strip()
+        position = match.end()
+
+        if chunk:
+            if current_text or current_pause:
+                segments.append(PauseSegment(current_text, current_pause))
+            current_text, current_pause = chunk, 0.0
+
+        current_pause += _marker_seconds(match, pause_seconds, ellipsis_seconds)
+
+    tail = text[position:].strip()
+    if tail:
+        if current_text or current_pause:
+            segments.append(PauseSegment(current_text, current_pause))
+        current_text, current_pause = tail, 0.0
+
+    if current_text or current_pause:
+        segments.append(PauseSegment(current_text, current_pause))
+
+    if speaker_labels:
+        segments = _carry_speaker_labels(segments, speaker_labels)
+
+    return segments
+
+
+def _carry_speaker_labels(segments: List[PauseSegment],
+                          speaker_labels: Sequence[str]) -> List[PauseSegment]:
+    """Re-attach the current speaker label to segments split mid-turn"""
+    labels = {label.strip() for label in speaker_labels}
+    current_label = None
+    result = []
+
+    for segment in segments:
+        text = segment.text
+        if text:
+            first = SPEAKER_LABEL_RE.match(text)
+            if current_label and not (first and first.group(1).strip() in labels):
+                text = f"{current_label}: {text}"
+
+            for match in SPEAKER_LABEL_RE.finditer(text):
+                label = match.group(1).strip()
+                if label in labels:
+                    current_label = label
+
+        result.append(PauseSegment(text, segment.pause_after))
+
+    return result
+
+
+def render_silence(seconds: float,
+                   sample_rate: int = 24000,
+                   bits_per_sample: int = 16,
+                   num_channels: int = 1) -> bytes:
+    """Generate exact PCM silence for the given duration"""
+    if seconds <= 0:
+        return b""
+
+    num_frames = int(round(seconds * sample_rate))
+    block_align = num_channels * (bits_per_sample // 8)
+
+    # 8-bit PCM is unsigned, so its zero level is 0x80
+    if bits_per_sample == 8:
+        return b"\x80" * (num_frames * block_align)
+    return bytes(num_frames * block_align)
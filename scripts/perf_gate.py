@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Performance regression gate
+Runs the micro-benchmarks, a fixed load test against the local stand-in and
+a CLI startup probe, then compares every metric with a committed baseline.
+Metrics ending in "_per_second" must not drop; everything else must not
+grow beyond its tolerance.
+"""
+
+import fnmatch
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from gemini_standin import StandInConfig
+from load_bench import run_load
+from micro_bench import run_micro
+
+DEFAULT_BASELINE = str(Path(__file__).parent.parent / "tests" / "benchmarks" / "baseline.json")
+
+# Relative change allowed before a metric counts as regressed; the most
+# specific matching pattern wins
+DEFAULT_TOLERANCES = {
+    "*": 0.30,
+    "micro.*": 0.50,
+    "startup.*": 0.50,
+    "load.peak_rss_mb": 0.15,
+}
+
+GATE_MICRO_EPISODES = ("1min", "15min")
+
+# Short, fast stream so the load test measures client overhead, not waiting
+GATE_LOAD = {
+    "jobs": 40,
+    "concurrency": 8,
+    "distribution": "lognormal",
+    "mean_chars": 200,
+    "backend": "rest",
+    "seed": 0,
+}
+GATE_STANDIN = StandInConfig(ttfc_seconds=0.05, bytes_per_second=4_000_000.0)
+
+CLI_PATH = str(Path(__file__).parent / "podcast_cli.py")
+
+
+class Comparison(NamedTuple):
+    """One metric checked against its baseline"""
+    name: str
+    baseline: Optional[float]
+    current: Optional[float]
+    tolerance: float
+    status: str
+
+    @property
+    def change(self) -> Optional[float]:
+        if not self.baseline or self.current is None:
+            return None
+        return (self.current - self.baseline) / self.baseline
+
+
+def higher_is_better(name: str) -> bool:
+    return name.endswith("_per_second")
+
+
+def tolerance_for(name: str, tolerances: Dict[str, float]) -> float:
+    """Tolerance of the longest pattern matching name"""
+    matches = [pattern for pattern in tolerances if fnmatch.fnmatchcase(name, pattern)]
+    if not matches:
+        return DEFAULT_TOLERANCES["*"]
+    return tolerances[max(matches, key=len)]
+
+
+def measure_startup(runs: int = 5) -> float:
+    """Median wall time of `podcast_cli.py --help` in a fresh interpreter"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, CLI_PATH, "--help"], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def collect_metrics(micro_episodes: Sequence[str] = GATE_MICRO_EPISODES,
+                    micro_repeat: int = 3,
+                    startup_runs: int = 5) -> Dict[str, float]:
+    """Run every suite and flatten the results into metric -> value
+
+    The load test runs before the micro-benchmarks so peak RSS reflects
+    the load test rather than the large micro-benchmark buffers.
+    """
+    metrics = {"startup.podcast_cli_seconds": measure_startup(startup_runs)}
+
+    load = run_load(standin_config=GATE_STANDIN, **GATE_LOAD)
+    metrics.update({
+        "load.ttfc_p50_seconds": load["ttfc_seconds"]["p50"],
+        "load.ttfc_p95_seconds": load["ttfc_seconds"]["p95"],
+        "load.latency_p50_seconds": load["latency_seconds"]["p50"],
+        "load.latency_p95_seconds": load["latency_seconds"]["p95"],
+        "load.latency_p99_seconds": load["latency_seconds"]["p99"],
+        "load.jobs_per_second": load["jobs_per_second"],
+        "load.audio_seconds_per_second": load["audio_seconds_per_second"],
+        "load.peak_rss_mb": load["peak_rss_mb"],
+    })
+
+    for key, result in run_micro(episodes=micro_episodes, repeat=micro_repeat).items():
+        metrics[f"micro.{key}.min_seconds"] = result["min_seconds"]
+
+    return metrics
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float],
+            tolerances: Dict[str, float]) -> List[Comparison]:
+    """Classify each metric as ok, regressed, improved, new or missing"""
+    rows = []
+    for name in sorted(set(current) | set(baseline)):
+        tolerance = tolerance_for(name, tolerances)
+        old, new = baseline.get(name), current.get(name)
+        if old is None:
+            status = "new"
+        elif new is None:
+            status = "missing"
+        else:
+            change = (new - old) / old if old else 0.0
+            worse = -change if higher_is_better(name) else change
+            if worse > tolerance:
+                status = "regressed"
+            elif -worse > tolerance:
+                status = "improved"
+            else:
+                status = "ok"
+        rows.append(Comparison(name, old, new, tolerance, status))
+    return rows
+
+
+def _value(name: str, value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if name.endswith("_seconds"):
+        return f"{value * 1000:.3f} ms"
+    if name.endswith("_mb"):
+        return f"{value:.1f} MiB"
+    return f"{value:.2f}"
+
+
+STATUS_MARKS = {"ok": "✓", "improved": "⬆", "regressed": "❌", "new": "＋", "missing": "?"}
+
+
+def format_comparison(rows: Sequence[Comparison]) -> str:
+    """Readable diff table, regressions first"""
+    order = {"regressed": 0, "missing": 1, "new": 2, "improved": 3, "ok": 4}
+    width = max([len(row.name) for row in rows] + [6])
+    lines = [f"   {'metric':<{width}} {'baseline':>14} {'current':>14} {'change':>9} {'limit':>7}"]
+    for row in sorted(rows, key=lambda r: (order[r.status], r.name)):
+        change = "-" if row.change is None else f"{row.change:+.1%}"
+        limit = ("+" if not higher_is_better(row.name) else "-") + f"{row.tolerance:.0%}"
+        lines.append(f"{STATUS_MARKS[row.status]}  {row.name:<{width}} "
+                     f"{_value(row.name, row.baseline):>14} {_value(row.name, row.current):>14} "
+                     f"{change:>9} {limit:>7}")
+    return "\n".join(lines)
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_baseline(path: str, metrics: Dict[str, float],
+                   tolerances: Optional[Dict[str, float]] = None) -> None:
+    baseline = {
+        "tolerances": tolerances or DEFAULT_TOLERANCES,
+        "metrics": {name: metrics[name] for name in sorted(metrics)},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def run_gate(baseline_path: str = DEFAULT_BASELINE,
+             update_baseline: bool = False,
+             metrics: Optional[Dict[str, float]] = None) -> int:
+    """Collect metrics and compare them; returns the process exit code"""
+    if metrics is None:
+        metrics = collect_metrics()
+
+    if update_baseline:
+        tolerances = None
+        if Path(baseline_path).exists():
+            tolerances = load_baseline(baseline_path).get("tolerances")
+        write_baseline(baseline_path, metrics, tolerances)
+        print(f"✅ Baseline with {len(metrics)} metrics written to: {baseline_path}")
+        return 0
+
+    if not Path(baseline_path).exists():
+        print(f"❌ Baseline not found: {baseline_path} (create it with --update-baseline)")
+        return 2
+
+    baseline = load_baseline(baseline_path)
+    rows = compare(metrics, baseline["metrics"], baseline.get("tolerances", DEFAULT_TOLERANCES))
+    print(format_comparison(rows))
+
+    regressed = [row for row in rows if row.status == "regressed"]
+    if regressed:
+        print(f"\n❌ {len(regressed)} of {len(rows)} metrics regressed beyond tolerance")
+        return 1
+    print(f"\n✅ No regressions across {len(rows)} metrics")
+    return 0
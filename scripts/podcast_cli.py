@@ -11,11 +11,349 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent))
 
+import model_discovery
+import prompt_library
+import tracing
+from gemini_api import GeminiAPI
 from gemini_tts import GeminiTTS
+from podcast_pipeline import (
+    AUDIO_FORMATS, DEFAULT_TTS_WORKERS, PODCAST_TYPES, SCRIPT_PROVIDERS, TTS_PROVIDERS, PodcastConfig,
+    PodcastPipeline, read_source,
+)
+from tts_logging import (
+    LOG_FORMATS, LOG_LEVELS, RESULT_FILE_ENV, configure_logging, emit_result, is_quiet, log_context,
+)
+from wav_io import concat_wav
+
+DEFAULT_TRACE_FILE = str(Path(__file__).parent.parent / ".tmp" / "traces.jsonl")
+
+
+def say(message: str = "") -> None:
+    """Human-facing progress output, silenced in quiet mode"""
+    if not is_quiet():
+        print(message)
+
+
+def run_bench(args, bench_parser) -> int:
+    """Run a bench subcommand"""
+    if args.bench_command == "micro":
+        from load_bench import write_report
+        from micro_bench import format_micro, run_micro
+        
+        results = run_micro(cases=args.cases, episodes=args.episode, repeat=args.repeat)
+        print(format_micro(results))
+        if args.json:
+            write_report(results, args.json)
+            print(f"✅ Results saved to: {args.json}")
+        return 0
+    
+    if args.bench_command == "gate":
+        from load_bench import write_report
+        from perf_gate import DEFAULT_BASELINE, collect_metrics, run_gate
+        
+        print("🚦 Running micro, load and startup benchmarks...")
+        metrics = collect_metrics()
+        if args.json:
+            write_report(metrics, args.json)
+        return run_gate(args.baseline or DEFAULT_BASELINE,
+                        update_baseline=args.update_baseline, metrics=metrics)
+    
+    if args.bench_command == "mem":
+        from load_bench import write_report
+        from mem_bench import format_mem, run_mem
+        
+        print("🧠 Rendering episodes in child processes...")
+        results = run_mem(episodes=args.episode, spill_mb=args.spill_mb,
+                          trace_malloc=not args.no_tracemalloc)
+        print(format_mem(results))
+        if args.json:
+            write_report(results, args.json)
+            print(f"✅ Results saved to: {args.json}")
+        return 0
+    
+    if args.bench_command != "load":
+        bench_parser.print_help()
+        return 1
+    
+    from gemini_standin import StandInConfig
+    from load_bench import format_report, run_load, write_report
+    
+    config = StandInConfig(ttfc_seconds=args.ttfc, bytes_per_second=args.bytes_per_second,
+                           error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+                           seed=args.seed)
+    print(f"🏋️ Running {args.jobs} jobs against {args.url or 'local stand-in'}...")
+    report = run_load(jobs=args.jobs, concurrency=args.concurrency,
+                      distribution=args.distribution, mean_chars=args.mean_chars,
+                      voice_name=args.voice, backend=args.backend,
+                      standin_config=config, base_url=args.url, seed=args.seed)
+    print(format_report(report))
+    if args.json:
+        write_report(report, args.json)
+        print(f"✅ Report saved to: {args.json}")
+    return 0
+
+
+def run_trace(args, trace_parser) -> int:
+    """Run a trace subcommand"""
+    if args.trace_command not in ("show", "list"):
+        trace_parser.print_help()
+        return 1
+    
+    trace_file = args.file or os.getenv(tracing.TRACE_FILE_ENV) or DEFAULT_TRACE_FILE
+    if not os.path.exists(trace_file):
+        print(f"❌ Trace file not found: {trace_file}")
+        return 1
+    
+    spans = tracing.load_spans(trace_file)
+    traces = tracing.list_traces(spans)
+    if not traces:
+        print(f"❌ No traces in: {trace_file}")
+        return 1
+    
+    if args.trace_command == "list":
+        for trace in traces[-args.limit:]:
+            errors = f", {trace['errors']} errors" if trace["errors"] else ""
+            print(f"  • {trace['trace_id']}  {trace['root'] or '-'}  "
+                  f"{trace['end'] - trace['start']:.2f}s  {trace['spans']} spans{errors}")
+        return 0
+    
+    trace_id = args.trace_id or traces[-1]["trace_id"]
+    matching = [t["trace_id"] for t in traces if t["trace_id"].startswith(trace_id)]
+    if len(matching) != 1:
+        print(f"❌ {'Ambiguous' if matching else 'Unknown'} trace id: {trace_id}")
+        return 1
+    print(tracing.format_waterfall([s for s in spans if s["trace_id"] == matching[0]]))
+    return 0
+
+
+def make_tts(args) -> GeminiTTS:
+    """GeminiTTS client configured from the global and subcommand options"""
+    tts = GeminiTTS(backend=args.backend, cassette=args.cassette, record=args.record,
+                    replay_time_scale=args.replay_time_scale, spill_mb=args.spill_mb)
+    
+    if getattr(args, "local_pauses", False):
+        tts.local_pauses = True
+    if getattr(args, "pause_seconds", None) is not None:
+        tts.pause_seconds = args.pause_seconds
+    if getattr(args, "trim_silence", False):
+        tts.trim_silence = True
+    return tts
+
+
+def run_podcast(args) -> int:
+    """Run the whole podcast pipeline in this process"""
+    if not args.topic and not args.file:
+        say("❌ Error: Either --topic or --file must be specified")
+        emit_result("failure", command="podcast", error="no topic or input file")
+        return 1
+    
+    config = PodcastConfig(
+        topic=args.topic or "",
+        podcast_type=args.type,
+        duration=args.duration,
+        speakers=args.speakers,
+        voices=(args.voice_1, args.voice_2),
+        source_content=read_source(args.file) if args.file else "",
+        variables=tuple(prompt_library.parse_assignments(args.set).items()),
+        custom_prompt=args.ai_prompt,
+        ai=args.ai,
+        ai_model=args.ai_model,
+        tts=args.tts,
+        style=args.style,
+        tone=args.tone,
+        temperature=args.temperature,
+        output_name=args.output,
+        output_dir=args.output_dir,
+        audio_format=args.format,
+        script_only=args.script_only,
+        stream=args.stream,
+        tts_workers=args.tts_workers,
+    )
+    pipeline = PodcastPipeline(config, tts_factory=lambda: make_tts(args))
+    
+    say("━━━ Configuration ━━━")
+    say(f"Podcast Type:    {config.podcast_type}")
+    say(f"Topic:           {config.topic or 'from file'}")
+    say(f"Duration:        {config.duration} minutes")
+    say(f"Speakers:        {config.speakers}")
+    say(f"AI Provider:     {config.ai}")
+    say(f"TTS Provider:    {config.tts}")
+    say(f"Voice 1:         {config.voices[0]}")
+    if config.speakers == 2:
+        say(f"Voice 2:         {config.voices[1]}")
+    say(f"Script Output:   {pipeline.script_file}")
+    if not config.script_only:
+        say(f"Audio Output:    {pipeline.audio_file}")
+    if config.stream and not config.script_only:
+        say(f"Streaming:       {config.tts_workers} TTS workers")
+    say()
+    
+    if args.dry_run:
+        say("ℹ️ Dry run mode - no podcast will be generated")
+        return 0
+    
+    with pipeline:
+        result = pipeline.run()
+    
+    if args.verbose:
+        say("━━━ Script Preview ━━━")
+        say("\n".join(result.script.splitlines()[:20]))
+        say("...")
+    
+    say("━━━ Summary ━━━")
+    say(f"📝 Script: {result.script_file}")
+    if result.audio_file:
+        size_mb = os.path.getsize(result.audio_file) / (1024 * 1024)
+        say(f"🎵 Audio:  {result.audio_file} ({size_mb:.1f} MB)")
+    say("⏱️ Stages: " + ", ".join(f"{name} {seconds:.2f}s"
+                                 for name, seconds in result.stage_seconds.items()))
+    emit_result("success", command="podcast", script=result.script_file, output=result.audio_file,
+                stage_seconds={name: round(seconds, 3) for name, seconds in result.stage_seconds.items()})
+    return 0
+
+
+def run_command(args) -> int:
+    """Run a subcommand that needs a GeminiTTS client"""
+    with make_tts(args) as tts:
+        return run_tts_command(args, tts)
+
+
+def run_tts_command(args, tts: GeminiTTS) -> int:
+    """Run a subcommand with a client the caller closes"""
+    if args.command == "voices" and args.refresh:
+        with GeminiAPI(api_key=tts.api_key) as api:
+            discovery = model_discovery.refresh(api)
+        if not discovery.healthy:
+            say(f"❌ Discovery failed: {discovery.error}")
+            emit_result("failure", command="voices", error=discovery.error)
+            return 1
+        GeminiTTS.use_voices(discovery.voices)
+        say(f"🔄 Found {len(discovery.tts_models)} TTS models: {', '.join(discovery.tts_models)}")
+    elif tts.backend != "replay":
+        # Keeps the discovery cache warm without delaying this command
+        model_discovery.current(tts.api_key, block=False)
+    
+    if args.command == "voices":
+        say("🎤 Available voices:")
+        for voice in GeminiTTS.AVAILABLE_VOICES:
+            say(f"  • {voice}")
+        return 0
+    
+    if args.command == "single":
+        say(f"🎤 Generating single speaker audio with voice '{args.voice}'...")
+        output_file = tts.generate_speech(
+            text=args.text,
+            voice_name=args.voice,
+            temperature=args.temperature,
+            output_file=args.output
+        )
+        say(f"✅ Audio saved to: {output_file}")
+        emit_result("success", command="single", output=output_file)
+    
+    elif args.command == "multi":
+        say(f"🎙️ Generating multi-speaker podcast...")
+        
+        # Parse speaker configurations
+        speaker_configs = []
+        for speaker_config in args.speakers:
+            if ":" not in speaker_config:
+                say(f"❌ Error: Invalid speaker config '{speaker_config}'. Use format: SpeakerName:VoiceName")
+                emit_result("failure", command="multi", error=f"invalid speaker config: {speaker_config}")
+                return 1
+            
+            speaker, voice = speaker_config.split(":", 1)
+            speaker_configs.append({
+                "speaker": speaker.strip(),
+                "voice": voice.strip()
+            })
+        
+        output_file = tts.generate_podcast_interview(
+            script=args.script,
+            speaker_configs=speaker_configs,
+            temperature=args.temperature,
+            output_file=args.output
+        )
+        say(f"✅ Podcast saved to: {output_file}")
+        emit_result("success", command="multi", output=output_file)
+    
+    elif args.command == "batch":
+        with open(args.file, 'r', encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+        
+        say(f"🎤 Generating {len(texts)} clips with voice '{args.voice}'...")
+        output_files = tts.generate_speech_batch(
+            texts,
+            voice_name=args.voice,
+            temperature=args.temperature,
+            output_dir=args.output_dir,
+            pack=not args.no_pack,
+            max_pack_items=args.pack_size
+        )
+        say(f"✅ {len(output_files)} clips saved to: {args.output_dir}")
+        emit_result("success", command="batch", output_dir=args.output_dir, outputs=output_files)
+    
+    elif args.command == "script":
+        say(f"📝 Generating {args.style} style script about '{args.topic}'...")
+        script = tts.generate_podcast_script(
+            topic=args.topic,
+            style=args.style,
+            duration=args.duration
+        )
+        say("\n🎙️ Generated Script:")
+        say("=" * 50)
+        say(script)
+        say("=" * 50)
+        emit_result("success", command="script", chars=len(script))
+        
+        # Optionally save the script (never prompt in quiet mode)
+        if is_quiet():
+            return 0
+        save_file = input("\nSave script to file? (y/N): ").lower().strip()
+        if save_file == 'y':
+            filename = input("Enter filename (without .txt): ").strip()
+            if not filename.endswith('.txt'):
+                filename += '.txt'
+            
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(script)
+            say(f"✅ Script saved to: {filename}")
+    
+    return 0
 
 
 def main():
+    # Voice choices below include any voices found by model discovery
+    GeminiTTS.load_discovered_voices()
+    
     parser = argparse.ArgumentParser(description="Generate podcasts using Gemini TTS")
+    parser.add_argument("--backend", choices=["sdk", "rest", "replay"],
+                        help="API backend: google-genai SDK, pooled REST client or cassette "
+                             "replay (default: $GEMINI_TTS_BACKEND or sdk)")
+    parser.add_argument("--record", metavar="CASSETTE",
+                        help="Append every TTS stream to a cassette file for later replay")
+    parser.add_argument("--cassette", help="Cassette file played by the replay backend")
+    parser.add_argument("--replay-time-scale", type=float,
+                        help="Multiply recorded delays on replay, 0 = no waiting (default: 1.0)")
+    parser.add_argument("--spill-mb", type=float,
+                        help="Buffer episode audio past this many MiB in a temp file, 0 = never "
+                             "(default: $GEMINI_TTS_SPILL_MB or 256)")
+    parser.add_argument("--profile", choices=["cpu", "mem"],
+                        help="Run the command under cProfile (cpu) or tracemalloc (mem) and "
+                             "print the top hotspots or peak allocation sites")
+    parser.add_argument("--profile-output", metavar="FILE",
+                        help="Stats file to write (default: .tmp/profiles/<command>_<time>.prof|.tracemalloc)")
+    parser.add_argument("--profile-top", type=int, default=20,
+                        help="Entries to print from the profile (default: 20)")
+    parser.add_argument("--log-level", choices=list(LOG_LEVELS),
+                        help="Library log level (default: $GEMINI_TTS_LOG_LEVEL or info)")
+    parser.add_argument("--log-format", choices=list(LOG_FORMATS),
+                        help="Library log format on stderr (default: $GEMINI_TTS_LOG_FORMAT or text)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="No output at all; check the exit status or --result-file")
+    parser.add_argument("--result-file", metavar="FILE",
+                        help="Append a JSON result record per command (default: $GEMINI_TTS_RESULT_FILE)")
+    parser.add_argument("--job-id", default=os.getenv("GEMINI_TTS_JOB_ID"),
+                        help="Job id added to log and result records (default: $GEMINI_TTS_JOB_ID)")
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
     # Single speaker command
@@ -27,6 +365,12 @@ def main():
     single_parser.add_argument("-o", "--output", help="Output file name (without extension)")
     single_parser.add_argument("-t", "--temperature", type=float, default=0.8,
                               help="Temperature for generation (default: 0.8)")
+    single_parser.add_argument("--local-pauses", action="store_true",
+                              help="Render [pause] markers and ellipses as local silence")
+    single_parser.add_argument("--pause-seconds", type=float,
+                              help="Duration of a plain [pause] marker in seconds (default: 0.75)")
+    single_parser.add_argument("--trim-silence", action="store_true",
+                              help="Trim leading and trailing silence from the clip")
     
     # Multi-speaker command
     multi_parser = subparsers.add_parser("multi", help="Generate multi-speaker audio")
@@ -36,6 +380,29 @@ def main():
     multi_parser.add_argument("-o", "--output", help="Output file name (without extension)")
     multi_parser.add_argument("-t", "--temperature", type=float, default=1.0,
                              help="Temperature for generation (default: 1.0)")
+    multi_parser.add_argument("--local-pauses", action="store_true",
+                             help="Render [pause] markers and ellipses as local silence")
+    multi_parser.add_argument("--pause-seconds", type=float,
+                             help="Duration of a plain [pause] marker in seconds (default: 0.75)")
+    multi_parser.add_argument("--trim-silence", action="store_true",
+                             help="Trim leading and trailing silence from the audio")
+    
+    # Batch command for many short texts
+    batch_parser = subparsers.add_parser("batch", help="Generate one clip per line of a text file")
+    batch_parser.add_argument("file", help="Text file with one utterance per line")
+    batch_parser.add_argument("-v", "--voice", default="Zephyr",
+                             choices=GeminiTTS.AVAILABLE_VOICES,
+                             help="Voice to use (default: Zephyr)")
+    batch_parser.add_argument("-o", "--output-dir", default="outputs/batch",
+                             help="Directory for generated clips (default: outputs/batch)")
+    batch_parser.add_argument("-t", "--temperature", type=float, default=0.8,
+                             help="Temperature for generation (default: 0.8)")
+    batch_parser.add_argument("--no-pack", action="store_true",
+                             help="Send one request per line instead of packing")
+    batch_parser.add_argument("--pack-size", type=int, default=20,
+                             help="Maximum utterances per packed request (default: 20)")
+    batch_parser.add_argument("--trim-silence", action="store_true",
+                             help="Trim leading and trailing silence from each clip")
     
     # Script generation command
     script_parser = subparsers.add_parser("script", help="Generate podcast script")
@@ -46,8 +413,125 @@ def main():
     script_parser.add_argument("-d", "--duration", default="5 minutes",
                               help="Approximate duration (default: 5 minutes)")
     
+    # Whole podcast pipeline (podcast-generator.sh is a wrapper around this)
+    podcast_parser = subparsers.add_parser("podcast", help="Generate a podcast from a topic or file: "
+                                                           "prompt, script, speech and encoding in one process")
+    podcast_parser.add_argument("-t", "--topic", help="Podcast topic (required unless using -f)")
+    podcast_parser.add_argument("-f", "--file", help="Input file to convert to podcast (txt, md, pdf, docx)")
+    podcast_parser.add_argument("--type", default="interview", choices=PODCAST_TYPES,
+                                help="Podcast type (default: interview)")
+    podcast_parser.add_argument("-d", "--duration", type=int, default=15,
+                                help="Duration in minutes (default: 15)")
+    podcast_parser.add_argument("-s", "--speakers", type=int, default=2, choices=[1, 2],
+                                help="Number of speakers (default: 2)")
+    podcast_parser.add_argument("--ai", default="claude", choices=SCRIPT_PROVIDERS,
+                                help="Script generator: the claude, gemini or qodercli CLI, or the "
+                                     "Gemini text API in-process with 'api' (default: claude)")
+    podcast_parser.add_argument("--ai-model", help="Specific AI model to use")
+    podcast_parser.add_argument("--ai-prompt", help="Custom prompt (overrides template)")
+    podcast_parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                                help="Template variable, e.g. tone=casual or host_personality="
+                                     "skeptical_questioner; repeatable (see: prompt show TYPE)")
+    podcast_parser.add_argument("--tts", default="gemini", choices=TTS_PROVIDERS,
+                                help="TTS provider; minimax is only accepted with --script-only "
+                                     "(default: gemini)")
+    podcast_parser.add_argument("--voice-1", default="Zephyr", choices=GeminiTTS.AVAILABLE_VOICES,
+                                help="Voice for speaker 1 (default: Zephyr)")
+    podcast_parser.add_argument("--voice-2", default="Puck", choices=GeminiTTS.AVAILABLE_VOICES,
+                                help="Voice for speaker 2 (default: Puck)")
+    podcast_parser.add_argument("--style", default="", help="TTS style description")
+    podcast_parser.add_argument("--tone", default="professional yet conversational",
+                                help="TTS tone (default: professional yet conversational)")
+    podcast_parser.add_argument("--temperature", type=float, default=1.0,
+                                help="Temperature for speech generation (default: 1.0)")
+    podcast_parser.add_argument("-o", "--output", help="Output file base name (default: <type>_<time>)")
+    podcast_parser.add_argument("--output-dir", default=str(Path(__file__).parent.parent / "outputs"),
+                                help="Output directory (default: ./outputs)")
+    podcast_parser.add_argument("--format", default="wav", choices=AUDIO_FORMATS,
+                                help="Audio format; mp3 is encoded by ffmpeg from memory (default: wav)")
+    podcast_parser.add_argument("--script-only", "--skip-audio", action="store_true",
+                                help="Generate script only, skip audio")
+    podcast_parser.add_argument("--stream", action="store_true",
+                                help="Synthesize each turn while the rest of the script is still "
+                                     "being written, one request per turn")
+    podcast_parser.add_argument("--tts-workers", type=int, default=DEFAULT_TTS_WORKERS,
+                                help=f"Concurrent turn requests with --stream (default: {DEFAULT_TTS_WORKERS})")
+    podcast_parser.add_argument("-v", "--verbose", action="store_true",
+                                help="Show a preview of the generated script")
+    podcast_parser.add_argument("--dry-run", action="store_true",
+                                help="Show configuration without generating")
+    
+    # Prompt templates
+    prompt_parser = subparsers.add_parser("prompt", help="List, inspect and render prompt templates")
+    prompt_library.configure_parser(prompt_parser)
+    
+    # WAV concatenation command
+    concat_parser = subparsers.add_parser("concat", help="Join same-format WAV files")
+    concat_parser.add_argument("output", help="Output WAV file")
+    concat_parser.add_argument("segments", nargs="+", help="WAV segments to join, in order")
+    
+    # Benchmarks
+    bench_parser = subparsers.add_parser("bench", help="Run performance benchmarks")
+    bench_subparsers = bench_parser.add_subparsers(dest="bench_command", help="Benchmark to run")
+    load_parser = bench_subparsers.add_parser("load", help="Concurrent synthetic TTS jobs against the local stand-in")
+    load_parser.add_argument("-n", "--jobs", type=int, default=50,
+                             help="Number of synthetic jobs (default: 50)")
+    load_parser.add_argument("-c", "--concurrency", type=int, default=8,
+                             help="Jobs in flight at once (default: 8)")
+    load_parser.add_argument("--distribution", default="lognormal",
+                             choices=["fixed", "uniform", "lognormal"],
+                             help="Text length distribution (default: lognormal)")
+    load_parser.add_argument("--mean-chars", type=int, default=200,
+                             help="Mean text length in characters (default: 200)")
+    load_parser.add_argument("-v", "--voice", default="Zephyr", choices=GeminiTTS.AVAILABLE_VOICES,
+                             help="Voice to use (default: Zephyr)")
+    load_parser.add_argument("--seed", type=int, default=0, help="Seed for texts and fault injection")
+    load_parser.add_argument("--url", help="Use an already running endpoint instead of starting a stand-in")
+    load_parser.add_argument("--ttfc", type=float, default=0.3,
+                             help="Stand-in time to first chunk in seconds (default: 0.3)")
+    load_parser.add_argument("--bytes-per-second", type=float, default=192000.0,
+                             help="Stand-in streaming rate per request (default: 192000)")
+    load_parser.add_argument("--error-rate", type=float, default=0.0,
+                             help="Fraction of stand-in requests failing with 500")
+    load_parser.add_argument("--rate-limit-rate", type=float, default=0.0,
+                             help="Fraction of stand-in requests failing with 429")
+    load_parser.add_argument("--json", metavar="FILE", help="Write the full report as JSON")
+    micro_parser = bench_subparsers.add_parser("micro", help="Micro-benchmarks of the audio hot paths")
+    micro_parser.add_argument("cases", nargs="*", help="Cases to run (default: all)")
+    micro_parser.add_argument("-e", "--episode", action="append", choices=["1min", "15min", "60min"],
+                              help="Episode sizes to run, repeatable (default: all)")
+    micro_parser.add_argument("-r", "--repeat", type=int, default=5,
+                              help="Timing repeats per case (default: 5)")
+    micro_parser.add_argument("--json", metavar="FILE", help="Write the results as JSON")
+    mem_parser = bench_subparsers.add_parser("mem", help="Peak memory while rendering long episodes")
+    mem_parser.add_argument("-e", "--episode", action="append", choices=["15min", "60min", "180min"],
+                            help="Episode lengths to run, repeatable (default: all)")
+    mem_parser.add_argument("--spill-mb", type=float, default=argparse.SUPPRESS,
+                            help="Spill threshold in MiB for the episodes (default: never spill)")
+    mem_parser.add_argument("--no-tracemalloc", action="store_true",
+                            help="Measure peak RSS only; tracemalloc slows long episodes down")
+    mem_parser.add_argument("--json", metavar="FILE", help="Write the results as JSON")
+    gate_parser = bench_subparsers.add_parser("gate", help="Compare benchmark results with the committed baseline")
+    gate_parser.add_argument("--baseline", help="Baseline JSON (default: tests/benchmarks/baseline.json)")
+    gate_parser.add_argument("--update-baseline", action="store_true",
+                             help="Record the current results as the new baseline")
+    gate_parser.add_argument("--json", metavar="FILE", help="Write the measured metrics as JSON")
+    
+    # Pipeline traces
+    trace_parser = subparsers.add_parser("trace", help="Inspect pipeline traces")
+    trace_subparsers = trace_parser.add_subparsers(dest="trace_command", help="Trace command")
+    show_parser = trace_subparsers.add_parser("show", help="Waterfall of one trace")
+    show_parser.add_argument("trace_id", nargs="?", help="Trace id or unique prefix (default: latest)")
+    show_parser.add_argument("--file", help="Trace file (default: $PODCAST_TRACE_FILE or .tmp/traces.jsonl)")
+    list_parser = trace_subparsers.add_parser("list", help="Recent traces")
+    list_parser.add_argument("-n", "--limit", type=int, default=10,
+                             help="Number of traces to list (default: 10)")
+    list_parser.add_argument("--file", help="Trace file (default: $PODCAST_TRACE_FILE or .tmp/traces.jsonl)")
+    
     # List voices command
     voices_parser = subparsers.add_parser("voices", help="List available voices")
+    voices_parser.add_argument("--refresh", action="store_true",
+                               help="Query the API for TTS models now instead of using the discovery cache")
     
     args = parser.parse_args()
     
@@ -55,76 +539,49 @@ def main():
         parser.print_help()
         return 1
     
+    configure_logging(level="quiet" if args.quiet else args.log_level, fmt=args.log_format)
+    if args.result_file:
+        os.environ[RESULT_FILE_ENV] = args.result_file
+    
+    if args.profile:
+        from profiling import run_profiled
+        return run_profiled(args.profile, lambda: dispatch(args, bench_parser, trace_parser),
+                            output=args.profile_output, top=args.profile_top, label=args.command)
+    return dispatch(args, bench_parser, trace_parser)
+
+
+def dispatch(args, bench_parser, trace_parser) -> int:
+    """Run the parsed subcommand"""
+    job = {"job": args.job_id} if args.job_id else {}
+    with log_context(command=args.command, **job):
+        return _dispatch(args, bench_parser, trace_parser)
+
+
+def _dispatch(args, bench_parser, trace_parser) -> int:
     try:
-        tts = GeminiTTS()
-        
-        if args.command == "voices":
-            print("🎤 Available voices:")
-            for voice in GeminiTTS.AVAILABLE_VOICES:
-                print(f"  • {voice}")
+        if args.command == "concat":
+            info = concat_wav(args.segments, args.output)
+            say(f"✅ Joined {len(args.segments)} segments ({info.duration:.1f}s) into: {args.output}")
+            emit_result("success", command="concat", output=args.output, duration=info.duration)
             return 0
         
-        if args.command == "single":
-            print(f"🎤 Generating single speaker audio with voice '{args.voice}'...")
-            output_file = tts.generate_speech(
-                text=args.text,
-                voice_name=args.voice,
-                temperature=args.temperature,
-                output_file=args.output
-            )
-            print(f"✅ Audio saved to: {output_file}")
+        if args.command == "bench":
+            return run_bench(args, bench_parser)
         
-        elif args.command == "multi":
-            print(f"🎙️ Generating multi-speaker podcast...")
-            
-            # Parse speaker configurations
-            speaker_configs = []
-            for speaker_config in args.speakers:
-                if ":" not in speaker_config:
-                    print(f"❌ Error: Invalid speaker config '{speaker_config}'. Use format: SpeakerName:VoiceName")
-                    return 1
-                
-                speaker, voice = speaker_config.split(":", 1)
-                speaker_configs.append({
-                    "speaker": speaker.strip(),
-                    "voice": voice.strip()
-                })
-            
-            output_file = tts.generate_podcast_interview(
-                script=args.script,
-                speaker_configs=speaker_configs,
-                temperature=args.temperature,
-                output_file=args.output
-            )
-            print(f"✅ Podcast saved to: {output_file}")
+        if args.command == "trace":
+            return run_trace(args, trace_parser)
         
-        elif args.command == "script":
-            print(f"📝 Generating {args.style} style script about '{args.topic}'...")
-            script = tts.generate_podcast_script(
-                topic=args.topic,
-                style=args.style,
-                duration=args.duration
-            )
-            print("\n🎙️ Generated Script:")
-            print("=" * 50)
-            print(script)
-            print("=" * 50)
-            
-            # Optionally save the script
-            save_file = input("\nSave script to file? (y/N): ").lower().strip()
-            if save_file == 'y':
-                filename = input("Enter filename (without .txt): ").strip()
-                if not filename.endswith('.txt'):
-                    filename += '.txt'
-                
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(script)
-                print(f"✅ Script saved to: {filename}")
+        if args.command == "prompt":
+            return prompt_library.run(args)
         
-        return 0
+        with tracing.span(f"podcast_cli.{args.command}"):
+            if args.command == "podcast":
+                return run_podcast(args)
+            return run_command(args)
         
     except Exception as e:
-        print(f"❌ Error: {e}")
+        say(f"❌ Error: {e}")
+        emit_result("failure", command=args.command, error=str(e))
         return 1
 
 
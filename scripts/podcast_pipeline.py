@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+In-process podcast pipeline
+Template loading, script generation, speech synthesis and encoding run as
+stages of one process and hand the prompt, script and audio to each other
+in memory, instead of podcast-generator.sh spawning yq, an AI CLI,
+tts-manager.sh, a second Python and ffmpeg with files in between.
+podcast-generator.sh is now a thin wrapper around `podcast_cli.py podcast`.
+
+Scripts come from the Gemini text API in-process ("api") or, for the
+claude, gemini and qodercli CLIs, from one subprocess that reads the
+prompt on stdin and writes the script to stdout.
+
+In streaming mode (PodcastConfig.stream) the script is read as it is
+written: each "Speaker:" turn goes to a pool of TTS workers as soon as the
+next label closes it, so most of the audio is done when the script is.
+Turns are then synthesized one request each in their speaker's voice,
+rather than as one multi-speaker request.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import prompt_library
+import tracing
+from audio_buffer import parse_audio_mime_type
+from audio_spool import AudioSpool
+from gemini_tts import GeminiTTS
+from tts_logging import get_logger
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT_DIR = PROJECT_ROOT / "outputs"
+DEFAULT_SCRIPT_DIR = PROJECT_ROOT / ".tmp" / "podcast_generation"
+
+PODCAST_TYPES = ("interview", "educational", "news", "storytelling", "debate", "casual")
+AUDIO_FORMATS = ("wav", "mp3")
+
+# Accepted for compatibility with podcast-generator.sh; only Gemini synthesizes
+TTS_PROVIDERS = ("gemini", "minimax")
+
+# "api" generates the script in-process; the others are external CLIs
+SCRIPT_PROVIDERS = ("api", "claude", "gemini", "qodercli", "auto")
+CLI_COMMANDS = {
+    "claude": ["claude", "-p"],
+    "gemini": ["gemini"],
+    "qodercli": ["qodercli", "generate"],
+}
+
+# Concurrent turn requests in streaming mode
+DEFAULT_TTS_WORKERS = 4
+
+# Text extractors for input files other than plain text
+SOURCE_EXTRACTORS = {
+    ".pdf": ["pdftotext", "{path}", "-"],
+    ".docx": ["docx2txt", "{path}", "-"],
+}
+
+# "Host: ...", "**Guest:** ...", "Position A: ..."
+SPEAKER_LINE = re.compile(r"^\s*[*_]*(?P<speaker>[^\W\d_][\w .'-]{0,39}?)[*_]*\s*:[*_]*\s+(?P<text>\S.*)$")
+
+logger = get_logger("pipeline")
+
+
+class PodcastConfig(NamedTuple):
+    """Everything one podcast run needs, mirroring podcast-generator.sh options"""
+    topic: str = ""
+    podcast_type: str = "interview"
+    duration: int = 15
+    speakers: int = 2
+    voices: Tuple[str, ...] = ("Zephyr", "Puck")
+    source_content: str = ""
+    # Extra template variables as (name, value) pairs, e.g. (("tone", "casual"),)
+    variables: Tuple[Tuple[str, str], ...] = ()
+    custom_prompt: Optional[str] = None
+    ai: str = "api"
+    ai_model: Optional[str] = None
+    tts: str = "gemini"
+    style: str = ""
+    tone: str = "professional yet conversational"
+    temperature: float = 1.0
+    output_name: Optional[str] = None
+    output_dir: str = str(DEFAULT_OUTPUT_DIR)
+    audio_format: str = "wav"
+    script_only: bool = False
+    # Synthesize turns while the script is still being generated
+    stream: bool = False
+    tts_workers: int = DEFAULT_TTS_WORKERS
+
+
+class Turn(NamedTuple):
+    """One speaker's uninterrupted stretch of dialogue"""
+    speaker: str
+    text: str
+
+
+class PodcastResult(NamedTuple):
+    """Outputs of a pipeline run and the wall time of each stage"""
+    script: str
+    script_file: str
+    audio_file: Optional[str]
+    stage_seconds: Dict[str, float]
+
+
+class TurnSplitter:
+    """Incremental parse_turns for a script that arrives in pieces
+
+    feed() returns the turns closed by the text so far. A turn is closed by
+    the next speaker label, so it never changes after being returned;
+    close() returns the last one.
+
+    A label is a speaker if it is one of names (the template's speakers)
+    or, for scripts that do not use those, one of the first max_speakers
+    labels seen. Any other "Label: text" line, such as "Note: ..." or
+    "Segment 1: ...", is read as part of the current turn.
+    """
+
+    def __init__(self, names: Sequence[str] = (), max_speakers: int = 2):
+        self._partial = ""
+        self._turn: Optional[Turn] = None
+        self._names = set(names)
+        self._max_speakers = max_speakers
+        self._speakers: Set[str] = set()
+
+    def feed(self, text: str) -> List[Turn]:
+        lines = (self._partial + text).splitlines(keepends=True)
+        # Hold back a line that has not ended yet
+        self._partial = lines.pop() if lines and lines[-1].splitlines()[0] == lines[-1] else ""
+        closed: List[Turn] = []
+        for line in lines:
+            self._line(line, closed)
+        return closed
+
+    def close(self) -> List[Turn]:
+        closed: List[Turn] = []
+        self._line(self._partial, closed)
+        self._partial = ""
+        if self._turn is not None:
+            closed.append(self._turn)
+            self._turn = None
+        return closed
+
+    def _is_speaker(self, label: str) -> bool:
+        if label in self._names or label in self._speakers:
+            self._speakers.add(label)
+            return True
+        if not self._names & self._speakers and len(self._speakers) < self._max_speakers:
+            self._speakers.add(label)
+            return True
+        return False
+
+    def _line(self, line: str, closed: List[Turn]) -> None:
+        match = SPEAKER_LINE.match(line)
+        if match and self._is_speaker(match.group("speaker").strip()):
+            if self._turn is not None:
+                closed.append(self._turn)
+            self._turn = Turn(match.group("speaker").strip(), match.group("text").strip())
+        elif self._turn is not None and line.strip() and not line.lstrip().startswith("#"):
+            self._turn = Turn(self._turn.speaker, f"{self._turn.text} {line.strip()}")
+
+
+def parse_turns(script: str, names: Sequence[str] = (), max_speakers: int = 2) -> List[Turn]:
+    """Speaker turns of a "Speaker: text" script
+
+    Unlabelled lines, and labels that are not speakers (see TurnSplitter),
+    continue the current turn; anything before the first label (titles,
+    notes) is dropped.
+    """
+    splitter = TurnSplitter(names, max_speakers)
+    return splitter.feed(script) + splitter.close()
+
+
+def read_source(path: str) -> str:
+    """Text of an input file; PDF and DOCX go through pdftotext or docx2txt"""
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Input file not found: {path}")
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".txt", ".md"):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    if extension not in SOURCE_EXTRACTORS:
+        raise ValueError(f"Unsupported file type: {extension or path}")
+
+    command = [part.format(path=path) for part in SOURCE_EXTRACTORS[extension]]
+    if shutil.which(command[0]) is None:
+        raise RuntimeError(f"{command[0]} not found; it is needed to read {extension} files")
+    return subprocess.run(command, check=True, capture_output=True, text=True).stdout
+
+
+def tts_direction(style: str, tone: str) -> str:
+    """Style line read by the TTS model before the dialogue"""
+    manner = []
+    if tone:
+        manner.append(f"in a {tone} tone")
+    if style:
+        manner.append(f"as a {style}")
+    return " ".join(["Read aloud the following podcast", ", ".join(manner)]).rstrip() + ":"
+
+
+class PodcastPipeline:
+    """Prompt → script → speech → encoded file, in one process
+
+    tts_factory builds the GeminiTTS client the first time a stage needs
+    it, so script-only runs through an AI CLI never need an API key.
+    """
+
+    def __init__(self,
+                 config: PodcastConfig,
+                 tts_factory: Optional[Callable[[], GeminiTTS]] = None,
+                 prompts_file: Optional[str] = None,
+                 script_dir: Optional[str] = None):
+        if config.podcast_type not in PODCAST_TYPES:
+            raise ValueError(f"Unknown podcast type '{config.podcast_type}'. Choose from: {list(PODCAST_TYPES)}")
+        if config.speakers not in (1, 2):
+            raise ValueError("Podcasts have 1 or 2 speakers")
+        if config.tts not in TTS_PROVIDERS:
+            raise ValueError(f"Unknown TTS provider '{config.tts}'. Choose from: {list(TTS_PROVIDERS)}")
+        if config.tts != "gemini" and not config.script_only:
+            raise ValueError(f"{config.tts} TTS is not available in this pipeline; "
+                             "use --tts gemini, or --script-only to stop after the script")
+        if config.audio_format not in AUDIO_FORMATS:
+            raise ValueError(f"Unknown audio format '{config.audio_format}'. Choose from: {list(AUDIO_FORMATS)}")
+        if not (config.topic or config.source_content or config.custom_prompt):
+            raise ValueError("A topic, source content or custom prompt is required")
+        if config.tts_workers < 1:
+            raise ValueError("At least one TTS worker is required")
+
+        self.config = config
+        self.prompts_file = prompts_file
+        self.script_dir = script_dir or str(DEFAULT_SCRIPT_DIR)
+        self.output_name = config.output_name or f"{config.podcast_type}_{time.strftime('%Y%m%d_%H%M%S')}"
+        self._tts_factory = tts_factory
+        self._tts = None
+        self.stage_seconds: Dict[str, float] = {}
+
+    @property
+    def speaker_names(self) -> Tuple[str, ...]:
+        """Speaker labels the podcast type's template asks for; none for custom prompts"""
+        if self.config.custom_prompt:
+            return ()
+        return prompt_library.load(self.prompts_file).get(self.config.podcast_type).speaker_names
+
+    @property
+    def tts(self) -> GeminiTTS:
+        if self._tts is None:
+            self._tts = (self._tts_factory or GeminiTTS)()
+        return self._tts
+
+    def close(self) -> None:
+        """Close the GeminiTTS client, if a stage created one"""
+        if self._tts is not None:
+            self._tts.close()
+            self._tts = None
+
+    def __enter__(self) -> "PodcastPipeline":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def script_file(self) -> str:
+        return os.path.join(self.script_dir, f"{self.output_name}_script.txt")
+
+    @property
+    def audio_file(self) -> str:
+        return os.path.join(self.config.output_dir, f"{self.output_name}.{self.config.audio_format}")
+
+    @contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        """Time one stage and record it as a trace span"""
+        start = time.perf_counter()
+        try:
+            with tracing.span(f"podcast_pipeline.{name}"):
+                yield
+        finally:
+            self.stage_seconds[name] = time.perf_counter() - start
+
+    def script_provider(self) -> str:
+        """The configured provider, resolving "auto" to the API or an installed CLI"""
+        if self.config.ai != "auto":
+            return self.config.ai
+        if os.getenv("GEMINI_API_KEY"):
+            return "api"
+        for name, command in CLI_COMMANDS.items():
+            if shutil.which(command[0]):
+                return name
+        raise RuntimeError("No script generator found: set GEMINI_API_KEY or install "
+                           f"one of: {', '.join(CLI_COMMANDS)}")
+
+    # -- stages ------------------------------------------------------------
+
+    def build_prompt(self) -> str:
+        """Template (or custom prompt) with the source content filled in or appended"""
+        config = self.config
+        source_content = config.source_content
+        if config.custom_prompt:
+            prompt = config.custom_prompt
+        else:
+            library = prompt_library.load(self.prompts_file)
+            values = {"topic": config.topic or "the provided content",
+                      "duration": config.duration, **dict(config.variables)}
+            if source_content and "source_content" in library.get(config.podcast_type).fields:
+                values["source_content"] = source_content
+                source_content = ""
+            prompt = library.render(config.podcast_type, values)
+        if source_content:
+            prompt = f"{prompt}\n\nSOURCE CONTENT TO CONVERT:\n{source_content}"
+        return prompt
+
+    def cli_command(self, provider: str) -> List[str]:
+        """Command line of an AI CLI provider"""
+        if provider not in CLI_COMMANDS:
+            raise ValueError(f"Unknown AI provider '{provider}'. Choose from: {list(SCRIPT_PROVIDERS)}")
+        command = list(CLI_COMMANDS[provider])
+        if self.config.ai_model:
+            command += ["--model", self.config.ai_model]
+        if shutil.which(command[0]) is None:
+            raise RuntimeError(f"{command[0]} CLI not found")
+        return command
+
+    def generate_script(self, prompt: str) -> str:
+        """Script text from the Gemini text API or an AI CLI"""
+        provider = self.script_provider()
+        if provider == "api":
+            script = self.tts.generate_text(prompt, model=self.config.ai_model)
+        else:
+            script = subprocess.run(self.cli_command(provider), input=prompt, check=True,
+                                    capture_output=True, text=True).stdout
+
+        if not script.strip():
+            raise RuntimeError(f"{provider} returned an empty script")
+        return script
+
+    def stream_script(self, prompt: str) -> Iterator[str]:
+        """Script text piece by piece, as the text API or the CLI's stdout produces it"""
+        provider = self.script_provider()
+        if provider == "api":
+            yield from self.tts.stream_text(prompt, model=self.config.ai_model)
+            return
+
+        command = self.cli_command(provider)
+        # stderr goes straight to the terminal so it can never fill up and stall the CLI
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   text=True, encoding="utf-8")
+        # Writing from a thread keeps a long prompt from blocking while the CLI
+        # is already producing output
+        writer = threading.Thread(target=_write_and_close, args=(process.stdin, prompt), daemon=True)
+        writer.start()
+        try:
+            yield from process.stdout
+            process.wait()
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            writer.join()
+            process.stdout.close()
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, command)
+
+    def tts_script(self, script: str) -> Tuple[str, List[Dict[str, str]]]:
+        """Text to synthesize and the speaker configs for it
+
+        Two-speaker runs give the first two speakers in the script
+        voices[0] and voices[1]. Single-speaker runs, and scripts with only
+        one speaker, are read without labels in voices[0].
+        """
+        config = self.config
+        turns = parse_turns(script, self.speaker_names, config.speakers)
+        if not turns:
+            raise ValueError("The script has no 'Speaker: text' lines to synthesize")
+
+        direction = tts_direction(config.style, config.tone)
+        speakers = list(dict.fromkeys(turn.speaker for turn in turns))
+        if config.speakers == 1 or len(speakers) == 1:
+            return f"{direction}\n" + "\n".join(turn.text for turn in turns), []
+
+        voices: Dict[str, str] = {}
+        for speaker in speakers:
+            self.turn_voice(speaker, voices)
+        speaker_configs = [{"speaker": speaker, "voice": voice} for speaker, voice in voices.items()]
+        return (f"{direction}\n" + "\n".join(f"{t.speaker}: {t.text}" for t in turns),
+                speaker_configs)
+
+    def synthesize(self, script: str) -> Tuple[AudioSpool, str]:
+        """Audio for the script as a spool the caller must close"""
+        text, speaker_configs = self.tts_script(script)
+        if speaker_configs:
+            return self.tts.synthesize_podcast(text, speaker_configs,
+                                               temperature=self.config.temperature)
+        return self.tts.synthesize_speech(text, self.config.voices[0],
+                                          temperature=self.config.temperature)
+
+    def turn_voice(self, speaker: str, voices: Dict[str, str]) -> str:
+        """Voice for a speaker, assigning voices in order of first appearance
+
+        voices holds the assignments made so far and is updated in place.
+        """
+        if speaker not in voices:
+            if self.config.speakers == 1:
+                voices[speaker] = self.config.voices[0]
+            elif len(voices) == 2:
+                speakers = [*voices, speaker]
+                raise ValueError(f"The script has {len(speakers)} speakers ({', '.join(speakers)}); "
+                                 "two-speaker podcasts support 2")
+            else:
+                voices[speaker] = self.config.voices[len(voices)]
+        return voices[speaker]
+
+    def stream_synthesize(self, prompt: str) -> Tuple[str, AudioSpool, str]:
+        """Script, audio spool and MIME type, synthesizing turns while the script streams in
+
+        Runs the generate_script stage inside the synthesize stage. The
+        caller owns the returned spool and must close it.
+        """
+        config = self.config
+        direction = tts_direction(config.style, config.tone)
+        splitter = TurnSplitter(self.speaker_names, config.speakers)
+        voices: Dict[str, str] = {}
+        pending: Deque[Future] = deque()
+        pieces: List[str] = []
+        spool = AudioSpool(self.tts.spill_threshold, self.tts.spill_dir)
+        mime_type: Optional[str] = None
+        turns = 0
+
+        def submit(turn: Turn) -> None:
+            nonlocal turns
+            voice = self.turn_voice(turn.speaker, voices)
+            pending.append(pool.submit(self.tts.synthesize_speech, f"{direction}\n{turn.text}",
+                                       voice, config.temperature))
+            turns += 1
+
+        def append_next() -> None:
+            nonlocal mime_type
+            turn_spool, turn_mime_type = pending.popleft().result()
+            with turn_spool:
+                if mime_type is None:
+                    mime_type = turn_mime_type
+                elif parse_audio_mime_type(turn_mime_type) != parse_audio_mime_type(mime_type):
+                    raise RuntimeError(f"Turn audio came back as {turn_mime_type}, expected {mime_type}")
+                view = turn_spool.view()
+                try:
+                    spool.write(view)
+                finally:
+                    view.release()
+
+        with ThreadPoolExecutor(max_workers=config.tts_workers, thread_name_prefix="podcast-tts") as pool:
+            try:
+                with self._stage("generate_script"):
+                    for piece in self.stream_script(prompt):
+                        pieces.append(piece)
+                        for turn in splitter.feed(piece):
+                            submit(turn)
+                        # Keep finished turns in the spool rather than in the workers' spools
+                        while pending and pending[0].done():
+                            append_next()
+                    for turn in splitter.close():
+                        submit(turn)
+
+                script = "".join(pieces)
+                if not script.strip():
+                    raise RuntimeError(f"{self.script_provider()} returned an empty script")
+                if not turns:
+                    raise ValueError("The script has no 'Speaker: text' lines to synthesize")
+                logger.info("🎙️ Script finished with %d of %d turns synthesized",
+                            turns - len(pending), turns,
+                            extra={"turns": turns, "turns_pending": len(pending)})
+
+                while pending:
+                    append_next()
+            except BaseException:
+                spool.close()
+                _discard(pending)
+                raise
+        return script, spool, mime_type
+
+    def encode(self, spool: AudioSpool, mime_type: str) -> str:
+        """Write the audio as WAV, or pipe it through ffmpeg for MP3"""
+        os.makedirs(self.config.output_dir, exist_ok=True)
+        if self.config.audio_format == "wav":
+            return self.tts.save_audio_file(self.audio_file, spool, mime_type)
+        return encode_mp3(spool, mime_type, self.audio_file)
+
+    def run(self) -> PodcastResult:
+        """Run every stage, stopping after the script in script-only mode"""
+        self.stage_seconds = {}
+        with tracing.span("podcast_pipeline", podcast_type=self.config.podcast_type):
+            with self._stage("build_prompt"):
+                prompt = self.build_prompt()
+
+            streaming = self.config.stream and not self.config.script_only
+            if streaming:
+                with self._stage("synthesize"):
+                    script, spool, mime_type = self.stream_synthesize(prompt)
+            else:
+                with self._stage("generate_script"):
+                    script = self.generate_script(prompt)
+
+            os.makedirs(self.script_dir, exist_ok=True)
+            with open(self.script_file, "w", encoding="utf-8") as f:
+                f.write(script)
+            logger.info("📝 Script saved to: %s", self.script_file,
+                        extra={"output": self.script_file, "chars": len(script)})
+
+            audio_file = None
+            if not self.config.script_only:
+                if not streaming:
+                    with self._stage("synthesize"):
+                        spool, mime_type = self.synthesize(script)
+                with spool, self._stage("encode"):
+                    audio_file = self.encode(spool, mime_type)
+                logger.info("🎵 Audio saved to: %s", audio_file, extra={"output": audio_file})
+
+        return PodcastResult(script, self.script_file, audio_file, dict(self.stage_seconds))
+
+
+def _write_and_close(stream, text: str) -> None:
+    try:
+        stream.write(text)
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            stream.close()
+        except BrokenPipeError:
+            pass
+
+
+def _discard(pending: Deque[Future]) -> None:
+    """Cancel queued turn requests and close the spools of those already running"""
+    for future in pending:
+        if not future.cancel():
+            future.add_done_callback(_close_result)
+
+
+def _close_result(future: Future) -> None:
+    if future.exception() is None:
+        future.result()[0].close()
+
+
+def encode_mp3(spool: AudioSpool, mime_type: str, output_file: str) -> str:
+    """Encode raw PCM to MP3 by streaming it into ffmpeg's stdin"""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg not found; install it or choose the wav format")
+
+    sample_rate, bits_per_sample = parse_audio_mime_type(mime_type)
+    sample_format = "u8" if bits_per_sample == 8 else f"s{bits_per_sample}le"
+    command = [ffmpeg, "-y", "-loglevel", "error",
+               "-f", sample_format, "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0",
+               "-codec:a", "libmp3lame", "-qscale:a", "2", output_file]
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        spool.copy_to(process.stdin.fileno())
+    except BrokenPipeError:
+        pass
+    finally:
+        process.stdin.close()
+    error = process.stderr.read()
+    process.stderr.close()
+    if process.wait() != 0:
+        raise RuntimeError(f"ffmpeg failed: {error.decode('utf-8', 'replace').strip()}")
+    return output_file
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Built-in profiling for podcast_cli subcommands
+"cpu" runs the command under cProfile and writes a pstats file; "mem"
+runs it under tracemalloc, snapshots the heap whenever it reaches a new
+high and writes the snapshot taken nearest the peak. Both print the top
+entries afterwards, so hotspots can be found on a production box without
+patching the code.
+
+    python3 -m pstats .tmp/profiles/multi_20250101_120000.prof
+    tracemalloc.Snapshot.load(".tmp/profiles/multi_20250101_120000.tracemalloc")
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+
+PROFILE_MODES = ("cpu", "mem")
+PROFILE_DIR = str(Path(__file__).parent.parent / ".tmp" / "profiles")
+PROFILE_SUFFIXES = {"cpu": ".prof", "mem": ".tracemalloc"}
+
+DEFAULT_TOP = 20
+TRACEMALLOC_FRAMES = 10
+# Heap sampling interval and the growth over the last snapshot that
+# triggers a new one; snapshots are costly on large heaps
+PEAK_SAMPLE_SECONDS = 0.05
+PEAK_SNAPSHOT_GROWTH = 1.10
+
+T = TypeVar("T")
+
+
+def default_output(mode: str, label: str) -> str:
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    return os.path.join(PROFILE_DIR, f"{label}_{stamp}{PROFILE_SUFFIXES[mode]}")
+
+
+def format_cpu_stats(profiler: cProfile.Profile, top: int = DEFAULT_TOP) -> str:
+    """Top functions by cumulative and by own time"""
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out).strip_dirs()
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    return out.getvalue()
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MiB"
+
+
+def format_mem_stats(snapshot: tracemalloc.Snapshot, peak: int, top: int = DEFAULT_TOP) -> str:
+    """Peak traced memory and the largest allocation sites at that point"""
+    # Leave out the profiler's own bookkeeping
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                       tracemalloc.Filter(False, __file__)])
+    stats = snapshot.statistics("traceback")
+    lines = [f"Peak traced memory: {_mb(peak)}",
+             f"Top {min(top, len(stats))} allocation sites near the peak:"]
+    for index, stat in enumerate(stats[:top], 1):
+        # Frames run oldest first; the last one made the allocation
+        frames = list(stat.traceback)
+        site = frames[-1]
+        lines.append(f"#{index:<3} {_mb(stat.size):>10} {stat.count:>8} blocks  "
+                     f"{site.filename}:{site.lineno}")
+        for caller in frames[-2:-5:-1]:
+            lines.append(f"{'':>30}  from {caller.filename}:{caller.lineno}")
+    return "\n".join(lines)
+
+
+class PeakSampler:
+    """Background thread keeping the heap snapshot taken closest to the peak
+
+    Peaks shorter than the sampling interval can be missed; the reported
+    peak size itself always comes from tracemalloc.
+    """
+
+    def __init__(self, interval: float = PEAK_SAMPLE_SECONDS,
+                 growth: float = PEAK_SNAPSHOT_GROWTH) -> None:
+        self.interval = interval
+        self.growth = growth
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.snapshot_size = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="peak-sampler", daemon=True)
+
+    def sample(self) -> None:
+        if not tracemalloc.is_tracing():
+            return
+        current, _ = tracemalloc.get_traced_memory()
+        if self.snapshot is None or current > self.snapshot_size * self.growth:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+def run_profiled(mode: str, func: Callable[[], T], output: Optional[str] = None,
+                 top: int = DEFAULT_TOP, label: str = "podcast_cli") -> T:
+    """Run func under the given profiler, write the stats file and print the report
+
+    The report goes to stderr so the command's own output stays clean.
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {mode} (expected one of {', '.join(PROFILE_MODES)})")
+
+    output = output or default_output(mode, label)
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if mode == "cpu":
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func)
+        finally:
+            profiler.dump_stats(output)
+            print(format_cpu_stats(profiler, top), file=sys.stderr)
+            print(f"📈 CPU profile saved to: {output}", file=sys.stderr)
+
+    # The sampler thread starts before tracing so it stays out of the report
+    sampler = PeakSampler()
+    sampler.start()
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+    sampler.sample()
+    try:
+        return func()
+    finally:
+        sampler.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        sampler.snapshot.dump(output)
+        print(format_mem_stats(sampler.snapshot, peak, top), file=sys.stderr)
+        print(f"📈 Allocation snapshot saved to: {output}", file=sys.stderr)
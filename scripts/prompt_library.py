@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Parsed, cached prompt templates
+prompts/podcast_prompts.yaml is parsed once into compiled templates (text
+split into literal pieces and placeholder names, plus declared variable
+defaults) and the compiled form is cached per process and in a JSON file
+(PODCAST_PROMPT_CACHE, default .tmp/prompt_cache.json) keyed by the YAML
+file's mtime and size. Later runs, including one-off shell invocations,
+load the JSON and never import or run the YAML parser.
+
+Rendering fills every placeholder: caller values first, then the
+template's declared defaults. Unknown or missing variables are errors,
+tone and personality preset names expand to their descriptions, and a
+changed duration rescales the default word count.
+
+From the shell, one invocation replaces the per-field yq calls:
+    python3 scripts/prompt_library.py render interview -t "Tide pools" -d 10
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PROMPTS_FILE = PROJECT_ROOT / "prompts" / "podcast_prompts.yaml"
+PROMPT_CACHE_ENV = "PODCAST_PROMPT_CACHE"
+DEFAULT_PROMPT_CACHE = PROJECT_ROOT / ".tmp" / "prompt_cache.json"
+
+# Bump when the compiled layout changes so stale cache files are ignored
+CACHE_FORMAT = 1
+
+# Sections of the YAML file that hold prompt templates
+TEMPLATE_SECTIONS = ("podcast_types", "specialized_prompts")
+
+# {name} placeholders; other braces are left alone
+PLACEHOLDER = re.compile(r"\{([a-z_][a-z0-9_]*)\}")
+
+# Speaker labels in a template's format section: "Host: [dialogue]", "- Teacher: [Explains ...]"
+SPEAKER_NAME = re.compile(r"(?:^[ \t]*-[ \t]*|\")([^\W\d_][\w .'-]{0,39}?): \[", re.MULTILINE)
+
+# Variables that must be positive whole numbers
+INTEGER_VARIABLES = ("duration", "word_count")
+
+# Variables whose values may name an entry of personality_templates
+PERSONALITY_GROUPS = {
+    "host_personality": "host_personalities",
+    "guest_personality": "guest_personalities",
+}
+
+
+class PromptError(ValueError):
+    """Unknown template, or variables that are unknown, missing or invalid"""
+
+
+class CompiledTemplate(NamedTuple):
+    """A prompt template split into literal text and placeholders"""
+    name: str
+    section: str
+    title: str
+    description: str
+    speakers: int
+    # Literal text at even indices, placeholder names at odd indices
+    pieces: Tuple[str, ...]
+    defaults: Dict[str, str]
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """Placeholder names in order of first use"""
+        return tuple(dict.fromkeys(self.pieces[1::2]))
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        """Every name a caller may set: placeholders and declared defaults"""
+        return tuple(dict.fromkeys([*self.fields, *self.defaults]))
+
+    @property
+    def speaker_names(self) -> Tuple[str, ...]:
+        """Speaker labels the template asks the script to use, e.g. ("Host", "Guest")"""
+        return tuple(dict.fromkeys(SPEAKER_NAME.findall("".join(self.pieces[0::2]))))
+
+    def fill(self, values: Mapping[str, str]) -> str:
+        pieces = list(self.pieces)
+        pieces[1::2] = [values[name] for name in self.pieces[1::2]]
+        return "".join(pieces)
+
+
+def compile_template(name: str, section: str, entry: Mapping[str, Any]) -> CompiledTemplate:
+    text = entry.get("prompt_template")
+    if not isinstance(text, str) or not text.strip():
+        raise PromptError(f"Template '{name}' has no prompt_template")
+    return CompiledTemplate(
+        name=name,
+        section=section,
+        title=str(entry.get("name") or name),
+        description=str(entry.get("description") or ""),
+        speakers=int(entry.get("speakers") or 2),
+        pieces=tuple(PLACEHOLDER.split(text)),
+        defaults={key: str(value) for key, value in (entry.get("variables") or {}).items()},
+    )
+
+
+class PromptLibrary:
+    """Every template of one prompts file, plus its tone and personality presets"""
+
+    def __init__(self,
+                 templates: Mapping[str, CompiledTemplate],
+                 tone_presets: Optional[Mapping[str, str]] = None,
+                 personalities: Optional[Mapping[str, Mapping[str, str]]] = None):
+        self.templates = dict(templates)
+        self.tone_presets = dict(tone_presets or {})
+        self.personalities = {group: dict(entries) for group, entries in (personalities or {}).items()}
+
+    @classmethod
+    def from_yaml_data(cls, data: Mapping[str, Any]) -> "PromptLibrary":
+        templates = {}
+        for section in TEMPLATE_SECTIONS:
+            for name, entry in (data.get(section) or {}).items():
+                templates[name] = compile_template(name, section, entry)
+
+        personalities = {}
+        for group, entries in (data.get("personality_templates") or {}).items():
+            personalities[group] = {
+                key: "; ".join(str(entry[field]) for field in ("traits", "speaking_style") if entry.get(field))
+                for key, entry in (entries or {}).items()
+            }
+        return cls(templates, data.get("tone_presets"), personalities)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "templates": [template._asdict() for template in self.templates.values()],
+            "tone_presets": self.tone_presets,
+            "personalities": self.personalities,
+        }
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> "PromptLibrary":
+        templates = {}
+        for fields in data["templates"]:
+            template = CompiledTemplate(**{**fields, "pieces": tuple(fields["pieces"])})
+            templates[template.name] = template
+        return cls(templates, data["tone_presets"], data["personalities"])
+
+    def names(self, section: Optional[str] = None) -> List[str]:
+        return [name for name, template in self.templates.items()
+                if section is None or template.section == section]
+
+    def get(self, name: str) -> CompiledTemplate:
+        try:
+            return self.templates[name]
+        except KeyError:
+            raise PromptError(f"Prompt template '{name}' not found. Choose from: {self.names()}") from None
+
+    def resolve(self, name: str, values: Optional[Mapping[str, Any]] = None) -> Dict[str, str]:
+        """Every variable of a template, validated and with presets expanded"""
+        template = self.get(name)
+        values = {key: value for key, value in (values or {}).items() if value is not None}
+
+        unknown = [key for key in values if key not in template.variables]
+        if unknown:
+            raise PromptError(f"Unknown variables for '{name}': {', '.join(unknown)}. "
+                              f"Template variables: {', '.join(template.variables)}")
+
+        resolved = dict(template.defaults)
+        resolved.update((key, str(value)) for key, value in values.items())
+
+        for key in INTEGER_VARIABLES:
+            if key in resolved:
+                try:
+                    number = int(resolved[key])
+                except ValueError:
+                    number = 0
+                if number <= 0:
+                    raise PromptError(f"{key} must be a positive whole number, got '{resolved[key]}'")
+                resolved[key] = str(number)
+
+        # Keep the template's words per minute when only the duration changes
+        if ("duration" in values and "word_count" not in values
+                and "duration" in template.defaults and "word_count" in template.defaults):
+            per_minute = int(template.defaults["word_count"]) / int(template.defaults["duration"])
+            resolved["word_count"] = str(int(round(per_minute * int(resolved["duration"]), -1)))
+
+        if resolved.get("tone") in self.tone_presets:
+            resolved["tone"] = self.tone_presets[resolved["tone"]]
+        for key, group in PERSONALITY_GROUPS.items():
+            presets = self.personalities.get(group) or {}
+            if resolved.get(key) in presets:
+                resolved[key] = presets[resolved[key]]
+
+        missing = [key for key in template.fields if not resolved.get(key, "").strip()]
+        if missing:
+            raise PromptError(f"Missing variables for '{name}': {', '.join(missing)}")
+        return resolved
+
+    def render(self, name: str, values: Optional[Mapping[str, Any]] = None, **kwargs: Any) -> str:
+        """Template text with every placeholder filled"""
+        return self.get(name).fill(self.resolve(name, {**(values or {}), **kwargs}))
+
+
+# -- loading and caching -------------------------------------------------------
+
+_loaded: Dict[str, Tuple[Tuple[int, int], PromptLibrary]] = {}
+_lock = threading.Lock()
+
+
+def prompt_cache_path() -> str:
+    return os.getenv(PROMPT_CACHE_ENV) or str(DEFAULT_PROMPT_CACHE)
+
+
+def _read_cache(cache_path: str, source: str, stamp: Tuple[int, int]) -> Optional[PromptLibrary]:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            entry = json.load(f).get(source)
+        if entry and entry["format"] == CACHE_FORMAT and tuple(entry["stamp"]) == stamp:
+            return PromptLibrary.from_json(entry["library"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def _write_cache(cache_path: str, source: str, stamp: Tuple[int, int], library: PromptLibrary) -> None:
+    """Add or replace this prompts file's entry; the cache is only an optimisation"""
+    try:
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            if not isinstance(entries, dict):
+                entries = {}
+        except (OSError, ValueError):
+            entries = {}
+        entries[source] = {"format": CACHE_FORMAT, "stamp": list(stamp), "library": library.to_json()}
+
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
+
+
+def _parse_yaml(source: str) -> PromptLibrary:
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(source, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=loader)
+    if not isinstance(data, dict):
+        raise PromptError(f"Prompts file is not a YAML mapping: {source}")
+    return PromptLibrary.from_yaml_data(data)
+
+
+def load(path: Optional[str] = None, cache_path: Optional[str] = None) -> PromptLibrary:
+    """The compiled library for a prompts file, reparsed only after the file changes"""
+    source = os.path.abspath(path or DEFAULT_PROMPTS_FILE)
+    try:
+        stat = os.stat(source)
+    except FileNotFoundError:
+        raise PromptError(f"Prompts file not found: {source}") from None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _lock:
+        cached = _loaded.get(source)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        cache_path = cache_path or prompt_cache_path()
+        library = _read_cache(cache_path, source, stamp)
+        if library is None:
+            library = _parse_yaml(source)
+            _write_cache(cache_path, source, stamp, library)
+        _loaded[source] = (stamp, library)
+        return library
+
+
+def render(name: str, values: Optional[Mapping[str, Any]] = None, path: Optional[str] = None,
+           **kwargs: Any) -> str:
+    """Render a template from the default (or given) prompts file"""
+    return load(path).render(name, values, **kwargs)
+
+
+# -- command line --------------------------------------------------------------
+
+def parse_assignments(assignments: Sequence[str]) -> Dict[str, str]:
+    """NAME=VALUE strings as a dict"""
+    values = {}
+    for assignment in assignments:
+        name, sep, value = assignment.partition("=")
+        if not sep or not name.strip():
+            raise PromptError(f"Expected NAME=VALUE, got '{assignment}'")
+        values[name.strip()] = value
+    return values
+
+
+def configure_parser(parser: argparse.ArgumentParser) -> None:
+    """Add the list/show/render subcommands (shared with podcast_cli.py prompt)"""
+    parser.add_argument("--prompts", help="Prompts file (default: prompts/podcast_prompts.yaml)")
+    subparsers = parser.add_subparsers(dest="prompt_command", help="Prompt command")
+    subparsers.add_parser("list", help="Template names and descriptions")
+    show_parser = subparsers.add_parser("show", help="Variables of a template and their defaults")
+    show_parser.add_argument("name", help="Template name, e.g. interview")
+    show_parser.add_argument("--json", action="store_true", help="Print as JSON")
+    render_parser = subparsers.add_parser("render", help="Print a template with every variable filled")
+    render_parser.add_argument("name", help="Template name, e.g. interview")
+    render_parser.add_argument("-t", "--topic", help="Value for {topic}")
+    render_parser.add_argument("-d", "--duration", help="Value for {duration} in minutes")
+    render_parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                               help="Value for any other variable, repeatable")
+
+
+def run(args: argparse.Namespace, parser: Optional[argparse.ArgumentParser] = None) -> int:
+    """Run a prompt subcommand; output goes to stdout for use in scripts"""
+    if args.prompt_command is None:
+        if parser is not None:
+            parser.print_help()
+        return 1
+
+    try:
+        library = load(args.prompts)
+        if args.prompt_command == "list":
+            for name, template in library.templates.items():
+                print(f"{name:<18} {template.description}")
+            return 0
+
+        template = library.get(args.name)
+        if args.prompt_command == "show":
+            variables = {name: template.defaults.get(name) for name in template.variables}
+            if args.json:
+                print(json.dumps({"name": template.name, "speakers": template.speakers,
+                                  "variables": variables}, ensure_ascii=False))
+            else:
+                for name, default in variables.items():
+                    print(f"{name:<18} {'(required)' if default is None else default}")
+            return 0
+
+        values = {"topic": args.topic, "duration": args.duration, **parse_assignments(args.set)}
+        print(library.render(args.name, values), end="")
+        return 0
+    except PromptError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render podcast prompt templates")
+    configure_parser(parser)
+    return run(parser.parse_args(argv), parser)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Request packing for short utterances
+Many short texts are sent as one TTS request separated by pause markers,
+and the returned PCM is split back into per-item clips at the silences
+"""
+
+from typing import List, Optional, Sequence
+
+from silence import DEFAULT_THRESHOLD_DB, find_silences
+
+# Text placed between packed items; the model renders it as a long pause
+PACK_SEPARATOR = "\n\n[long pause]\n\n"
+
+DEFAULT_MAX_PACK_ITEMS = 20
+DEFAULT_MAX_PACK_CHARS = 1000
+
+# Gaps shorter than this are treated as pauses inside an item
+DEFAULT_MIN_GAP_SECONDS = 0.5
+
+
+def plan_packs(texts: Sequence[str],
+               max_items: int = DEFAULT_MAX_PACK_ITEMS,
+               max_chars: int = DEFAULT_MAX_PACK_CHARS) -> List[List[int]]:
+    """Group text indices into packs bounded by item count and total length"""
+    packs: List[List[int]] = []
+    current: List[int] = []
+    current_chars = 0
+
+    for index, text in enumerate(texts):
+        length = len(text) + len(PACK_SEPARATOR)
+        if current and (len(current) >= max_items or current_chars + length > max_chars):
+            packs.append(current)
+            current, current_chars = [], 0
+        current.append(index)
+        current_chars += length
+
+    if current:
+        packs.append(current)
+    return packs
+
+
+def pack_texts(texts: Sequence[str]) -> str:
+    """Join texts into a single request body"""
+    return PACK_SEPARATOR.join(text.strip() for text in texts)
+
+
+def split_packed_audio(pcm: bytes,
+                       count: int,
+                       sample_rate: int = 24000,
+                       bits_per_sample: int = 16,
+                       num_channels: int = 1,
+                       min_gap_seconds: float = DEFAULT_MIN_GAP_SECONDS,
+                       threshold_db: float = DEFAULT_THRESHOLD_DB) -> Optional[List[bytes]]:
+    """Split packed PCM into count clips at the gaps between items
+
+    Returns None when the number of internal gaps does not match count - 1,
+    in which case the caller should synthesize the items individually.
+    """
+    if count == 1:
+        return [pcm]
+
+    frame_size = bits_per_sample // 8 * num_channels
+    total_frames = len(pcm) // frame_size
+
+    gaps = [
+        (start, end)
+        for start, end in find_silences(pcm, sample_rate, bits_per_sample, num_channels,
+                                        threshold_db=threshold_db,
+                                        min_silence_seconds=min_gap_seconds)
+        # Leading and trailing silence is not a separator
+        if start > 0 and end < total_frames
+    ]
+    if len(gaps) != count - 1:
+        return None
+
+    cuts = [0] + [(start + end) // 2 for start, end in gaps] + [total_frames]
+    view = memoryview(pcm)
+    return [bytes(view[a * frame_size:b * frame_size]) for a, b in zip(cuts, cuts[1:])]
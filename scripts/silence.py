@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Vectorized silence detection for PCM audio
+Windowed RMS levels are computed with NumPy so thousands of clips can be
+scanned per second
+"""
+
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_WINDOW_SECONDS = 0.01
+DEFAULT_THRESHOLD_DB = -40.0
+DEFAULT_MIN_SILENCE_SECONDS = 0.2
+
+# Silence left around speech after trimming, so onsets aren't clipped
+DEFAULT_KEEP_SECONDS = 0.05
+
+PCMData = Union[bytes, bytearray, memoryview]
+
+# Silence spans are (start_frame, end_frame), end exclusive
+Span = Tuple[int, int]
+
+
+class SilenceReport(NamedTuple):
+    """Leading/trailing silence and internal gaps of a clip, in frames"""
+    total_frames: int
+    head_frames: int
+    tail_frames: int
+    internal: List[Span]
+
+    @property
+    def is_silent(self) -> bool:
+        return self.head_frames >= self.total_frames
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required for silence detection: pip install numpy")
+
+
+def pcm_to_array(pcm: PCMData, bits_per_sample: int = 16, num_channels: int = 1):
+    """View little-endian PCM bytes as a (frames, channels) array without copying"""
+    _require_numpy()
+
+    dtypes = {8: np.uint8, 16: np.dtype("<i2"), 32: np.dtype("<i4")}
+    if bits_per_sample not in dtypes:
+        raise ValueError(f"Unsupported PCM bit depth: {bits_per_sample}")
+
+    frame_size = num_channels * (bits_per_sample // 8)
+    usable = len(pcm) - len(pcm) % frame_size
+    samples = np.frombuffer(pcm, dtype=dtypes[bits_per_sample], count=usable * 8 // bits_per_sample)
+    return samples.reshape(-1, num_channels)
+
+
+def window_levels_db(samples, sample_rate: int, bits_per_sample: int = 16,
+                     window_seconds: float = DEFAULT_WINDOW_SECONDS):
+    """RMS level of each window in dBFS; a trailing partial window is included"""
+    _require_numpy()
+
+    window = max(1, int(round(window_seconds * sample_rate)))
+    frames = samples.shape[0]
+    if frames == 0:
+        return np.empty(0, dtype=np.float32), window
+
+    x = samples.astype(np.float32)
+    if bits_per_sample == 8:
+        x -= 128.0
+    full_scale = float(1 << (bits_per_sample - 1))
+
+    # Per-frame energy summed over each window
+    energy = np.einsum("ij,ij->i", x, x)
+    edges = np.arange(0, frames, window)
+    sums = np.add.reduceat(energy, edges)
+    counts = np.diff(np.append(edges, frames)) * samples.shape[1]
+    mean_square = sums / counts / (full_scale * full_scale)
+
+    return 10.0 * np.log10(mean_square + 1e-12), window
+
+
+def _runs(mask) -> List[Span]:
+    """Start/end indices of runs of True values"""
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    changes = np.flatnonzero(np.diff(padded))
+    return list(zip(changes[0::2].tolist(), changes[1::2].tolist()))
+
+
+def find_silences(pcm: PCMData,
+                  sample_rate: int = 24000,
+                  bits_per_sample: int = 16,
+                  num_channels: int = 1,
+                  threshold_db: float = DEFAULT_THRESHOLD_DB,
+                  min_silence_seconds: float = DEFAULT_MIN_SILENCE_SECONDS,
+                  window_seconds: float = DEFAULT_WINDOW_SECONDS) -> List[Span]:
+    """Find silent spans as (start_frame, end_frame) pairs, window resolution"""
+    samples = pcm_to_array(pcm, bits_per_sample, num_channels)
+    levels, window = window_levels_db(samples, sample_rate, bits_per_sample, window_seconds)
+    if levels.size == 0:
+        return []
+
+    frames = samples.shape[0]
+    min_windows = max(1, int(round(min_silence_seconds * sample_rate / window)))
+
+    spans = []
+    for start, end in _runs(levels < threshold_db):
+        if end - start >= min_windows:
+            spans.append((start * window, min(end * window, frames)))
+    return spans
+
+
+def detect_silence(pcm: PCMData,
+                   sample_rate: int = 24000,
+                   bits_per_sample: int = 16,
+                   num_channels: int = 1,
+                   threshold_db: float = DEFAULT_THRESHOLD_DB,
+                   min_silence_seconds: float = DEFAULT_MIN_SILENCE_SECONDS,
+                   window_seconds: float = DEFAULT_WINDOW_SECONDS) -> SilenceReport:
+    """Measure head/tail silence and report internal gaps longer than min_silence_seconds"""
+    samples = pcm_to_array(pcm, bits_per_sample, num_channels)
+    levels, window = window_levels_db(samples, sample_rate, bits_per_sample, window_seconds)
+    frames = samples.shape[0]
+
+    voiced = np.flatnonzero(levels >= threshold_db)
+    if voiced.size == 0:
+        return SilenceReport(frames, frames, 0, [])
+
+    first, last = int(voiced[0]), int(voiced[-1])
+    head = first * window
+    tail = frames - min((last + 1) * window, frames)
+
+    min_windows = max(1, int(round(min_silence_seconds * sample_rate / window)))
+    internal = [
+        ((first + start) * window, (first + end) * window)
+        for start, end in _runs(levels[first:last + 1] < threshold_db)
+        if end - start >= min_windows
+    ]
+
+    return SilenceReport(frames, head, tail, internal)
+
+
+def trim_bounds(pcm: PCMData,
+                sample_rate: int = 24000,
+                bits_per_sample: int = 16,
+                num_channels: int = 1,
+                threshold_db: float = DEFAULT_THRESHOLD_DB,
+                keep_seconds: float = DEFAULT_KEEP_SECONDS,
+                window_seconds: float = DEFAULT_WINDOW_SECONDS,
+                scan_seconds: Optional[float] = None) -> Span:
+    """Frame range left after cutting leading and trailing silence
+
+    With scan_seconds, only that much audio at each end is analysed, so
+    long (e.g. memory-mapped) episodes are not converted as a whole; the
+    head and tail can then lose at most scan_seconds each. A clip that is
+    silent throughout gives an empty range.
+    """
+    frame_size = num_channels * (bits_per_sample // 8)
+    total_frames = len(pcm) // frame_size
+    keep = int(round(keep_seconds * sample_rate))
+    scan_frames = int(scan_seconds * sample_rate) if scan_seconds else None
+
+    if scan_frames is None or total_frames <= 2 * scan_frames:
+        report = detect_silence(pcm, sample_rate, bits_per_sample, num_channels,
+                                threshold_db=threshold_db, window_seconds=window_seconds)
+        if report.is_silent:
+            return (0, 0)
+        head, tail = report.head_frames, report.tail_frames
+    else:
+        view = memoryview(pcm)
+        scan_bytes = scan_frames * frame_size
+        head = detect_silence(view[:scan_bytes], sample_rate, bits_per_sample, num_channels,
+                              threshold_db=threshold_db, window_seconds=window_seconds).head_frames
+        tail_start = (total_frames - scan_frames) * frame_size
+        tail = detect_silence(view[tail_start:tail_start + scan_bytes], sample_rate, bits_per_sample,
+                              num_channels, threshold_db=threshold_db,
+                              window_seconds=window_seconds)
+        tail = scan_frames if tail.is_silent else tail.tail_frames
+
+    return (max(0, head - keep), min(total_frames, total_frames - tail + keep))
+
+
+def trim_silence(pcm: PCMData,
+                 sample_rate: int = 24000,
+                 bits_per_sample: int = 16,
+                 num_channels: int = 1,
+                 threshold_db: float = DEFAULT_THRESHOLD_DB,
+                 keep_seconds: float = DEFAULT_KEEP_SECONDS,
+                 window_seconds: float = DEFAULT_WINDOW_SECONDS) -> bytes:
+    """Cut leading and trailing silence, keeping keep_seconds of padding
+
+    A clip that is silent throughout is returned empty.
+    """
+    start, end = trim_bounds(pcm, sample_rate, bits_per_sample, num_channels,
+                             threshold_db=threshold_db, keep_seconds=keep_seconds,
+                             window_seconds=window_seconds)
+    if start >= end:
+        return b""
+
+    frame_size = num_channels * (bits_per_sample // 8)
+    return bytes(memoryview(pcm)[start * frame_size:end * frame_size])
@@ -0,0 +1,108 @@
+#!/bin/bash
+
+################################################################################
+# Span tracing helpers for the pipeline scripts (source this file)
+# Spans are appended as JSON lines to $PODCAST_TRACE_FILE; the trace ID and
+# current parent span reach child processes through PODCAST_TRACE_ID and
+# PODCAST_TRACE_PARENT, which scripts/tracing.py reads on the Python side.
+################################################################################
+
+_TRACE_IDS=()
+_TRACE_NAMES=()
+_TRACE_STARTS=()
+_TRACE_PARENTS=()
+
+trace_now() {
+    if [[ -n "${EPOCHREALTIME:-}" ]]; then
+        echo "${EPOCHREALTIME/,/.}"
+    else
+        date +%s.%N
+    fi
+}
+
+trace_new_id() {
+    od -An -N"${1:-8}" -tx1 /dev/urandom | tr -d ' \n'
+}
+
+# trace_init [DEFAULT_TRACE_FILE]: enable tracing and start a trace if needed
+trace_init() {
+    if [[ -z "${PODCAST_TRACE_FILE:-}" ]]; then
+        if [[ -z "${1:-}" ]]; then
+            return 0
+        fi
+        export PODCAST_TRACE_FILE="$1"
+    fi
+    mkdir -p "$(dirname "$PODCAST_TRACE_FILE")"
+    if [[ -z "${PODCAST_TRACE_ID:-}" ]]; then
+        export PODCAST_TRACE_ID="$(trace_new_id 16)"
+    fi
+    return 0
+}
+
+# trace_span_start NAME: open a span nested under the current one
+trace_span_start() {
+    if [[ -z "${PODCAST_TRACE_FILE:-}" || -z "${PODCAST_TRACE_ID:-}" ]]; then
+        return 0
+    fi
+    local span_id
+    span_id=$(trace_new_id 8)
+    _TRACE_IDS+=("$span_id")
+    _TRACE_NAMES+=("$1")
+    _TRACE_STARTS+=("$(trace_now)")
+    _TRACE_PARENTS+=("${PODCAST_TRACE_PARENT:-}")
+    export PODCAST_TRACE_PARENT="$span_id"
+    return 0
+}
+
+# trace_span_end [EXIT_CODE]: close the innermost open span
+trace_span_end() {
+    local exit_code=${1:-0}
+    if [[ -z "${PODCAST_TRACE_FILE:-}" || ${#_TRACE_IDS[@]} -eq 0 ]]; then
+        return 0
+    fi
+
+    local i=$(( ${#_TRACE_IDS[@]} - 1 ))
+    local parent="${_TRACE_PARENTS[$i]}"
+    local parent_json="null"
+    local status="ok"
+    if [[ -n "$parent" ]]; then
+        parent_json="\"$parent\""
+    fi
+    if [[ "$exit_code" -ne 0 ]]; then
+        status="error"
+    fi
+
+    local name="${_TRACE_NAMES[$i]//\\/\\\\}"
+    name="${name//\"/\\\"}"
+    printf '{"trace_id":"%s","span_id":"%s","parent_id":%s,"name":"%s","start":%s,"end":%s,"status":"%s","exit_code":%d,"pid":%d,"source":"bash"}\n' \
+        "$PODCAST_TRACE_ID" "${_TRACE_IDS[$i]}" "$parent_json" "$name" \
+        "${_TRACE_STARTS[$i]}" "$(trace_now)" "$status" "$exit_code" "$$" >> "$PODCAST_TRACE_FILE"
+
+    unset "_TRACE_IDS[$i]" "_TRACE_NAMES[$i]" "_TRACE_STARTS[$i]" "_TRACE_PARENTS[$i]"
+    if [[ -n "$parent" ]]; then
+        export PODCAST_TRACE_PARENT="$parent"
+    else
+        unset PODCAST_TRACE_PARENT
+    fi
+    return 0
+}
+
+# trace_span NAME COMMAND [ARGS...]: run a command inside a span, keeping its status
+trace_span() {
+    local name=$1
+    shift
+    trace_span_start "$name"
+    local exit_code=0
+    "$@" || exit_code=$?
+    trace_span_end "$exit_code"
+    return "$exit_code"
+}
+
+# trace_finish [EXIT_CODE]: close every open span, e.g. from an EXIT trap
+trace_finish() {
+    local exit_code=${1:-0}
+    while [[ ${#_TRACE_IDS[@]} -gt 0 ]]; do
+        trace_span_end "$exit_code"
+    done
+    return 0
+}
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Lightweight span tracing for the podcast pipeline
+Spans are appended as JSON lines to $PODCAST_TRACE_FILE. The trace ID and
+the current parent span travel between bash and Python processes in
+PODCAST_TRACE_ID and PODCAST_TRACE_PARENT (see trace.sh for the bash side).
+Tracing is off unless PODCAST_TRACE_FILE is set.
+"""
+
+import contextvars
+import json
+import os
+import secrets
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+TRACE_FILE_ENV = "PODCAST_TRACE_FILE"
+TRACE_ID_ENV = "PODCAST_TRACE_ID"
+TRACE_PARENT_ENV = "PODCAST_TRACE_PARENT"
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("podcast_trace_span", default=None)
+
+WATERFALL_WIDTH = 40
+
+
+def enabled() -> bool:
+    return bool(os.getenv(TRACE_FILE_ENV))
+
+
+def new_span_id() -> str:
+    return secrets.token_hex(8)
+
+
+def current_trace_id() -> str:
+    """Trace ID from the environment, starting a new trace if there is none"""
+    trace_id = os.getenv(TRACE_ID_ENV)
+    if not trace_id:
+        trace_id = secrets.token_hex(16)
+        os.environ[TRACE_ID_ENV] = trace_id
+    return trace_id
+
+
+def current_parent() -> Optional[str]:
+    return _current_span.get() or os.getenv(TRACE_PARENT_ENV) or None
+
+
+def record_span(name: str, start: float, end: float, status: str = "ok",
+                span_id: Optional[str] = None, parent_id: Optional[str] = None,
+                **attributes: Any) -> None:
+    """Append one finished span; start and end are Unix timestamps"""
+    path = os.getenv(TRACE_FILE_ENV)
+    if not path:
+        return
+
+    record: Dict[str, Any] = {
+        "trace_id": current_trace_id(),
+        "span_id": span_id or new_span_id(),
+        "parent_id": parent_id if parent_id is not None else current_parent(),
+        "name": name,
+        "start": start,
+        "end": end,
+        "status": status,
+        "pid": os.getpid(),
+        "source": "python",
+    }
+    if attributes:
+        record["attributes"] = attributes
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+    # A single O_APPEND write keeps concurrent writers' lines whole
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[str]]:
+    """Trace the enclosed block; child processes started inside inherit it as parent"""
+    if not enabled():
+        yield None
+        return
+
+    span_id = new_span_id()
+    parent_id = current_parent()
+    token = _current_span.set(span_id)
+    saved_parent = os.environ.get(TRACE_PARENT_ENV)
+    os.environ[TRACE_PARENT_ENV] = span_id
+    start = time.time()
+    status = "ok"
+    try:
+        yield span_id
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        _current_span.reset(token)
+        if saved_parent is None:
+            os.environ.pop(TRACE_PARENT_ENV, None)
+        else:
+            os.environ[TRACE_PARENT_ENV] = saved_parent
+        record_span(name, start, time.time(), status=status,
+                    span_id=span_id, parent_id=parent_id, **attributes)
+
+
+def trace_timing(timing: Any) -> None:
+    """Timing hook recording each TTS request as a span"""
+    end = time.time()
+    record_span(
+        "gemini_tts.request",
+        end - timing.total_seconds,
+        end,
+        status="error" if timing.error else "ok",
+        backend=timing.backend,
+        chars=timing.chars,
+        ttfc_ms=None if timing.ttfc_seconds is None else round(timing.ttfc_seconds * 1000, 1),
+        audio_seconds=round(timing.audio_seconds, 2),
+        bytes=timing.bytes,
+    )
+
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    """Read every span from a trace file, skipping malformed lines"""
+    spans = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return spans
+
+
+def list_traces(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One summary per trace, oldest first"""
+    traces: Dict[str, Dict[str, Any]] = {}
+    for s in spans:
+        summary = traces.setdefault(s["trace_id"], {
+            "trace_id": s["trace_id"], "start": s["start"], "end": s["end"],
+            "spans": 0, "errors": 0, "root": None,
+        })
+        summary["start"] = min(summary["start"], s["start"])
+        summary["end"] = max(summary["end"], s["end"])
+        summary["spans"] += 1
+        summary["errors"] += s.get("status") == "error"
+        if not s.get("parent_id"):
+            summary["root"] = s["name"]
+    return sorted(traces.values(), key=lambda t: t["start"])
+
+
+def format_waterfall(spans: List[Dict[str, Any]], width: int = WATERFALL_WIDTH) -> str:
+    """Indented span tree with offsets, durations and timeline bars"""
+    if not spans:
+        return "No spans recorded"
+
+    t0 = min(s["start"] for s in spans)
+    total = max(max(s["end"] for s in spans) - t0, 1e-9)
+    ids = {s["span_id"] for s in spans}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for s in spans:
+        parent = s.get("parent_id") if s.get("parent_id") in ids else None
+        children.setdefault(parent, []).append(s)
+
+    rows = []
+
+    def walk(parent: Optional[str], depth: int) -> None:
+        for s in sorted(children.get(parent, []), key=lambda item: item["start"]):
+            rows.append((depth, s))
+            walk(s["span_id"], depth + 1)
+
+    walk(None, 0)
+
+    name_width = max(len("  " * depth + s["name"]) for depth, s in rows) + 2
+    lines = [f"Trace {spans[0]['trace_id']}: {len(spans)} spans, {total:.2f}s",
+             f"{'span':<{name_width}}{'start':>9} {'duration':>10}  timeline"]
+    for depth, s in rows:
+        offset = s["start"] - t0
+        duration = s["end"] - s["start"]
+        left = int(offset / total * width)
+        length = max(1, int(round(duration / total * width)))
+        bar = " " * left + "█" * min(length, width - left)
+        mark = " ✗" if s.get("status") == "error" else ""
+        label = "  " * depth + s["name"]
+        lines.append(f"{label:<{name_width}}{offset:>8.3f}s {duration:>9.3f}s  |{bar:<{width}}|{mark}")
+    return "\n".join(lines)
@@ -23,6 +23,7 @@ PROVIDER="gemini"
 OUTPUT_DIR="./outputs"
 OUTPUT_FORMAT="mp3"
 MAX_RETRIES=3
+QUIET=false
 
 # Gemini Configuration (loaded from .env)
 GEMINI_MODEL=""
@@ -32,20 +33,30 @@ GEMINI_TEMPERATURE=0.9
 # Environment setup
 SCRIPTS_DIR="$(dirname "$0")"
 
+# Span tracing, active when a caller sets PODCAST_TRACE_FILE
+source "$SCRIPTS_DIR/trace.sh"
+trace_init
+
 ################################################################################
 # Helper Functions
 ################################################################################
 
 print_info() {
-    echo -e "${BLUE}ℹ️  $1${NC}"
+    if [[ "$QUIET" != "true" ]]; then
+        echo -e "${BLUE}ℹ️  $1${NC}"
+    fi
 }
 
 print_success() {
-    echo -e "${GREEN}✅ $1${NC}"
+    if [[ "$QUIET" != "true" ]]; then
+        echo -e "${GREEN}✅ $1${NC}"
+    fi
 }
 
 print_error() {
-    echo -e "${RED}❌ $1${NC}"
+    if [[ "$QUIET" != "true" ]]; then
+        echo -e "${RED}❌ $1${NC}"
+    fi
 }
 
 # Convert audio format using ffmpeg
@@ -55,7 +66,7 @@ convert_audio_format() {
 
     case "${OUTPUT_FORMAT}" in
         "mp3")
-            ffmpeg -y -i "$input_file" -codec:a libmp3lame -qscale:a 2 "$output_file" >/dev/null 2>&1
+            trace_span ffmpeg ffmpeg -y -i "$input_file" -codec:a libmp3lame -qscale:a 2 "$output_file" >/dev/null 2>&1
             ;;
         *)
             cp "$input_file" "$output_file"
@@ -108,16 +119,22 @@ from pathlib import Path
 scripts_dir = os.environ.get('SCRIPTS_DIR', 'scripts')
 sys.path.insert(0, scripts_dir)
 
+from tts_logging import emit_result, get_logger, log_context
+
+logger = get_logger("tts-manager")
+
 def generate_with_retry(tts, text, voice_name, temperature, max_retries=3):
     """Generate TTS with retry logic"""
     for attempt in range(max_retries):
         try:
             if attempt > 0:
                 delay = (2 ** attempt) + random.uniform(0, 1)
-                print(f"Retry {attempt + 1}/{max_retries}...")
+                logger.info(f"Retry {attempt + 1}/{max_retries}...", extra={"attempt": attempt + 1, "delay": delay})
+                if tts.metrics is not None:
+                    tts.metrics.retry("tts-manager")
                 time.sleep(delay)
 
-            print(f"Attempt {attempt + 1}/{max_retries}")
+            logger.debug(f"Attempt {attempt + 1}/{max_retries}", extra={"attempt": attempt + 1})
             filename = tts.generate_speech(
                 text=text,
                 voice_name=voice_name,
@@ -130,7 +147,7 @@ def generate_with_retry(tts, text, voice_name, temperature, max_retries=3):
                 raise Exception(f"Invalid filename: {filename}")
 
         except Exception as e:
-            print(f"Attempt {attempt + 1} failed: {e}")
+            logger.warning(f"Attempt {attempt + 1} failed: {e}", extra={"attempt": attempt + 1})
             if attempt == max_retries - 1:
                 return None
 
@@ -148,7 +165,8 @@ try:
     output_file = os.environ.get('TEMP_WAV_FILE')
 
     if not api_key or not encoded_text:
-        print("Missing required environment variables")
+        logger.error("Missing required environment variables")
+        emit_result("failure", error="missing environment variables")
         sys.exit(1)
 
     # Decode text
@@ -158,24 +176,27 @@ try:
     tts = GeminiTTS(api_key=api_key, model=model)
 
     # Generate with retry
-    result_file = generate_with_retry(
-        tts=tts,
-        text=text,
-        voice_name=voice_name,
-        temperature=temperature,
-        max_retries=3
-    )
+    with log_context(voice=voice_name, chars=len(text)):
+        result_file = generate_with_retry(
+            tts=tts,
+            text=text,
+            voice_name=voice_name,
+            temperature=temperature,
+            max_retries=3
+        )
 
     if result_file:
         if output_file and result_file != output_file:
             Path(result_file).rename(output_file)
-        print("SUCCESS")
+            result_file = output_file
+        emit_result("success", output=result_file)
     else:
-        print("FAILURE")
+        emit_result("failure", error="all attempts failed")
         sys.exit(1)
 
 except Exception as e:
-    print(f"Fatal error: {e}")
+    get_logger("tts-manager").error(f"Fatal error: {e}")
+    emit_result("failure", error=str(e))
     sys.exit(1)
 PYTHON
 )
@@ -188,15 +209,26 @@ PYTHON
     export ENCODED_TEXT="${encoded_text}"
     export TEMP_WAV_FILE="${temp_wav_file}"
     export SCRIPTS_DIR="${SCRIPTS_DIR}"
+    if [[ -n "${GEMINI_API_BASE_URL:-}" ]]; then
+        export GEMINI_API_BASE_URL
+    fi
+    if [[ -n "${GEMINI_TTS_METRICS_FILE:-}" ]]; then
+        export GEMINI_TTS_METRICS_FILE
+    fi
+    if [[ "$QUIET" == "true" ]]; then
+        export GEMINI_TTS_LOG_LEVEL="quiet"
+    fi
+
+    # The Python step reports its outcome and output path as JSON here
+    local result_file
+    result_file=$(mktemp "${TMPDIR:-/tmp}/tts_result.XXXXXX")
+    export GEMINI_TTS_RESULT_FILE="$result_file"
 
     # Execute Python script
-    if source venv/bin/activate && python3 -c "$python_script"; then
-        # Find the generated file
-        if [[ -f "$temp_wav_file" ]]; then
-            local actual_wav_file="$temp_wav_file"
-        else
-            actual_wav_file=$(ls -t *.wav 2>/dev/null | head -1)
-        fi
+    if source venv/bin/activate && trace_span gemini_tts python3 -c "$python_script"; then
+        local actual_wav_file
+        actual_wav_file=$(python3 "$SCRIPTS_DIR/tts_logging.py" "$result_file" output || true)
+        rm -f "$result_file"
 
         if [[ -n "$actual_wav_file" && -f "$actual_wav_file" ]]; then
             # Convert to requested format if needed
@@ -218,6 +250,7 @@ PYTHON
             return 1
         fi
     else
+        rm -f "$result_file"
         print_error "TTS generation failed"
         return 1
     fi
@@ -263,6 +296,10 @@ main() {
                 GEMINI_TEMPERATURE="$2"
                 shift 2
                 ;;
+            -q|--quiet)
+                QUIET=true
+                shift
+                ;;
             -h|--help)
                 cat << EOF
 Usage: $0 [OPTIONS]
@@ -276,6 +313,7 @@ OPTIONS:
     --format FORMAT             Output format: wav, mp3 (default)
     --voice VOICE               Voice name (default: Zephyr)
     --temperature TEMP          Voice variation 0.0-1.0 (default: 0.9)
+    -q, --quiet                 No output; check the exit status
     -h, --help                  Show this help message
 
 EXAMPLES:
@@ -313,6 +351,9 @@ EOF
 
     print_info "Using model: $GEMINI_MODEL"
     print_info "Voice: $GEMINI_VOICE"
+    if [[ -n "${GEMINI_API_BASE_URL:-}" ]]; then
+        print_info "API endpoint: $GEMINI_API_BASE_URL"
+    fi
     print_info "Output: $output_file"
 
     # Generate TTS
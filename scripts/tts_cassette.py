@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Record-and-replay cassettes for Gemini TTS streams
+A recorder captures each request, its audio chunks and their arrival times;
+a player streams them back with the original pacing, optionally time-scaled,
+so benchmarks and tests can reproduce real API behaviour offline.
+
+Cassette layout: an 8-byte magic, then one record per request made of
+struct "<II" (meta_size, payload_size), a JSON meta block and the chunk
+payloads back to back.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from gemini_api import GeminiAPIError
+
+CASSETTE_MAGIC = b"GTTSCAS1"
+RECORD_HEADER = struct.Struct("<II")
+
+
+class CassetteMiss(LookupError):
+    """Replay was asked for a request the cassette does not contain"""
+
+
+def request_key(model: str, text: str, request: NamedTuple) -> str:
+    """Stable key for a speech request: model, text and every request field"""
+    identity = json.dumps([model, text, list(request)], ensure_ascii=False,
+                          separators=(",", ":"))
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+
+
+class Interaction(NamedTuple):
+    """One recorded request as indexed by the player"""
+    meta: Dict[str, Any]
+    payload_offset: int
+
+
+class CassetteRecorder:
+    """Append recorded streams to a cassette file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        with open(path, "ab") as f:
+            if f.tell() == 0:
+                f.write(CASSETTE_MAGIC)
+
+    def _append(self, meta: Dict[str, Any], payloads: List[bytes]) -> None:
+        meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        payload_size = sum(len(p) for p in payloads)
+        with self.lock, open(self.path, "ab") as f:
+            f.write(RECORD_HEADER.pack(len(meta_bytes), payload_size))
+            f.write(meta_bytes)
+            f.writelines(payloads)
+
+    def record(self, model: str, text: str, request: NamedTuple,
+               chunks: Iterable[Tuple[bytes, Optional[str]]]) -> Iterator[Tuple[bytes, Optional[str]]]:
+        """Pass chunks through while capturing them and their arrival offsets"""
+        mimes: List[Optional[str]] = []
+        timeline: List[List[Any]] = []
+        payloads: List[bytes] = []
+        error = None
+        completed = False
+
+        start = time.monotonic()
+        try:
+            for data, mime_type in chunks:
+                if mime_type not in mimes:
+                    mimes.append(mime_type)
+                timeline.append([round(time.monotonic() - start, 6), len(data), mimes.index(mime_type)])
+                payloads.append(data)
+                yield data, mime_type
+            completed = True
+        except Exception as e:
+            error = {"message": str(e), "status_code": getattr(e, "status_code", None),
+                     "offset": round(time.monotonic() - start, 6)}
+            raise
+        finally:
+            # A consumer that stops early leaves nothing worth replaying
+            if completed or error is not None:
+                meta = {
+                    "key": request_key(model, text, request),
+                    "model": model,
+                    "text": text,
+                    "request": dict(request._asdict()),
+                    "mimes": mimes,
+                    "chunks": timeline,
+                    "error": error,
+                }
+                self._append(meta, payloads)
+
+
+class CassettePlayer:
+    """Replay recorded streams, keyed by request
+
+    time_scale multiplies the recorded delays: 1.0 replays in real time,
+    0.5 twice as fast and 0 without any waiting. Identical requests replay
+    their recordings in order, repeating the last one once exhausted.
+    """
+
+    def __init__(self, path: str, time_scale: float = 1.0):
+        self.path = path
+        self.time_scale = time_scale
+        self.lock = threading.Lock()
+        self.interactions: Dict[str, List[Interaction]] = {}
+        self.plays: Dict[str, int] = {}
+        self._load()
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def _load(self) -> None:
+        with open(self.path, "rb") as f:
+            if f.read(len(CASSETTE_MAGIC)) != CASSETTE_MAGIC:
+                raise ValueError(f"Not a TTS cassette: {self.path}")
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    break
+                meta_size, payload_size = RECORD_HEADER.unpack(header)
+                meta = json.loads(f.read(meta_size).decode("utf-8"))
+                self.interactions.setdefault(meta["key"], []).append(Interaction(meta, f.tell()))
+                f.seek(payload_size, os.SEEK_CUR)
+
+    def __len__(self) -> int:
+        return sum(len(recorded) for recorded in self.interactions.values())
+
+    def _next(self, key: str) -> Interaction:
+        with self.lock:
+            recorded = self.interactions.get(key)
+            if not recorded:
+                raise CassetteMiss(f"No recording for request {key} in {self.path}")
+            index = self.plays.get(key, 0)
+            self.plays[key] = index + 1
+        return recorded[min(index, len(recorded) - 1)]
+
+    def _wait_until(self, start: float, offset: float) -> None:
+        delay = start + offset * self.time_scale - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def play(self, model: str, text: str, request: NamedTuple) -> Iterator[Tuple[bytes, Optional[str]]]:
+        """Yield the recorded (audio_bytes, mime_type) chunks with their original pacing"""
+        meta, offset = self._next(request_key(model, text, request))
+        mimes = meta["mimes"]
+
+        start = time.monotonic()
+        for arrived, size, mime_index in meta["chunks"]:
+            self._wait_until(start, arrived)
+            yield os.pread(self.fd, size, offset), mimes[mime_index]
+            offset += size
+
+        error = meta.get("error")
+        if error:
+            self._wait_until(start, error["offset"])
+            raise GeminiAPIError(error["message"], status_code=error["status_code"])
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+    def __enter__(self) -> "CassettePlayer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
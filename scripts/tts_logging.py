@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Structured logging and the machine-readable result channel
+Library diagnostics go to the "gemini_tts" logger on stderr, as plain
+messages (GEMINI_TTS_LOG_FORMAT=text, the default) or one JSON object per
+line (json). GEMINI_TTS_LOG_LEVEL selects debug, info, warning, error or
+quiet; quiet silences everything, for batch workers.
+
+Fields bound with log_context() (job id, voice, clip index...) are added
+to every record logged inside the block, together with the pipeline
+trace id when one is set.
+
+Results are not logged: emit_result() appends one JSON line to
+GEMINI_TTS_RESULT_FILE, so wrappers read outcomes and output paths from
+there instead of scraping stdout.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+LOG_LEVEL_ENV = "GEMINI_TTS_LOG_LEVEL"
+LOG_FORMAT_ENV = "GEMINI_TTS_LOG_FORMAT"
+RESULT_FILE_ENV = "GEMINI_TTS_RESULT_FILE"
+
+ROOT_LOGGER = "gemini_tts"
+LOG_FORMATS = ("text", "json")
+LOG_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "quiet": logging.CRITICAL + 10,
+}
+
+_context: contextvars.ContextVar = contextvars.ContextVar("gemini_tts_log_context", default={})
+_handler: Optional[logging.Handler] = None
+
+# LogRecord attributes that are not user fields
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the gemini_tts namespace, configured from the environment on first use"""
+    if _handler is None:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[Dict[str, Any]]:
+    """Add fields to every record logged inside the block"""
+    merged = {**_context.get(), **fields}
+    token = _context.set(merged)
+    try:
+        yield merged
+    finally:
+        _context.reset(token)
+
+
+def context_fields() -> Dict[str, Any]:
+    fields = dict(_context.get())
+    trace_id = os.getenv("PODCAST_TRACE_ID")
+    if trace_id:
+        fields.setdefault("trace_id", trace_id)
+    return fields
+
+
+class _ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in context_fields().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg and any extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None,
+                      stream: Optional[TextIO] = None) -> logging.Logger:
+    """(Re)configure the gemini_tts logger; arguments override the environment"""
+    global _handler
+    level = (level or os.getenv(LOG_LEVEL_ENV) or "info").lower()
+    fmt = (fmt or os.getenv(LOG_FORMAT_ENV) or "text").lower()
+    if level not in LOG_LEVELS:
+        raise ValueError(f"Unknown log level: {level} (expected one of {', '.join(LOG_LEVELS)})")
+    if fmt not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format: {fmt} (expected one of {', '.join(LOG_FORMATS)})")
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    if _handler is not None:
+        logger.removeHandler(_handler)
+
+    _handler = logging.StreamHandler(stream or sys.stderr)
+    _handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter("%(message)s"))
+    _handler.addFilter(_ContextFilter())
+    logger.addHandler(_handler)
+    logger.setLevel(LOG_LEVELS[level])
+    logger.propagate = False
+    return logger
+
+
+def is_quiet() -> bool:
+    return logging.getLogger(ROOT_LOGGER).level > logging.CRITICAL
+
+
+def emit_result(status: str, path: Optional[str] = None, **fields: Any) -> Optional[Dict[str, Any]]:
+    """Append a result record to the result file; no-op when none is configured"""
+    path = path or os.getenv(RESULT_FILE_ENV)
+    if not path:
+        return None
+
+    record = {"ts": round(time.time(), 3), "status": status, **context_fields(), **fields}
+    line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+    return record
+
+
+def read_results(path: str) -> list:
+    """Every result record in a result file"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Print one field of the last result: tts_logging.py RESULT_FILE FIELD"""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("Usage: tts_logging.py RESULT_FILE FIELD", file=sys.stderr)
+        return 2
+    try:
+        results = read_results(argv[0])
+    except (OSError, ValueError):
+        return 1
+    if not results or results[-1].get(argv[1]) is None:
+        return 1
+    print(results[-1][argv[1]])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Prometheus metrics for Gemini TTS
+A small dependency-free registry rendering the text exposition format,
+served on localhost (GEMINI_TTS_METRICS_PORT) or merged into a
+node_exporter textfile-collector file (GEMINI_TTS_METRICS_FILE).
+
+Textfile flushes add this process's increments to whatever the file
+already holds, under a lock, so short-lived workers such as the
+tts-manager.sh helper accumulate into one set of series. Requests only
+update memory; the file is rewritten on a timer and at exit.
+"""
+
+import atexit
+import fcntl
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from tts_timing import RequestTiming
+
+METRICS_PORT_ENV = "GEMINI_TTS_METRICS_PORT"
+METRICS_FILE_ENV = "GEMINI_TTS_METRICS_FILE"
+METRICS_FLUSH_ENV = "GEMINI_TTS_METRICS_FLUSH_SECONDS"
+
+# Seconds between textfile flushes; node_exporter rereads the file on each scrape
+DEFAULT_FLUSH_SECONDS = 15.0
+
+# Seconds; covers single sentences through long multi-speaker episodes
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+TTFC_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+SampleKey = Tuple[str, Labels]
+
+_SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+_LABEL_RE = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+class MetricFamily(NamedTuple):
+    name: str
+    kind: str
+    help: str
+    buckets: Tuple[float, ...] = ()
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_le(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def _format_value(value: float) -> str:
+    # Full precision: textfile flushes read these values back and add to them
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def parse_samples(text: str) -> Dict[SampleKey, float]:
+    """Read samples back from exposition text, ignoring comments"""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+        match = _SAMPLE_RE.match(line.strip())
+        if not match:
+            continue
+        name, raw_labels, value = match.groups()
+        labels = tuple(sorted(
+            (key, val.replace('\\"', '"').replace("\\n", "\n").replace("\\\\", "\\"))
+            for key, val in _LABEL_RE.findall(raw_labels or "")
+        ))
+        samples[(name, labels)] = float(value)
+    return samples
+
+
+class MetricsRegistry:
+    """Counters, gauges and cumulative histograms keyed by label set"""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.families: Dict[str, MetricFamily] = {}
+        self.values: Dict[SampleKey, float] = {}
+        self._flushed: Dict[SampleKey, float] = {}
+        self._flush_lock = threading.Lock()
+
+    def counter(self, name: str, help: str) -> None:
+        self.families[name] = MetricFamily(name, "counter", help)
+
+    def gauge(self, name: str, help: str) -> None:
+        self.families[name] = MetricFamily(name, "gauge", help)
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float]) -> None:
+        self.families[name] = MetricFamily(name, "histogram", help,
+                                           tuple(sorted(buckets)) + (float("inf"),))
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        key = (name, _labels(labels))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        with self.lock:
+            self.values[(name, _labels(labels))] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        family = self.families[name]
+        base = _labels(labels)
+        with self.lock:
+            for bound in family.buckets:
+                if value <= bound:
+                    key = (f"{name}_bucket", tuple(sorted(base + (("le", _format_le(bound)),))))
+                    self.values[key] = self.values.get(key, 0.0) + 1
+            for suffix, amount in (("_sum", value), ("_count", 1.0)):
+                key = (name + suffix, base)
+                self.values[key] = self.values.get(key, 0.0) + amount
+
+    def _family_of(self, sample_name: str) -> Optional[MetricFamily]:
+        if sample_name in self.families:
+            return self.families[sample_name]
+        for suffix in ("_bucket", "_sum", "_count"):
+            if sample_name.endswith(suffix):
+                family = self.families.get(sample_name[:-len(suffix)])
+                if family is not None and family.kind == "histogram":
+                    return family
+        return None
+
+    def render(self, values: Optional[Dict[SampleKey, float]] = None) -> str:
+        """Text exposition format of the given (default: current) values"""
+        if values is None:
+            with self.lock:
+                values = dict(self.values)
+
+        grouped: Dict[str, List[Tuple[SampleKey, float]]] = {name: [] for name in self.families}
+        for key, value in values.items():
+            family = self._family_of(key[0])
+            if family is not None:
+                grouped[family.name].append((key, value))
+
+        lines = []
+        for name, family in self.families.items():
+            lines.append(f"# HELP {name} {family.help}")
+            lines.append(f"# TYPE {name} {family.kind}")
+            for (sample_name, labels), value in sorted(grouped[name], key=_sort_key):
+                rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{sample_name}{{{rendered}}} {_format_value(value)}" if rendered
+                             else f"{sample_name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def flush_textfile(self, path: str) -> None:
+        """Add increments since the last flush to the textfile, atomically"""
+        with self._flush_lock:
+            self._flush_textfile(path)
+
+    def _flush_textfile(self, path: str) -> None:
+        with self.lock:
+            current = dict(self.values)
+
+        delta = {}
+        for key, value in current.items():
+            family = self._family_of(key[0])
+            if family is None or family.kind == "gauge":
+                continue
+            change = value - self._flushed.get(key, 0.0)
+            if change:
+                delta[key] = change
+
+        with open(path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            merged: Dict[SampleKey, float] = {}
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    merged = parse_samples(f.read())
+            for key, change in delta.items():
+                merged[key] = merged.get(key, 0.0) + change
+            # Gauges describe this process only
+            for key, value in current.items():
+                family = self._family_of(key[0])
+                if family is not None and family.kind == "gauge":
+                    merged[key] = value
+
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.render(merged))
+            os.replace(tmp_path, path)
+
+        self._flushed = current
+
+
+def _sort_key(item: Tuple[SampleKey, float]):
+    (name, labels), _ = item
+    le = dict(labels).get("le")
+    return (name, tuple(pair for pair in labels if pair[0] != "le"),
+            float(le) if le is not None else 0.0)
+
+
+class TTSMetrics:
+    """The metric set fed by GeminiTTS and the retry wrappers"""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None,
+                 textfile: Optional[str] = None):
+        self.registry = registry or MetricsRegistry()
+        self.textfile = textfile
+        r = self.registry
+        r.counter("gemini_tts_requests_total", "Speech requests sent to the API")
+        r.counter("gemini_tts_errors_total", "Failed speech requests by error class")
+        r.counter("gemini_tts_retries_total", "Retries issued by retry wrappers")
+        r.counter("gemini_tts_cache_hits_total", "Lookups served from a local cache")
+        r.counter("gemini_tts_cache_misses_total", "Lookups that missed a local cache")
+        r.counter("gemini_tts_audio_bytes_total", "PCM bytes received")
+        r.counter("gemini_tts_audio_seconds_total", "Seconds of audio received")
+        r.gauge("gemini_tts_in_flight_requests", "Speech requests currently streaming")
+        r.histogram("gemini_tts_request_duration_seconds", "Wall time of speech requests",
+                    LATENCY_BUCKETS)
+        r.histogram("gemini_tts_time_to_first_chunk_seconds", "Time to the first audio chunk",
+                    TTFC_BUCKETS)
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._stop_flushing = threading.Event()
+        r.set("gemini_tts_in_flight_requests", 0)
+
+    def request_started(self) -> None:
+        with self._in_flight_lock:
+            self._in_flight += 1
+            self.registry.set("gemini_tts_in_flight_requests", self._in_flight)
+
+    def request_finished(self) -> None:
+        with self._in_flight_lock:
+            self._in_flight -= 1
+            self.registry.set("gemini_tts_in_flight_requests", self._in_flight)
+
+    def __call__(self, timing: RequestTiming) -> None:
+        """Timing hook: record a finished request"""
+        r = self.registry
+        r.inc("gemini_tts_requests_total", backend=timing.backend, model=timing.model)
+        if timing.error:
+            r.inc("gemini_tts_errors_total", backend=timing.backend, error=timing.error)
+        else:
+            r.inc("gemini_tts_audio_bytes_total", timing.bytes, backend=timing.backend)
+            r.inc("gemini_tts_audio_seconds_total", timing.audio_seconds, backend=timing.backend)
+            r.observe("gemini_tts_request_duration_seconds", timing.total_seconds,
+                      backend=timing.backend)
+            if timing.ttfc_seconds is not None:
+                r.observe("gemini_tts_time_to_first_chunk_seconds", timing.ttfc_seconds,
+                          backend=timing.backend)
+
+    def retry(self, source: str) -> None:
+        self.registry.inc("gemini_tts_retries_total", source=source)
+
+    def cache_lookup(self, cache: str, hit: bool) -> None:
+        name = "gemini_tts_cache_hits_total" if hit else "gemini_tts_cache_misses_total"
+        self.registry.inc(name, cache=cache)
+
+    def flush(self) -> None:
+        if self.textfile:
+            self.registry.flush_textfile(self.textfile)
+
+    def flush_periodically(self, interval: float = DEFAULT_FLUSH_SECONDS) -> threading.Thread:
+        """Flush the textfile every interval seconds on a daemon thread until close()"""
+        def run() -> None:
+            while not self._stop_flushing.wait(interval):
+                self.flush()
+
+        thread = threading.Thread(target=run, name="tts-metrics-flush", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self) -> None:
+        """Stop periodic flushing and write what is left"""
+        self._stop_flushing.set()
+        self.flush()
+
+    def render(self) -> str:
+        return self.registry.render()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    metrics: TTSMetrics
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_metrics(metrics: TTSMetrics, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve /metrics on a daemon thread"""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"metrics": metrics})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+_default: Optional[TTSMetrics] = None
+_default_lock = threading.Lock()
+
+
+def default_metrics() -> Optional[TTSMetrics]:
+    """Process-wide metrics configured from the environment, or None
+
+    Started on first use: the HTTP endpoint when GEMINI_TTS_METRICS_PORT
+    is set, textfile flushing (every GEMINI_TTS_METRICS_FLUSH_SECONDS and
+    at exit) when GEMINI_TTS_METRICS_FILE is set.
+    """
+    global _default
+    port = os.getenv(METRICS_PORT_ENV)
+    textfile = os.getenv(METRICS_FILE_ENV)
+    if not port and not textfile:
+        return None
+
+    with _default_lock:
+        if _default is None:
+            _default = TTSMetrics(textfile=textfile or None)
+            if port:
+                serve_metrics(_default, int(port))
+            if textfile:
+                interval = float(os.getenv(METRICS_FLUSH_ENV) or DEFAULT_FLUSH_SECONDS)
+                _default.flush_periodically(interval)
+                atexit.register(_default.close)
+        return _default
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Per-request timing for TTS streams
+GeminiTTS hands a StreamTimer to each request only when timing hooks are
+registered, so the disabled path costs a single None check. Finished
+requests are reported as RequestTiming records to every hook: plain
+callbacks, the log line writer or a TimingStats sink.
+"""
+
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from tts_logging import get_logger
+
+TimingHook = Callable[["RequestTiming"], None]
+
+logger = get_logger("timing")
+
+
+class RequestTiming(NamedTuple):
+    """Timings of one streamed request, in seconds from the start of the call
+
+    real_time_factor is wall time over audio duration: below 1.0 the
+    request produced audio faster than it plays.
+    """
+    model: str
+    backend: str
+    chars: int
+    build_seconds: Optional[float]
+    ttfc_seconds: Optional[float]
+    total_seconds: float
+    chunks: int
+    gaps: Tuple[float, ...]
+    bytes: int
+    audio_seconds: float
+    error: Optional[str] = None
+
+    @property
+    def max_gap_seconds(self) -> float:
+        return max(self.gaps, default=0.0)
+
+    @property
+    def real_time_factor(self) -> Optional[float]:
+        return self.total_seconds / self.audio_seconds if self.audio_seconds else None
+
+
+class StreamTimer:
+    """Mutable timestamps collected while a request streams"""
+
+    __slots__ = ("start", "built", "first", "last", "gaps", "nbytes", "chunks", "mime_type")
+
+    def __init__(self) -> None:
+        self.start = perf_counter()
+        self.built: Optional[float] = None
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+        self.gaps: List[float] = []
+        self.nbytes = 0
+        self.chunks = 0
+        self.mime_type: Optional[str] = None
+
+    def restart(self) -> None:
+        self.start = perf_counter()
+
+    def mark_built(self) -> None:
+        """Called once the request payload is ready to send"""
+        self.built = perf_counter()
+
+    def wrap(self, chunks: Iterable[Tuple[bytes, Optional[str]]]) -> Iterator[Tuple[bytes, Optional[str]]]:
+        """Pass chunks through, stamping each arrival"""
+        for data, mime_type in chunks:
+            now = perf_counter()
+            if self.first is None:
+                self.first = now
+                self.mime_type = mime_type
+            else:
+                self.gaps.append(now - self.last)
+            self.last = now
+            self.nbytes += len(data)
+            self.chunks += 1
+            yield data, mime_type
+
+    def result(self, model: str, backend: str, chars: int, bytes_per_second: int,
+               error: Optional[str] = None) -> RequestTiming:
+        end = perf_counter()
+        return RequestTiming(
+            model=model,
+            backend=backend,
+            chars=chars,
+            build_seconds=None if self.built is None else self.built - self.start,
+            ttfc_seconds=None if self.first is None else self.first - self.start,
+            total_seconds=end - self.start,
+            chunks=self.chunks,
+            gaps=tuple(self.gaps),
+            bytes=self.nbytes,
+            audio_seconds=self.nbytes / bytes_per_second if bytes_per_second else 0.0,
+            error=error,
+        )
+
+
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 1000:.1f}"
+
+
+def timing_log_line(timing: RequestTiming) -> str:
+    """One key=value line per request"""
+    rtf = timing.real_time_factor
+    fields = [
+        f"model={timing.model}",
+        f"backend={timing.backend}",
+        f"chars={timing.chars}",
+        f"build_ms={_ms(timing.build_seconds)}",
+        f"ttfc_ms={_ms(timing.ttfc_seconds)}",
+        f"max_gap_ms={_ms(timing.max_gap_seconds)}",
+        f"total_ms={_ms(timing.total_seconds)}",
+        f"chunks={timing.chunks}",
+        f"bytes={timing.bytes}",
+        f"audio_s={timing.audio_seconds:.2f}",
+        f"rtf={'-' if rtf is None else f'{rtf:.3f}'}",
+    ]
+    if timing.error:
+        fields.append(f"error={timing.error}")
+    return "tts_timing " + " ".join(fields)
+
+
+def timing_fields(timing: RequestTiming) -> Dict[str, object]:
+    """Structured log fields of one request; gaps are summarized as the largest"""
+    fields = timing._asdict()
+    del fields["gaps"]
+    fields["max_gap_seconds"] = timing.max_gap_seconds
+    fields["real_time_factor"] = timing.real_time_factor
+    return fields
+
+
+def log_timing(timing: RequestTiming) -> None:
+    """Timing hook logging one line per request (stderr unless quiet)"""
+    logger.info(timing_log_line(timing), extra=timing_fields(timing))
+
+
+class TimingStats:
+    """Timing hook aggregating requests for later reporting"""
+
+    def __init__(self) -> None:
+        self.timings: List[RequestTiming] = []
+
+    def __call__(self, timing: RequestTiming) -> None:
+        self.timings.append(timing)
+
+    def summary(self) -> Dict[str, float]:
+        done = [t for t in self.timings if t.error is None]
+        audio = sum(t.audio_seconds for t in done)
+        wall = sum(t.total_seconds for t in done)
+        ttfcs = [t.ttfc_seconds for t in done if t.ttfc_seconds is not None]
+        return {
+            "requests": len(self.timings),
+            "errors": len(self.timings) - len(done),
+            "bytes": sum(t.bytes for t in done),
+            "audio_seconds": audio,
+            "mean_ttfc_seconds": sum(ttfcs) / len(ttfcs) if ttfcs else 0.0,
+            "max_gap_seconds": max((t.max_gap_seconds for t in done), default=0.0),
+            "real_time_factor": wall / audio if audio else 0.0,
+        }
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped WAV reader/writer for large episode files
+Uses the same 44-byte PCM header layout as GeminiTTS._convert_to_wav
+"""
+
+import errno
+import mmap
+import os
+import struct
+from typing import BinaryIO, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # Only needed for sample views
+    np = None
+
+WAV_HEADER_FORMAT = "<4sI4s4sIHHIIHH4sI"
+WAV_HEADER_SIZE = struct.calcsize(WAV_HEADER_FORMAT)
+
+# RIFF sizes are unsigned 32-bit
+MAX_RIFF_SIZE = 0xFFFFFFFF
+
+# Buffer size for the fallback copy path
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Errors meaning "this kernel copy primitive can't handle these files"
+_KERNEL_COPY_UNSUPPORTED = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+    errno.EBADF, errno.ENOTSOCK, errno.EPERM,
+}
+
+PathLike = Union[str, os.PathLike]
+
+
+class WavInfo(NamedTuple):
+    """Format and data chunk location read from a WAV header"""
+    sample_rate: int
+    bits_per_sample: int
+    num_channels: int
+    data_offset: int
+    data_size: int
+
+    @property
+    def block_align(self) -> int:
+        return self.num_channels * (self.bits_per_sample // 8)
+
+    @property
+    def byte_rate(self) -> int:
+        return self.sample_rate * self.block_align
+
+    @property
+    def num_frames(self) -> int:
+        return self.data_size // self.block_align if self.block_align else 0
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds, computed from the header alone"""
+        return self.data_size / self.byte_rate if self.byte_rate else 0.0
+
+
+def build_wav_header(data_size: int,
+                     sample_rate: int = 24000,
+                     bits_per_sample: int = 16,
+                     num_channels: int = 1) -> bytes:
+    """Build a canonical 44-byte PCM WAV header"""
+    if data_size + 36 > MAX_RIFF_SIZE:
+        raise ValueError(f"WAV data too large for a RIFF header: {data_size} bytes")
+
+    bytes_per_sample = bits_per_sample // 8
+    block_align = num_channels * bytes_per_sample
+    byte_rate = sample_rate * block_align
+
+    return struct.pack(
+        WAV_HEADER_FORMAT,
+        b"RIFF",          # ChunkID
+        36 + data_size,   # ChunkSize
+        b"WAVE",          # Format
+        b"fmt ",          # Subchunk1ID
+        16,               # Subchunk1Size
+        1,                # AudioFormat (PCM)
+        num_channels,     # NumChannels
+        sample_rate,      # SampleRate
+        byte_rate,        # ByteRate
+        block_align,      # BlockAlign
+        bits_per_sample,  # BitsPerSample
+        b"data",          # Subchunk2ID
+        data_size         # Subchunk2Size
+    )
+
+
+def _read_wav_info(f: BinaryIO, file_size: int) -> WavInfo:
+    """Walk RIFF chunks up to the data chunk without reading audio"""
+    riff = f.read(12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+        raise ValueError("Not a RIFF/WAVE file")
+
+    fmt = None
+    while True:
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            raise ValueError("WAV file has no data chunk")
+
+        chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+        chunk_start = f.tell()
+
+        if chunk_id == b"fmt ":
+            audio_format, num_channels, sample_rate, _, _, bits_per_sample = struct.unpack(
+                "<HHIIHH", f.read(16)
+            )
+            # WAVE_FORMAT_EXTENSIBLE still carries plain PCM for our purposes
+            if audio_format not in (1, 0xFFFE):
+                raise ValueError(f"Unsupported WAV audio format: {audio_format}")
+            fmt = (sample_rate, bits_per_sample, num_channels)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAV data chunk precedes fmt chunk")
+            # Streaming writers leave the size unset (0 or 0xFFFFFFFF); trust the file instead
+            data_size = file_size - chunk_start
+            if 0 < chunk_size < data_size:
+                data_size = chunk_size
+            return WavInfo(fmt[0], fmt[1], fmt[2], chunk_start, data_size)
+
+        # Chunks are word aligned
+        f.seek(chunk_start + chunk_size + (chunk_size & 1))
+
+
+def read_wav_info(path: PathLike) -> WavInfo:
+    """Report format, data location and duration from the header alone"""
+    with open(path, "rb") as f:
+        return _read_wav_info(f, os.fstat(f.fileno()).st_size)
+
+
+def _sample_dtype(bits_per_sample: int):
+    """NumPy dtype for little-endian PCM samples"""
+    if np is None:
+        raise RuntimeError("numpy is required for sample views: pip install numpy")
+
+    dtypes = {8: np.uint8, 16: np.dtype("<i2"), 32: np.dtype("<i4")}
+    if bits_per_sample not in dtypes:
+        raise ValueError(f"No sample view for {bits_per_sample}-bit PCM")
+    return dtypes[bits_per_sample]
+
+
+class MappedWav:
+    """WAV file mapped into memory with zero-copy access to its data chunk
+
+    Views returned by data and samples borrow the mapping; release them
+    before calling append() or close().
+    """
+
+    def __init__(self, path: PathLike, writable: bool = False):
+        self.path = os.fspath(path)
+        self.writable = writable
+        self._file = open(self.path, "r+b" if writable else "rb")
+        self._mmap: Optional[mmap.mmap] = None
+        self.info: WavInfo
+        self._map()
+
+    @classmethod
+    def create(cls,
+               path: PathLike,
+               sample_rate: int = 24000,
+               bits_per_sample: int = 16,
+               num_channels: int = 1) -> "MappedWav":
+        """Create an empty WAV file ready for appending"""
+        with open(path, "wb") as f:
+            f.write(build_wav_header(0, sample_rate, bits_per_sample, num_channels))
+        return cls(path, writable=True)
+
+    def _map(self) -> None:
+        file_size = os.fstat(self._file.fileno()).st_size
+        self._file.seek(0)
+        self.info = _read_wav_info(self._file, file_size)
+        access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=access)
+
+    def _unmap(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    @property
+    def duration(self) -> float:
+        return self.info.duration
+
+    @property
+    def data(self) -> memoryview:
+        """The data chunk as a memoryview over the mapping"""
+        start = self.info.data_offset
+        return memoryview(self._mmap)[start:start + self.info.data_size]
+
+    @property
+    def samples(self):
+        """The data chunk as a NumPy array view, shaped (frames, channels) for multi-channel audio"""
+        info = self.info
+        dtype = _sample_dtype(info.bits_per_sample)
+        count = info.num_frames * info.num_channels
+        view = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=info.data_offset)
+        if info.num_channels > 1:
+            view = view.reshape(-1, info.num_channels)
+        return view
+
+    def patch_header(self, data_size: Optional[int] = None) -> None:
+        """Rewrite the RIFF and data chunk sizes in place"""
+        if not self.writable:
+            raise PermissionError("WAV file was opened read-only")
+
+        data_size = self.info.data_size if data_size is None else data_size
+        riff_size = self.info.data_offset - 8 + data_size
+        if riff_size > MAX_RIFF_SIZE:
+            raise ValueError(f"WAV data too large for a RIFF header: {data_size} bytes")
+
+        self._mmap[4:8] = struct.pack("<I", riff_size)
+        self._mmap[self.info.data_offset - 4:self.info.data_offset] = struct.pack("<I", data_size)
+        self.info = self.info._replace(data_size=data_size)
+
+    def append(self, pcm: Union[bytes, bytearray, memoryview]) -> None:
+        """Append PCM frames to the data chunk and patch the header"""
+        if not self.writable:
+            raise PermissionError("WAV file was opened read-only")
+
+        info = self.info
+        if len(pcm) % info.block_align:
+            raise ValueError("Appended PCM is not a whole number of frames")
+
+        end_of_data = info.data_offset + info.data_size
+        if end_of_data != os.fstat(self._file.fileno()).st_size:
+            raise ValueError("Cannot append: data chunk is not the last chunk in the file")
+
+        new_size = info.data_size + len(pcm)
+        if info.data_offset - 8 + new_size > MAX_RIFF_SIZE:
+            raise ValueError(f"WAV data too large for a RIFF header: {new_size} bytes")
+
+        self._unmap()
+        self._file.seek(end_of_data)
+        self._file.write(pcm)
+        self._file.flush()
+        self._map()
+        self.patch_header(new_size)
+
+    def flush(self) -> None:
+        if self._mmap is not None and self.writable:
+            self._mmap.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._unmap()
+        self._file.close()
+
+    def __enter__(self) -> "MappedWav":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# Each copier returns (bytes copied, error that stopped it or None), so a
+# method that fails partway still reports how far it got
+
+def _copy_file_range(src_fd: int, dst_fd: int, offset: int, count: int) -> Tuple[int, Optional[OSError]]:
+    """Copy via copy_file_range"""
+    copied = 0
+    try:
+        while copied < count:
+            n = os.copy_file_range(src_fd, dst_fd, count - copied, offset + copied)
+            if n == 0:
+                break
+            copied += n
+    except OSError as e:
+        return copied, e
+    return copied, None
+
+
+def _sendfile(src_fd: int, dst_fd: int, offset: int, count: int) -> Tuple[int, Optional[OSError]]:
+    """Copy via sendfile"""
+    copied = 0
+    try:
+        while copied < count:
+            n = os.sendfile(dst_fd, src_fd, offset + copied, count - copied)
+            if n == 0:
+                break
+            copied += n
+    except OSError as e:
+        return copied, e
+    return copied, None
+
+
+def _buffered_copy(src_fd: int, dst_fd: int, offset: int, count: int) -> Tuple[int, Optional[OSError]]:
+    """Copy through a userspace buffer"""
+    copied = 0
+    while copied < count:
+        block = os.pread(src_fd, min(COPY_BUFFER_SIZE, count - copied), offset + copied)
+        if not block:
+            break
+        view = memoryview(block)
+        while view:
+            view = view[os.write(dst_fd, view):]
+        copied += len(block)
+    return copied, None
+
+
+COPY_METHODS = {
+    "copy_file_range": _copy_file_range,
+    "sendfile": _sendfile,
+    "buffered": _buffered_copy,
+}
+
+
+def _available_copy_methods() -> List[str]:
+    methods = []
+    if hasattr(os, "copy_file_range"):
+        methods.append("copy_file_range")
+    if hasattr(os, "sendfile"):
+        methods.append("sendfile")
+    methods.append("buffered")
+    return methods
+
+
+def copy_range(src_fd: int, dst_fd: int, offset: int, count: int,
+               method: Optional[str] = None) -> str:
+    """Copy count bytes from src_fd at offset to the current position of dst_fd
+
+    Tries copy_file_range, then sendfile, then a buffered copy, picking up
+    where the previous method stopped. Returns the name of the method that
+    finished the copy.
+    """
+    methods = [method] if method else _available_copy_methods()
+    if method and method not in COPY_METHODS:
+        raise ValueError(f"Unknown copy method: {method}")
+
+    for name in methods:
+        copied, error = COPY_METHODS[name](src_fd, dst_fd, offset, count)
+        offset += copied
+        count -= copied
+        if error is not None:
+            if method or error.errno not in _KERNEL_COPY_UNSUPPORTED:
+                raise error
+            # dst_fd has advanced by what was copied, so the next method
+            # continues from there
+            continue
+        if count == 0:
+            return name
+
+    raise IOError(f"Short copy: {count} bytes could not be read from source")
+
+
+def concat_wav(segment_paths: Sequence[PathLike],
+               output_path: PathLike,
+               method: Optional[str] = None) -> WavInfo:
+    """Join same-format WAV segments into one file
+
+    Headers are validated up front and a single combined header is written;
+    each segment's data chunk is then copied kernel-side where the platform
+    allows, so audio bytes never pass through Python.
+    """
+    if not segment_paths:
+        raise ValueError("No WAV segments to concatenate")
+
+    infos = [read_wav_info(path) for path in segment_paths]
+    first = infos[0]
+    expected = (first.sample_rate, first.bits_per_sample, first.num_channels)
+    for path, info in zip(segment_paths, infos):
+        found = (info.sample_rate, info.bits_per_sample, info.num_channels)
+        if found != expected:
+            raise ValueError(
+                f"Segment {os.fspath(path)} has format {found}, expected {expected} "
+                "(sample_rate, bits_per_sample, num_channels)"
+            )
+
+    total_size = sum(info.data_size for info in infos)
+    header = build_wav_header(total_size, *expected)
+
+    with open(output_path, "wb", buffering=0) as out:
+        out.write(header)
+        out_fd = out.fileno()
+        for path, info in zip(segment_paths, infos):
+            with open(path, "rb", buffering=0) as src:
+                copy_range(src.fileno(), out_fd, info.data_offset, info.data_size, method)
+
+    return read_wav_info(output_path)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for chunk handling, WAV conversion and REST decoding
+
+Run with: pytest tests/benchmarks --benchmark-only
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+from micro_bench import CASES, EPISODES, chunk_count
+
+PARAMS = [
+    pytest.param(case, episode, id=f"{case.name}[{episode}]" if case.per_episode else case.name)
+    for case in CASES
+    for episode in (EPISODES if case.per_episode else ["1min"])
+]
+
+
+@pytest.mark.parametrize("case,episode", PARAMS)
+def test_micro_benchmark(benchmark, case, episode):
+    """Time one hot-path operation at a realistic episode size"""
+    # Given
+    fn, nbytes = case.setup(chunk_count(episode))
+    benchmark.extra_info["audio_bytes"] = nbytes
+    benchmark.group = case.name
+
+    # When
+    result = benchmark(fn)
+
+    # Then
+    if case.name == "rest_base64_decode":
+        assert result == nbytes
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AudioBuffer
+"""
+
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+import audio_buffer
+from audio_buffer import AudioBuffer, parse_audio_mime_type, write_all
+from gemini_standin import GeminiStandIn, StandInConfig
+from gemini_tts import GeminiTTS, SpeechRequest
+from wav_io import build_wav_header, read_wav_info
+
+def ramp(frames: int) -> bytes:
+    """16-bit PCM whose frames are distinguishable"""
+    return b"".join((i % 30000).to_bytes(2, "little") for i in range(frames))
+
+
+class TestAudioBuffer:
+    """Test format metadata, slicing and appending"""
+
+    def test_format_from_mime_type(self):
+        """Test that the MIME type is parsed once into buffer attributes"""
+        # When
+        audio = AudioBuffer.from_mime("audio/L8;rate=16000", b"\x80" * 8000)
+
+        # Then
+        assert audio.format == (16000, 8, 1)
+        assert audio.duration == 0.5
+        assert audio.num_frames == 8000
+        assert parse_audio_mime_type("audio/wav") == (24000, 16)
+
+    def test_slice_by_time_shares_storage(self):
+        """Test that a time slice is a view, not a copy"""
+        # Given
+        pcm = bytearray(ramp(24000))
+        audio = AudioBuffer(pcm)
+
+        # When
+        part = audio.slice(0.25, 0.5)
+
+        # Then
+        assert part.num_frames == 6000 and part.duration == 0.25
+        assert bytes(part) == bytes(pcm[12000:24000])
+        pcm[12000:12002] = b"\xff\xff"
+        assert bytes(part.data[:2]) == b"\xff\xff"
+
+    def test_append_in_place(self):
+        """Test appending PCM, buffers and silence to the same storage"""
+        # Given
+        audio = AudioBuffer(sample_rate=8000)
+        storage = audio.pcm
+
+        # When
+        audio.append(b"\x01\x00" * 4000)
+        audio.append_silence(0.25)
+        audio.append(AudioBuffer(b"\x02\x00" * 10, sample_rate=8000))
+
+        # Then
+        assert audio.pcm is storage
+        assert audio.duration == pytest.approx(0.75 + 10 / 8000)
+        assert bytes(audio.slice(0.5, 0.75)) == bytes(4000)
+
+    def test_borrowed_pcm_copied_on_first_append(self):
+        """Test that read-only input is left untouched by append"""
+        # Given
+        source = b"\x01\x00" * 4
+        audio = AudioBuffer(source)
+
+        # When
+        audio.append(b"\x02\x00")
+
+        # Then
+        assert source == b"\x01\x00" * 4
+        assert bytes(audio) == b"\x01\x00" * 4 + b"\x02\x00"
+
+    def test_append_rejects_other_formats(self):
+        """Test that buffers in another format cannot be mixed in"""
+        with pytest.raises(ValueError):
+            AudioBuffer().append(AudioBuffer(b"\x00\x00", sample_rate=16000))
+
+    def test_release_lets_parent_grow(self):
+        """Test that releasing a slice unblocks appends to its parent"""
+        # Given
+        audio = AudioBuffer(bytearray(4800))
+        part = audio.slice(0.0, 0.05)
+
+        # When / Then
+        with pytest.raises(BufferError):
+            audio.append(b"\x00\x00")
+        part.release()
+        audio.append(b"\x00\x00")
+        assert len(audio) == 4802
+
+
+class TestWavWriting:
+    """Test writev-based WAV output"""
+
+    def test_write_wav_uses_one_writev(self, tmp_path):
+        """Test that header and data go out in a single call without joining"""
+        # Given
+        pcm = ramp(4800)
+        audio = AudioBuffer(pcm).slice(0.05)
+        path = tmp_path / "out.wav"
+
+        # When
+        with patch.object(audio_buffer.os, "writev", wraps=os.writev) as writev:
+            audio.save_wav(path)
+
+        # Then
+        assert writev.call_count == 1
+        assert path.read_bytes() == build_wav_header(len(pcm) - 2400) + pcm[2400:]
+        assert read_wav_info(path).duration == pytest.approx(0.15)
+
+    def test_write_all_resumes_short_writes(self, tmp_path):
+        """Test that partial writev results are continued where they stopped"""
+        # Given
+        path = tmp_path / "short.bin"
+        real_writev = os.writev
+
+        def short_writev(fd, buffers):
+            return real_writev(fd, [bytes(buffers[0][:3])])
+
+        # When
+        with open(path, "wb", buffering=0) as f:
+            with patch.object(audio_buffer.os, "writev", side_effect=short_writev):
+                written = write_all(f.fileno(), [b"header", memoryview(b"pcm-data")])
+
+        # Then
+        assert written == 14
+        assert path.read_bytes() == b"headerpcm-data"
+
+
+class TestGeminiTTSAudioBuffer:
+    """Test AudioBuffer in GeminiTTS"""
+
+    def test_synthesize_returns_buffer_in_response_format(self):
+        """Test that synthesized audio carries the format from the response"""
+        # Given
+        with GeminiStandIn(StandInConfig(ttfc_seconds=0.0, bytes_per_second=1e9)) as server:
+            tts = GeminiTTS(api_key="test-key", backend="rest")
+            tts.api.base_url = server.url
+
+            # When
+            audio, mime_type = tts._synthesize("Hello there", SpeechRequest(voice_name="Puck"))
+
+        # Then
+        assert isinstance(audio, AudioBuffer)
+        assert audio.format == (24000, 16, 1) and audio.duration > 0
+        assert "rate=24000" in mime_type
+
+    def test_save_trims_by_slicing(self, tmp_path):
+        """Test that saving a buffer with trimming writes only the voiced part"""
+        # Given
+        tts = GeminiTTS(api_key="test-key", backend="rest", trim_silence=True)
+        audio = AudioBuffer(bytearray(24000) + b"\x00\x40" * 12000 + bytearray(24000))
+
+        # When
+        saved = tts.save_audio_file(str(tmp_path / "clip"), audio)
+
+        # Then
+        info = read_wav_info(saved)
+        assert saved.endswith(".wav")
+        assert info.duration == pytest.approx(0.6, abs=0.03)
+        assert len(audio) == 72000
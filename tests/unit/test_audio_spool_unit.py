@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the spill-to-disk audio spool and the memory benchmark
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+from audio_spool import AudioSpool
+from gemini_api import BASE_URL_ENV
+from gemini_standin import GeminiStandIn, StandInConfig
+from gemini_tts import GeminiTTS
+from mem_bench import episode_script, measure_episode
+
+FAST = StandInConfig(ttfc_seconds=0.0, bytes_per_second=1e9)
+
+
+class TestAudioSpool:
+    """Test buffering, spilling and copying out"""
+
+    def test_stays_in_memory_below_threshold(self, tmp_path):
+        """Test that small audio never touches the disk"""
+        # Given
+        spool = AudioSpool(threshold=100, directory=str(tmp_path))
+
+        # When
+        spool.write(b"a" * 60)
+        spool.write(b"b" * 40)
+
+        # Then
+        assert not spool.spilled and len(spool) == 100
+        assert list(tmp_path.iterdir()) == []
+        spool.close()
+
+    def test_spills_past_threshold(self, tmp_path):
+        """Test that crossing the threshold moves everything to a temp file"""
+        # Given
+        spool = AudioSpool(threshold=100, directory=str(tmp_path))
+
+        # When
+        spool.write(b"a" * 80)
+        spool.write(b"b" * 40)
+        spool.write(b"c" * 10)
+
+        # Then
+        assert spool.spilled and len(spool) == 130
+        assert Path(spool.path).parent == tmp_path
+        view = spool.view()
+        assert bytes(view) == b"a" * 80 + b"b" * 40 + b"c" * 10
+        view.release()
+        spool.close()
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.parametrize("threshold", [None, 16])
+    def test_copy_range_to_file(self, tmp_path, threshold):
+        """Test copying a byte range out of memory and out of the temp file"""
+        # Given
+        data = bytes(range(256)) * 4
+        target = tmp_path / "out.bin"
+
+        # When
+        with AudioSpool(threshold=threshold, directory=str(tmp_path)) as spool:
+            spool.write(data)
+            with open(target, "wb", buffering=0) as f:
+                f.write(b"HDR")
+                spool.copy_to(f.fileno(), 100, 500)
+
+        # Then
+        assert target.read_bytes() == b"HDR" + data[100:600]
+
+    def test_write_after_view(self, tmp_path):
+        """Test that writing again after mapping the file is seen by the next view"""
+        # Given
+        spool = AudioSpool(threshold=4, directory=str(tmp_path))
+        spool.write(b"12345678")
+        spool.view().release()
+
+        # When
+        spool.write(b"9")
+
+        # Then
+        view = spool.view()
+        assert bytes(view) == b"123456789"
+        view.release()
+        spool.close()
+
+
+class TestGeminiTTSSpill:
+    """Test that spilling does not change the saved audio"""
+
+    def render(self, server, tmp_path, name, spill_mb, trim=False):
+        tts = GeminiTTS(api_key="test-key", backend="rest", local_pauses=True,
+                        trim_silence=trim, spill_mb=spill_mb)
+        tts.api.base_url = server.url
+        tts.spill_dir = str(tmp_path)
+        return Path(tts.generate_speech("Hello there. [pause] And welcome back... to the show.",
+                                        voice_name="Puck", output_file=str(tmp_path / name)))
+
+    def test_spilled_episode_matches_in_memory(self, tmp_path):
+        """Test that an episode written from a temp file is byte-identical"""
+        # Given
+        with GeminiStandIn(FAST) as server:
+
+            # When
+            in_memory = self.render(server, tmp_path, "memory", spill_mb=0)
+            spilled = self.render(server, tmp_path, "spilled", spill_mb=0.01)
+
+        # Then
+        assert spilled.read_bytes() == in_memory.read_bytes()
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["memory.wav", "spilled.wav"]
+
+    def test_spilled_episode_is_trimmed(self, tmp_path):
+        """Test that trimming applies to spilled audio as well"""
+        # Given
+        with GeminiStandIn(FAST) as server:
+
+            # When
+            in_memory = self.render(server, tmp_path, "memory", spill_mb=0, trim=True)
+            spilled = self.render(server, tmp_path, "spilled", spill_mb=0.01, trim=True)
+
+        # Then
+        assert spilled.read_bytes() == in_memory.read_bytes()
+
+    def test_threshold_from_environment(self, monkeypatch):
+        """Test GEMINI_TTS_SPILL_MB, where 0 disables spilling"""
+        monkeypatch.setenv("GEMINI_TTS_SPILL_MB", "2")
+        assert GeminiTTS(api_key="test-key", backend="rest").spill_threshold == 2 * 1024 * 1024
+        monkeypatch.setenv("GEMINI_TTS_SPILL_MB", "0")
+        assert GeminiTTS(api_key="test-key", backend="rest").spill_threshold is None
+
+
+class TestMemBench:
+    """Test the long-episode memory benchmark"""
+
+    def test_episode_script_turns(self):
+        """Test that episodes alternate speakers one minute at a time"""
+        # When
+        script = episode_script(5, chars_per_second=10.0)
+
+        # Then
+        turns = script.split(" [pause] ")
+        assert len(turns) == 5
+        assert turns[0].startswith("Host: ") and turns[1].startswith("Guest: ")
+
+    def test_measure_short_episode(self, monkeypatch):
+        """Test that a short episode reports its audio size and peaks"""
+        # Given
+        with GeminiStandIn(FAST) as server:
+            monkeypatch.setenv(BASE_URL_ENV, server.url)
+
+            # When
+            result = measure_episode(2, spill_mb=0.5, chars_per_second=FAST.chars_per_second)
+
+        # Then
+        assert result["audio_mb"] > 0.5
+        assert result["peak_rss_mb"] >= result["baseline_rss_mb"]
+        assert result["tracemalloc_peak_mb"] > 0
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pooled REST/SSE GeminiAPI client
+"""
+
+import base64
+import json
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+from gemini_api import (GeminiAPI, GeminiAPIError, iter_sse_data, speech_generation_config,
+                        speech_payload, speech_payload_template)
+from gemini_tts import GeminiTTS, SpeechRequest
+
+
+def sse_lines(*chunks):
+    """Encode response chunks as SSE lines the way iter_lines yields them"""
+    lines = []
+    for chunk in chunks:
+        lines.append(b"data: " + json.dumps(chunk).encode())
+        lines.append(b"")
+    return lines
+
+
+def audio_chunk(data: bytes, mime_type: str = "audio/L16;codec=pcm;rate=24000"):
+    return {"candidates": [{"content": {"parts": [
+        {"inlineData": {"mimeType": mime_type, "data": base64.b64encode(data).decode()}}
+    ]}}]}
+
+
+@pytest.fixture
+def api():
+    """Client whose session POST is mocked"""
+    client = GeminiAPI(api_key="test-key", model="tts-model")
+    client.session.post = Mock()
+    yield client
+    client.close()
+
+
+class TestSSEParsing:
+    """Test server-sent event framing"""
+
+    def test_events_split_on_blank_lines(self):
+        """Test multi-line data and comments"""
+        # Given
+        lines = [b": keep-alive", b"data: {\"a\":", b"data: 1}", b"", b"data: 2", b""]
+
+        # When
+        events = list(iter_sse_data(lines))
+
+        # Then
+        assert events == ['{"a":\n1}', "2"]
+
+    def test_trailing_event_without_blank_line(self):
+        """Test that a final unterminated event is flushed"""
+        assert list(iter_sse_data([b"data: last"])) == ["last"]
+
+
+class TestGeminiAPIClient:
+    """Test request formation and streaming"""
+
+    def test_session_is_pooled_with_api_key_header(self):
+        """Test keep-alive adapter sizing and auth header"""
+        # When
+        client = GeminiAPI(api_key="test-key", pool_size=4)
+
+        # Then
+        adapter = client.session.get_adapter("https://generativelanguage.googleapis.com")
+        assert adapter._pool_maxsize == 4
+        assert client.session.headers["x-goog-api-key"] == "test-key"
+        client.close()
+
+    def test_stream_speech_yields_decoded_pcm(self, api):
+        """Test incremental PCM chunks from the SSE stream"""
+        # Given
+        response = Mock(status_code=200)
+        response.iter_lines.return_value = sse_lines(audio_chunk(b"\x01\x02"), audio_chunk(b"\x03\x04"))
+        api.session.post.return_value = response
+
+        # When
+        chunks = list(api.stream_speech("Hello", voice_name="Puck", temperature=0.5))
+
+        # Then
+        assert chunks == [(b"\x01\x02", "audio/L16;codec=pcm;rate=24000"),
+                          (b"\x03\x04", "audio/L16;codec=pcm;rate=24000")]
+        args, kwargs = api.session.post.call_args
+        assert args[0].endswith("/models/tts-model:streamGenerateContent")
+        assert kwargs["params"] == {"alt": "sse"}
+        assert kwargs["stream"] is True
+        payload = json.loads(kwargs["data"])
+        assert payload["contents"][0]["parts"][0]["text"] == "Hello"
+        voice = payload["generationConfig"]["speechConfig"]["voiceConfig"]
+        assert voice["prebuiltVoiceConfig"]["voiceName"] == "Puck"
+        response.close.assert_called_once()
+
+    def test_http_error_raises_with_status(self, api):
+        """Test that 429s surface as GeminiAPIError with status_code"""
+        # Given
+        response = Mock(status_code=429, text="quota")
+        response.json.return_value = {"error": {"message": "Resource exhausted"}}
+        api.session.post.return_value = response
+
+        # When/Then
+        with pytest.raises(GeminiAPIError, match="Resource exhausted") as excinfo:
+            list(api.stream_speech("Hello"))
+        assert excinfo.value.status_code == 429
+
+    def test_multi_speaker_config(self):
+        """Test multi-speaker generationConfig structure"""
+        # When
+        config = speech_generation_config(speaker_voices=[("Host", "Zephyr"), ("Guest", "Puck")])
+
+        # Then
+        speakers = config["speechConfig"]["multiSpeakerVoiceConfig"]["speakerVoiceConfigs"]
+        assert [s["speaker"] for s in speakers] == ["Host", "Guest"]
+        assert config["responseModalities"] == ["AUDIO"]
+
+    def test_generate_text_joins_parts(self, api):
+        """Test non-streaming text generation"""
+        # Given
+        response = Mock(status_code=200)
+        response.json.return_value = {"candidates": [{"content": {"parts": [{"text": "Host: "}, {"text": "Hi"}]}}]}
+        api.session.post.return_value = response
+
+        # When/Then
+        assert api.generate_text("Write a script") == "Host: Hi"
+
+
+class TestRequestTemplates:
+    """Test request configs built once per voice setup"""
+
+    def test_payload_matches_serialized_request(self):
+        """Test that the template yields the same body as dumping the full request"""
+        # Given
+        text = 'She said "hi"\n\u00e9t\u00e9 \U0001F399'
+        speakers = [("Host", "Zephyr"), ("Guest", "Puck")]
+
+        # When
+        body = speech_payload(text, speaker_voices=speakers, temperature=1.0)
+
+        # Then
+        assert body == json.dumps({
+            "contents": [{"role": "user", "parts": [{"text": text}]}],
+            "generationConfig": speech_generation_config(speaker_voices=speakers, temperature=1.0),
+        })
+
+    def test_template_reused_per_voice_setup(self):
+        """Test that repeated calls hit the cache and new settings miss it"""
+        # Given
+        speech_payload_template.cache_clear()
+
+        # When
+        for text in ("one", "two", "three"):
+            speech_payload(text, voice_name="Kore", temperature=0.5)
+        speech_payload("four", voice_name="Kore", temperature=0.7)
+
+        # Then
+        info = speech_payload_template.cache_info()
+        assert (info.hits, info.misses) == (2, 2)
+
+    def test_sdk_config_built_once(self):
+        """Test that GeminiTTS reuses SDK config objects per request settings"""
+        # Given
+        tts = GeminiTTS(api_key="test-key", backend="rest")
+
+        # When
+        first = tts._sdk_config(SpeechRequest(voice_name="Puck", temperature=0.8))
+        again = tts._sdk_config(SpeechRequest(voice_name="Puck", temperature=0.8))
+        warmer = tts._sdk_config(SpeechRequest(voice_name="Puck", temperature=1.0))
+
+        # Then
+        assert again is first and warmer is not first
+        assert warmer.temperature == 1.0
+        assert first.speech_config.voice_config.prebuilt_voice_config.voice_name == "Puck"
+
+    def test_voice_validation(self):
+        """Test that unknown voices are rejected before any request is built"""
+        tts = GeminiTTS(api_key="test-key", backend="rest")
+        assert GeminiTTS.VOICE_SET == frozenset(GeminiTTS.AVAILABLE_VOICES)
+        with pytest.raises(ValueError, match="Voice 'Nobody' not available"):
+            tts.generate_speech("Hello", voice_name="Nobody")
+
+
+class TestGeminiTTSRestBackend:
+    """Test GeminiTTS selecting the REST backend"""
+
+    def test_rest_backend_skips_sdk_client(self):
+        """Test that the REST backend streams through GeminiAPI"""
+        # Given
+        service = GeminiTTS(api_key="test-key", backend="rest")
+        service.api.stream_speech = Mock(return_value=iter([(b"\x01\x00", "audio/L16;rate=24000")]))
+
+        # When
+        chunks = list(service.stream_speech("Hello", voice_name="Kore"))
+
+        # Then
+        assert service.client is None
+        assert chunks == [b"\x01\x00"]
+        assert service.api.stream_speech.call_args.kwargs["voice_name"] == "Kore"
+
+    def test_unknown_backend_rejected(self):
+        """Test backend validation"""
+        with pytest.raises(ValueError, match="Unknown backend"):
+            GeminiTTS(api_key="test-key", backend="grpc")
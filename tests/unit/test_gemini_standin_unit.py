@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the local Gemini stand-in server
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+from gemini_api import GeminiAPI, GeminiAPIError
+from gemini_standin import GeminiStandIn, StandInConfig, synthesize_pcm
+from gemini_tts import GeminiTTS
+
+FAST = StandInConfig(ttfc_seconds=0.0, bytes_per_second=1e9, chunk_seconds=0.25)
+
+
+@pytest.fixture
+def standin():
+    with GeminiStandIn(FAST) as server:
+        yield server
+
+
+class TestStandInStreaming:
+    """Test emulated streamGenerateContent"""
+
+    def test_rest_client_receives_chunked_pcm(self, standin):
+        """Test that audio arrives in chunk_seconds pieces and matches the text length"""
+        # Given
+        text = "x" * 30
+        api = GeminiAPI(api_key="test-key", base_url=standin.url)
+
+        # When
+        chunks = list(api.stream_speech(text))
+
+        # Then
+        assert len(chunks) == 8
+        assert all(mime == "audio/L16;codec=pcm;rate=24000" for _, mime in chunks)
+        assert b"".join(pcm for pcm, _ in chunks) == synthesize_pcm(text, FAST)
+        assert standin.stats["audio_bytes"] == 2 * 24000 * 2
+
+    def test_base_url_env_selects_standin(self, standin, monkeypatch):
+        """Test that GeminiTTS on the REST backend follows GEMINI_API_BASE_URL"""
+        # Given
+        monkeypatch.setenv("GEMINI_API_BASE_URL", standin.url)
+        tts = GeminiTTS(api_key="test-key", backend="rest")
+
+        # When
+        audio = b"".join(tts.stream_speech("Hello from the stand-in"))
+
+        # Then
+        assert audio
+        assert standin.stats["requests"] == 1
+
+    def test_time_to_first_chunk_is_applied(self):
+        """Test configured latency before the first chunk"""
+        # Given
+        config = FAST._replace(ttfc_seconds=0.2)
+        with GeminiStandIn(config) as server:
+            api = GeminiAPI(api_key="test-key", base_url=server.url)
+            start = time.monotonic()
+
+            # When
+            next(api.stream_speech("Hello"))
+
+        # Then
+        assert time.monotonic() - start >= 0.2
+
+    def test_missing_api_key_is_rejected(self, standin):
+        """Test that unauthenticated calls fail like the real API"""
+        # Given
+        api = GeminiAPI(api_key="test-key", base_url=standin.url)
+        del api.session.headers["x-goog-api-key"]
+
+        # When / Then
+        with pytest.raises(GeminiAPIError) as exc_info:
+            list(api.stream_speech("Hello"))
+        assert exc_info.value.status_code == 403
+
+    def test_text_model_returns_script(self, standin):
+        """Test offline script generation"""
+        # Given
+        api = GeminiAPI(api_key="test-key", base_url=standin.url)
+
+        # When
+        script = api.generate_text("Write about testing")
+
+        # Then
+        assert script.startswith("Host:")
+        assert "Guest:" in script
+
+
+class TestFaultInjection:
+    """Test deterministic error, 429 and stall injection"""
+
+    def test_rate_limit_injection(self):
+        """Test that every request is rejected with 429 at rate 1.0"""
+        with GeminiStandIn(FAST._replace(rate_limit_rate=1.0)) as server:
+            api = GeminiAPI(api_key="test-key", base_url=server.url)
+            with pytest.raises(GeminiAPIError) as exc_info:
+                list(api.stream_speech("Hello"))
+            assert exc_info.value.status_code == 429
+            assert server.stats["rate_limited"] == 1
+
+    def test_faults_are_deterministic_per_seed(self):
+        """Test that the same seed and request sequence gives the same outcomes"""
+        def outcomes(seed):
+            config = FAST._replace(error_rate=0.5, seed=seed)
+            with GeminiStandIn(config) as server:
+                api = GeminiAPI(api_key="test-key", base_url=server.url)
+                results = []
+                for text in ["one", "two", "three", "four", "one", "one"]:
+                    try:
+                        list(api.stream_speech(text))
+                        results.append("ok")
+                    except GeminiAPIError as e:
+                        results.append(e.status_code)
+                return results
+
+        assert outcomes(7) == outcomes(7)
+        assert 500 in outcomes(7) + outcomes(8)
+
+    def test_stall_injection_delays_stream(self):
+        """Test that a stalled stream pauses once mid-response"""
+        # Given
+        config = FAST._replace(stall_rate=1.0, stall_seconds=0.3)
+        with GeminiStandIn(config) as server:
+            api = GeminiAPI(api_key="test-key", base_url=server.url)
+            start = time.monotonic()
+
+            # When
+            list(api.stream_speech("Hello"))
+
+            # Then
+            assert time.monotonic() - start >= 0.3
+            assert server.stats["stalls"] == 1
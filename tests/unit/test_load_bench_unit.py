@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the GeminiTTS load-testing harness
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+from gemini_standin import StandInConfig
+from load_bench import percentile, run_load, text_lengths, write_report
+
+FAST = StandInConfig(ttfc_seconds=0.01, bytes_per_second=1e9)
+
+
+class TestTextLengths:
+    """Test synthetic text length distributions"""
+
+    def test_fixed_lengths(self):
+        assert text_lengths(3, "fixed", 120) == [120, 120, 120]
+
+    def test_lognormal_mean_is_close_to_requested(self):
+        """Test that the lognormal draw is centred on mean_chars"""
+        lengths = text_lengths(2000, "lognormal", 200, seed=1)
+        assert 180 < sum(lengths) / len(lengths) < 220
+
+    def test_unknown_distribution_rejected(self):
+        with pytest.raises(ValueError):
+            text_lengths(1, "pareto")
+
+
+class TestPercentile:
+    """Test interpolated percentiles"""
+
+    def test_interpolation(self):
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == pytest.approx(2.5)
+        assert percentile([5.0], 99) == 5.0
+        assert percentile([], 50) is None
+
+
+class TestRunLoad:
+    """Test a small load run against the stand-in"""
+
+    def test_report_has_latency_and_throughput(self, tmp_path):
+        """Test that every job completes and the JSON export round-trips"""
+        # When
+        report = run_load(jobs=6, concurrency=3, mean_chars=60, backend="rest",
+                          standin_config=FAST)
+        write_report(report, str(tmp_path / "load.json"))
+
+        # Then
+        assert report["completed"] == 6
+        assert report["errors"] == {}
+        assert report["ttfc_seconds"]["p50"] >= 0.01
+        assert report["latency_seconds"]["p99"] >= report["ttfc_seconds"]["p99"]
+        assert report["audio_seconds_per_second"] > 0
+        assert report["peak_rss_mb"] > 0
+        assert json.loads((tmp_path / "load.json").read_text())["completed"] == 6
+
+    def test_injected_errors_are_counted(self):
+        """Test that failed jobs are reported by error class"""
+        report = run_load(jobs=4, concurrency=2, backend="rest",
+                          standin_config=FAST._replace(rate_limit_rate=1.0))
+        assert report["completed"] == 0
+        assert report["errors"] == {"GeminiAPIError": 4}
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Unit tests for cached model and voice discovery
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+import model_discovery
+from gemini_api import GeminiAPI
+from gemini_standin import GeminiStandIn
+from gemini_tts import GeminiTTS
+from model_discovery import PREBUILT_VOICES, Discovery, check_health, current, key_id, load_cached, save
+
+KEY_ID = key_id("test-key")
+
+
+@pytest.fixture
+def server():
+    with GeminiStandIn() as standin:
+        yield standin
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Discovery file in a temp dir, with list_models calls counted"""
+    path = tmp_path / "discovery.json"
+    monkeypatch.setenv(model_discovery.DISCOVERY_FILE_ENV, str(path))
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    calls = []
+    list_models = GeminiAPI.list_models
+
+    def counting_list_models(api, *args, **kwargs):
+        calls.append(api.base_url)
+        return list_models(api, *args, **kwargs)
+
+    monkeypatch.setattr(GeminiAPI, "list_models", counting_list_models)
+    return path, calls
+
+
+def wait_for_background_refresh():
+    for thread in threading.enumerate():
+        if thread.name == "gemini-discovery":
+            thread.join(5)
+
+
+class TestDiscoveryCache:
+    """Test TTL, background refresh and failure handling"""
+
+    def test_first_lookup_queries_then_cache_answers(self, server, cache):
+        """Test that only the first lookup within the TTL reaches the API"""
+        # Given
+        path, calls = cache
+
+        # When
+        first = current(base_url=server.url)
+        second = current(base_url=server.url)
+
+        # Then
+        assert first.healthy and first.tts_models == ("gemini-2.5-flash-preview-tts",
+                                                      "gemini-2.5-pro-preview-tts")
+        assert first.voices == PREBUILT_VOICES
+        assert second == first
+        assert calls == [server.url]
+        assert json.loads(path.read_text())["healthy"] is True
+
+    def test_expired_entry_served_while_refreshing(self, server, cache):
+        """Test that a stale healthy entry is returned at once and refreshed in the background"""
+        # Given
+        path, calls = cache
+        stale = Discovery(1.0, server.url, True, ("old-tts",), ("Puck",), key_id=KEY_ID)
+        save(stale, str(path))
+
+        # When
+        answer = current(base_url=server.url)
+        wait_for_background_refresh()
+
+        # Then
+        assert answer == stale
+        assert calls == [server.url]
+        assert load_cached(str(path)).tts_models == ("gemini-2.5-flash-preview-tts",
+                                                     "gemini-2.5-pro-preview-tts")
+        assert not Path(str(path) + ".lock").exists()
+
+    def test_refresh_skipped_while_another_process_holds_the_lock(self, server, cache):
+        """Test that concurrent workers do not all refresh at once"""
+        # Given
+        path, calls = cache
+        save(Discovery(1.0, server.url, True, ("old-tts",), ("Puck",), key_id=KEY_ID), str(path))
+        Path(str(path) + ".lock").touch()
+
+        # When
+        current(base_url=server.url)
+        wait_for_background_refresh()
+
+        # Then
+        assert calls == []
+
+    def test_failure_is_cached_briefly(self, cache):
+        """Test that a failed check is answered from the cache until FAILURE_TTL_SECONDS"""
+        # Given
+        path, calls = cache
+        dead_url = "http://127.0.0.1:9"
+
+        # When
+        first = check_health(base_url=dead_url)
+        second = check_health(base_url=dead_url)
+
+        # Then
+        assert not first.healthy and "ConnectionError" in first.error
+        assert second == first and len(calls) == 1
+        assert not first.expired(ttl=3600, now=first.checked_at + 30)
+        assert first.expired(ttl=3600, now=first.checked_at + model_discovery.FAILURE_TTL_SECONDS)
+
+    def test_entry_for_another_endpoint_ignored(self, server, cache):
+        """Test that switching GEMINI_API_BASE_URL triggers a fresh lookup"""
+        # Given
+        path, calls = cache
+        save(Discovery(9e12, "http://elsewhere", True, ("x-tts",), ("Puck",), key_id=KEY_ID), str(path))
+
+        # When
+        discovery = current(base_url=server.url)
+
+        # Then
+        assert discovery.base_url == server.url
+        assert calls == [server.url]
+
+    def test_entry_for_another_key_ignored(self, server, cache):
+        """Test that a healthy result for one key is not reused for another"""
+        # Given
+        path, calls = cache
+        save(Discovery(9e12, server.url, True, ("x-tts",), ("Puck",), key_id=key_id("other-key")),
+             str(path))
+
+        # When
+        discovery = current(base_url=server.url)
+
+        # Then
+        assert discovery.key_id == KEY_ID and KEY_ID not in ("", "test-key")
+        assert calls == [server.url]
+        assert "test-key" not in path.read_text()
+
+    def test_missing_api_key_reported_unhealthy(self, cache, monkeypatch):
+        """Test that the preflight fails cleanly without a key"""
+        monkeypatch.delenv("GEMINI_API_KEY")
+        discovery = check_health(base_url="http://127.0.0.1:9")
+        assert not discovery.healthy and "API key" in discovery.error
+
+
+class TestDiscoveredVoices:
+    """Test AVAILABLE_VOICES populated from discovery"""
+
+    def test_cached_voices_extend_available_voices(self, cache, monkeypatch):
+        """Test that GeminiTTS picks up cached voices without calling the API"""
+        # Given
+        path, calls = cache
+        save(Discovery(9e12, "http://x", True, ("x-tts",), ("Zephyr", "Leda", "Orus")), str(path))
+        monkeypatch.setattr(GeminiTTS, "AVAILABLE_VOICES", list(GeminiTTS.AVAILABLE_VOICES))
+        monkeypatch.setattr(GeminiTTS, "VOICE_SET", GeminiTTS.VOICE_SET)
+        monkeypatch.setattr(GeminiTTS, "_discovery_loaded", False)
+
+        # When
+        GeminiTTS.load_discovered_voices()
+        tts = GeminiTTS(api_key="test-key", backend="rest")
+
+        # Then
+        assert tts.AVAILABLE_VOICES[:6] == ["Zephyr", "Puck", "Charon", "Kore", "Uranus", "Fenrir"]
+        assert tts.AVAILABLE_VOICES[6:] == ["Leda", "Orus"]
+        assert "Leda" in GeminiTTS.VOICE_SET
+        tts._check_voice("Orus")
+        assert calls == []
+
+    def test_preflight_answered_from_cache(self, cache, monkeypatch):
+        """Test that gemini_tts_improved no longer lists models on every run"""
+        # Given
+        import gemini_tts_improved
+        path, calls = cache
+        monkeypatch.setattr(GeminiTTS, "AVAILABLE_VOICES", list(GeminiTTS.AVAILABLE_VOICES))
+        monkeypatch.setattr(GeminiTTS, "VOICE_SET", GeminiTTS.VOICE_SET)
+        save(Discovery(9e12, model_discovery.resolve_base_url(), True,
+                       ("gemini-2.5-flash-preview-tts",), PREBUILT_VOICES, key_id=KEY_ID), str(path))
+
+        # When
+        ok = gemini_tts_improved.test_api_connectivity("test-key", "gemini-2.5-flash-preview-tts")
+
+        # Then
+        assert ok and calls == []
+        assert "Sulafat" in GeminiTTS.VOICE_SET
+
+    def test_constructor_leaves_discovery_file_alone(self, cache, monkeypatch):
+        """Test that building a client does not read the discovery cache"""
+        monkeypatch.setattr(GeminiTTS, "_discovery_loaded", False)
+        with monkeypatch.context() as patched:
+            patched.setattr(model_discovery, "load_cached", pytest.fail)
+            GeminiTTS(api_key="test-key", backend="rest")
+        assert GeminiTTS._discovery_loaded is False
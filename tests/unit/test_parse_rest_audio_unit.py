@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the streaming REST response parser
+"""
+
+import base64
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "archive" / "legacy_scripts"))
+from parse_rest_audio import extract_audio_streaming, iter_response_strings, process_all_response_files
+
+
+def response_chunk(data: bytes, mime_type: str = "audio/L16;codec=pcm;rate=24000", data_first: bool = False):
+    inline = {"data": base64.b64encode(data).decode(), "mimeType": mime_type} if data_first \
+        else {"mimeType": mime_type, "data": base64.b64encode(data).decode()}
+    return {"candidates": [{"content": {"parts": [{"inlineData": inline}]}}]}
+
+
+@pytest.fixture
+def tmpdir_path():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+class TestIterResponseStrings:
+    """Test the incremental string scanner"""
+
+    @pytest.mark.parametrize("block_size", [1, 3, 7, 1024])
+    def test_values_and_streamed_data_across_block_boundaries(self, block_size):
+        """Test that tiny read blocks produce the same events"""
+        # Given
+        body = b'{"text": "Hi \\"there\\"", "inlineData": {"mimeType": "audio/wav", "data": "QU\\/C"}}'
+
+        # When
+        events = list(iter_response_strings(io.BytesIO(body), block_size=block_size))
+
+        # Then
+        values = [(k, v) for e, k, v in events if e == 'value']
+        pieces = b''.join(v for e, k, v in events if e == 'piece')
+        assert values == [('text', 'Hi "there"'), ('mimeType', 'audio/wav')]
+        assert pieces == b'QU/C'
+
+    def test_non_string_values_do_not_bind_keys(self):
+        """Test that numbers between keys don't confuse key tracking"""
+        body = b'{"rate": 24000, "other": ["data", "x"], "text": "ok"}'
+        events = list(iter_response_strings(io.BytesIO(body)))
+        assert [(e, k) for e, k, _ in events] == [('value', 'text')]
+
+    def test_truncated_string_raises(self):
+        """Test unterminated input"""
+        with pytest.raises(ValueError, match="Truncated"):
+            list(iter_response_strings(io.BytesIO(b'{"data": "QUJD')))
+
+
+class TestExtractAudioStreaming:
+    """Test streaming extraction to files"""
+
+    def test_json_lines_response(self, tmpdir_path):
+        """Test one output file per inlineData payload"""
+        # Given
+        response = tmpdir_path / "test_response.json"
+        response.write_text("\n".join(json.dumps(response_chunk(bytes([i]) * 1000)) for i in range(3)))
+
+        # When
+        info = extract_audio_streaming(str(response), str(tmpdir_path / "out_audio"),
+                                       block_size=256, quiet=True)
+
+        # Then
+        assert [Path(p).name for p in info['audio_files']] == \
+            ["out_audio_1.pcm", "out_audio_2.pcm", "out_audio_3.pcm"]
+        assert Path(info['audio_files'][1]).read_bytes() == bytes([1]) * 1000
+        assert info['audio_bytes'] == 3000
+
+    def test_pretty_array_with_data_before_mime(self, tmpdir_path):
+        """Test streamGenerateContent arrays and data-first ordering"""
+        # Given
+        response = tmpdir_path / "array_response.json"
+        chunks = [response_chunk(b"abc" * 50, "audio/wav", data_first=True),
+                  response_chunk(b"xyz" * 50, "audio/mpeg", data_first=True)]
+        response.write_text(json.dumps(chunks, indent=2))
+
+        # When
+        info = extract_audio_streaming(str(response), str(tmpdir_path / "a"), quiet=True)
+
+        # Then
+        assert [Path(p).suffix for p in info['audio_files']] == [".wav", ".mp3"]
+        assert Path(info['audio_files'][1]).read_bytes() == b"xyz" * 50
+        assert not list(tmpdir_path.glob("*.part"))
+
+    def test_sse_response_with_text(self, tmpdir_path):
+        """Test alt=sse captures and text parts"""
+        # Given
+        response = tmpdir_path / "sse_response.json"
+        text_chunk = {"candidates": [{"content": {"parts": [{"text": "hello"}]}}]}
+        response.write_text(
+            f"data: {json.dumps(text_chunk)}\n\ndata: {json.dumps(response_chunk(b'pcm!'))}\n\n"
+        )
+
+        # When
+        info = extract_audio_streaming(str(response), str(tmpdir_path / "s"), quiet=True)
+
+        # Then
+        assert info['text_responses'] == ["hello"]
+        assert Path(info['audio_files'][0]).read_bytes() == b"pcm!"
+
+
+class TestProcessAllResponseFiles:
+    """Test parallel batch extraction"""
+
+    def write_responses(self, directory: Path, count: int):
+        for i in range(count):
+            (directory / f"test{i}_response.json").write_text(json.dumps(response_chunk(bytes([i]) * 64)))
+
+    def test_parallel_extracts_every_file(self, tmpdir_path, capsys):
+        """Test process pool mode and throughput report"""
+        # Given
+        self.write_responses(tmpdir_path, 4)
+
+        # When
+        process_all_response_files(str(tmpdir_path), jobs=2)
+
+        # Then
+        outputs = sorted(p.name for p in tmpdir_path.glob("*_audio_1.pcm"))
+        assert len(outputs) == 4
+        assert "files/s" in capsys.readouterr().out
+
+    def test_up_to_date_files_are_skipped(self, tmpdir_path, capsys):
+        """Test that a second run skips files with newer extracted audio"""
+        # Given
+        self.write_responses(tmpdir_path, 2)
+        process_all_response_files(str(tmpdir_path))
+        capsys.readouterr()
+
+        # When
+        process_all_response_files(str(tmpdir_path))
+
+        # Then
+        assert "Skipping 2 files" in capsys.readouterr().out
+
+    def test_stale_output_is_reextracted(self, tmpdir_path):
+        """Test that a response newer than its audio is processed again"""
+        # Given
+        self.write_responses(tmpdir_path, 1)
+        process_all_response_files(str(tmpdir_path))
+        response = tmpdir_path / "test0_response.json"
+        output = tmpdir_path / "test0_response_audio_1.pcm"
+        os.utime(output, (1, 1))
+
+        # When
+        process_all_response_files(str(tmpdir_path))
+
+        # Then
+        assert output.stat().st_mtime > 1
+
+    def test_partial_extraction_is_redone(self, tmpdir_path, capsys):
+        """Test that outputs left by an interrupted run do not count as up to date"""
+        # Given a two-chunk response and only the first chunk from a crashed run
+        response = tmpdir_path / "test0_response.json"
+        response.write_text(json.dumps(response_chunk(b"one")) + "\n" + json.dumps(response_chunk(b"two")))
+        (tmpdir_path / "test0_response_audio_1.pcm").write_bytes(b"one")
+
+        # When
+        process_all_response_files(str(tmpdir_path))
+
+        # Then
+        assert "Skipping" not in capsys.readouterr().out
+        assert (tmpdir_path / "test0_response_audio_2.pcm").read_bytes() == b"two"
+        assert (tmpdir_path / "test0_response_audio.done").exists()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Unit tests for local pause rendering
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+from pause_markers import PauseSegment, has_pause_markers, render_silence, split_at_pauses
+from gemini_tts import GeminiTTS
+
+
+def make_chunk(data: bytes, mime_type: str = "audio/L16;codec=pcm;rate=24000") -> Mock:
+    """Build a mocked streaming chunk carrying inline audio"""
+    chunk = Mock()
+    chunk.candidates = [Mock()]
+    chunk.candidates[0].content.parts = [Mock()]
+    chunk.candidates[0].content.parts[0].inline_data.data = data
+    chunk.candidates[0].content.parts[0].inline_data.mime_type = mime_type
+    return chunk
+
+
+class TestSplitAtPauses:
+    """Test splitting text at pause markers"""
+
+    def test_text_without_markers_is_single_segment(self):
+        """Test that plain text passes through unchanged"""
+        # When
+        segments = split_at_pauses("Hello world.")
+
+        # Then
+        assert segments == [PauseSegment("Hello world.", 0.0)]
+
+    def test_markers_are_stripped_and_merged(self):
+        """Test that consecutive markers merge into one pause"""
+        # When
+        segments = split_at_pauses("Intro. [pause] [long pause] Main part.", pause_seconds=0.5)
+
+        # Then
+        assert segments == [
+            PauseSegment("Intro.", 2.0),
+            PauseSegment("Main part.", 0.0),
+        ]
+
+    def test_explicit_durations_and_ellipsis(self):
+        """Test [pause 250ms] markers and ellipses"""
+        # When
+        segments = split_at_pauses("Well... maybe [pause 250ms] not.", ellipsis_seconds=0.4)
+
+        # Then
+        assert [s.text for s in segments] == ["Well", "maybe", "not."]
+        assert segments[0].pause_after == pytest.approx(0.4)
+        assert segments[1].pause_after == pytest.approx(0.25)
+
+    def test_ellipsis_can_be_left_to_the_model(self):
+        """Test that ellipses stay in the text when disabled"""
+        # When
+        segments = split_at_pauses("Well... maybe", include_ellipsis=False)
+
+        # Then
+        assert segments == [PauseSegment("Well... maybe", 0.0)]
+        assert not has_pause_markers("Well... maybe", include_ellipsis=False)
+
+    def test_leading_pause_has_empty_text(self):
+        """Test that a pause before any text is kept"""
+        # When
+        segments = split_at_pauses("[pause] Hello")
+
+        # Then
+        assert segments[0] == PauseSegment("", 0.75)
+        assert segments[1].text == "Hello"
+
+    def test_speaker_label_carried_across_split(self):
+        """Test that multi-speaker turns keep their label after a pause"""
+        # Given
+        script = "Host: Welcome [pause] to the show.\nGuest: Thanks!"
+
+        # When
+        segments = split_at_pauses(script, speaker_labels=["Host", "Guest"])
+
+        # Then
+        assert segments[0].text == "Host: Welcome"
+        assert segments[1].text.startswith("Host: to the show.")
+
+
+class TestRenderSilence:
+    """Test PCM silence generation"""
+
+    def test_exact_length_for_16_bit(self):
+        """Test that silence has exactly rate * seconds frames"""
+        assert render_silence(0.5, sample_rate=24000, bits_per_sample=16) == bytes(24000)
+
+    def test_8_bit_silence_is_midpoint(self):
+        """Test unsigned 8-bit silence level"""
+        assert render_silence(0.001, sample_rate=8000, bits_per_sample=8) == b"\x80" * 8
+
+    def test_non_positive_duration_is_empty(self):
+        """Test that zero duration renders nothing"""
+        assert render_silence(0) == b""
+
+
+class TestGeminiTTSLocalPauses:
+    """Test pause rendering inside GeminiTTS"""
+
+    @pytest.fixture
+    def mock_service(self):
+        """Create service with mocked dependencies"""
+        with patch('gemini_tts.genai') as mock_genai, patch('gemini_tts.types'):
+            mock_client = Mock()
+            mock_genai.Client.return_value = mock_client
+            service = GeminiTTS(api_key="test-key", local_pauses=True, pause_seconds=0.5)
+            yield service, mock_client
+
+    def test_pause_markers_rendered_locally(self, mock_service):
+        """Test that each text segment is synthesized and silence inserted"""
+        # Given
+        service, mock_client = mock_service
+        mock_client.models.generate_content_stream.side_effect = [
+            [make_chunk(b"\x01\x00" * 10)],
+            [make_chunk(b"\x02\x00" * 10)],
+        ]
+
+        # When
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = service.generate_speech("First. [pause] Second.",
+                                             output_file=str(Path(tmpdir) / "paused"))
+            data = Path(result).read_bytes()
+
+        # Then
+        assert mock_client.models.generate_content_stream.call_count == 2
+        assert result.endswith(".wav")
+        pcm = data[44:]
+        assert len(pcm) == 20 + 24000 + 20
+        assert pcm[20:20 + 24000] == bytes(24000)
+
+    def test_disabled_sends_markers_to_model(self, mock_service):
+        """Test that the text is sent untouched when local pauses are off"""
+        # Given
+        service, mock_client = mock_service
+        service.local_pauses = False
+        mock_client.models.generate_content_stream.return_value = [make_chunk(b"\x01\x00")]
+
+        # When
+        with tempfile.TemporaryDirectory() as tmpdir:
+            service.generate_speech("First. [pause] Second.",
+                                    output_file=str(Path(tmpdir) / "plain"))
+
+        # Then
+        assert mock_client.models.generate_content_stream.call_count == 1
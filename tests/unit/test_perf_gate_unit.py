@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the performance regression gate
+"""
+
+import sys
+from pathlib import Path
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+from micro_bench import CASES
+from perf_gate import (
+    DEFAULT_BASELINE, GATE_MICRO_EPISODES, compare, format_comparison, load_baseline, run_gate,
+    tolerance_for, write_baseline,
+)
+
+TOLERANCES = {"*": 0.2, "micro.*": 0.5}
+
+
+def statuses(current, baseline):
+    return {row.name: row.status for row in compare(current, baseline, TOLERANCES)}
+
+
+class TestCompare:
+    """Test metric classification"""
+
+    def test_latency_growth_beyond_tolerance_regresses(self):
+        result = statuses({"load.latency_p95_seconds": 1.3}, {"load.latency_p95_seconds": 1.0})
+        assert result == {"load.latency_p95_seconds": "regressed"}
+
+    def test_throughput_drop_regresses(self):
+        """Test that *_per_second metrics regress when they fall"""
+        result = statuses({"load.jobs_per_second": 7.0, "load.audio_seconds_per_second": 13.0},
+                          {"load.jobs_per_second": 10.0, "load.audio_seconds_per_second": 10.0})
+        assert result == {"load.jobs_per_second": "regressed",
+                          "load.audio_seconds_per_second": "improved"}
+
+    def test_most_specific_tolerance_wins(self):
+        """Test per-metric tolerance patterns"""
+        assert tolerance_for("micro.join_chunks[1min].min_seconds", TOLERANCES) == 0.5
+        assert tolerance_for("load.peak_rss_mb", TOLERANCES) == 0.2
+        assert statuses({"micro.x.min_seconds": 1.4}, {"micro.x.min_seconds": 1.0}) == \
+            {"micro.x.min_seconds": "ok"}
+
+    def test_new_and_missing_metrics(self):
+        result = statuses({"a_seconds": 1.0}, {"b_seconds": 1.0})
+        assert result == {"a_seconds": "new", "b_seconds": "missing"}
+
+
+class TestRunGate:
+    """Test gate exit codes and the diff table"""
+
+    def test_exit_codes(self, tmp_path, capsys):
+        """Test pass, fail and missing-baseline outcomes"""
+        # Given
+        baseline = str(tmp_path / "baseline.json")
+        write_baseline(baseline, {"load.peak_rss_mb": 100.0}, TOLERANCES)
+
+        # When / Then
+        assert run_gate(baseline, metrics={"load.peak_rss_mb": 110.0}) == 0
+        assert run_gate(baseline, metrics={"load.peak_rss_mb": 150.0}) == 1
+        assert "+50.0%" in capsys.readouterr().out
+        assert run_gate(str(tmp_path / "absent.json"), metrics={}) == 2
+
+    def test_table_lists_regressions_first(self):
+        rows = compare({"a_seconds": 2.0, "b_seconds": 1.0}, {"a_seconds": 1.0, "b_seconds": 1.0},
+                       TOLERANCES)
+        lines = format_comparison(rows).splitlines()
+        assert lines[1].startswith("❌  a_seconds")
+
+    def test_committed_baseline_covers_every_micro_case(self):
+        """Test that no micro-benchmark is reported as new, and so left unchecked"""
+        # Given
+        expected = {f"micro.{case.name}[{episode}].min_seconds" if case.per_episode
+                    else f"micro.{case.name}.min_seconds"
+                    for case in CASES
+                    for episode in (GATE_MICRO_EPISODES if case.per_episode else ["1min"])}
+
+        # When
+        metrics = load_baseline(DEFAULT_BASELINE)["metrics"]
+
+        # Then
+        assert sorted(expected - set(metrics)) == []
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-process podcast pipeline
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+import podcast_pipeline
+from gemini_standin import GeminiStandIn, StandInConfig
+from gemini_tts import GeminiTTS
+from podcast_pipeline import PodcastConfig, PodcastPipeline, Turn, TurnSplitter, encode_mp3, parse_turns
+from wav_io import read_wav_info
+
+FAST = StandInConfig(ttfc_seconds=0.0, bytes_per_second=1e9)
+
+SCRIPT = """# Episode 1
+
+**Host:** Welcome back to the show.
+Today is a big one.
+**Guest:** Thanks for having me!
+Host: Let's get started.
+"""
+
+
+@pytest.fixture
+def server():
+    with GeminiStandIn(FAST) as standin:
+        yield standin
+
+
+def make_pipeline(tmp_path, server=None, **overrides):
+    config = PodcastConfig(**{"topic": "Tide pools", "output_name": "episode",
+                              "output_dir": str(tmp_path / "out"), **overrides})
+
+    def tts_factory():
+        tts = GeminiTTS(api_key="test-key", backend="rest")
+        tts.api.base_url = server.url
+        return tts
+
+    return PodcastPipeline(config, tts_factory=tts_factory, script_dir=str(tmp_path / "scripts"))
+
+
+class TestScriptParsing:
+    """Test turn parsing and template loading"""
+
+    def test_parse_turns(self):
+        """Test labels with markdown, continuation lines and a dropped title"""
+        assert parse_turns(SCRIPT) == [
+            Turn("Host", "Welcome back to the show. Today is a big one."),
+            Turn("Guest", "Thanks for having me!"),
+            Turn("Host", "Let's get started."),
+        ]
+
+    def test_times_and_urls_are_not_labels(self):
+        """Test that colons inside text do not start new turns"""
+        turns = parse_turns("Host: It starts at\n10:30 sharp, see https://example.com\n")
+        assert turns == [Turn("Host", "It starts at 10:30 sharp, see https://example.com")]
+
+    def test_prose_labels_are_text(self):
+        """Test that "Segment 1:", "Note:" and similar lines stay in the current turn"""
+        # Given
+        script = ("Host: Welcome.\nSegment 1: The basics.\n"
+                  "Guest: Thanks!\nNote: tides follow the moon.\n")
+
+        # When
+        turns = parse_turns(script, names=("Host", "Guest"))
+        untemplated = parse_turns("Alex: Hi.\nSam: Hello.\nKey takeaway: listen closely.\n")
+
+        # Then
+        assert turns == [Turn("Host", "Welcome. Segment 1: The basics."),
+                         Turn("Guest", "Thanks! Note: tides follow the moon.")]
+        assert untemplated[-1] == Turn("Sam", "Hello. Key takeaway: listen closely.")
+
+    def test_turns_close_at_the_next_label(self):
+        """Test that streamed text yields a turn only once the next label has arrived"""
+        # Given
+        splitter = TurnSplitter()
+
+        # When / Then
+        assert splitter.feed("# Episode 1\n\n**Host:** Welcome back to the show.\nToday is") == []
+        assert splitter.feed(" a big one.\n**Guest:** Thanks for ") == []
+        assert splitter.feed("having me!\n") == [Turn("Host", "Welcome back to the show. Today is a big one.")]
+        assert splitter.close() == [Turn("Guest", "Thanks for having me!")]
+
+    def test_any_chunking_matches_parse_turns(self):
+        """Test that the turns do not depend on where the stream splits the text"""
+        for size in (1, 7, 64):
+            splitter = TurnSplitter()
+            turns = [turn for start in range(0, len(SCRIPT), size)
+                     for turn in splitter.feed(SCRIPT[start:start + size])]
+            assert turns + splitter.close() == parse_turns(SCRIPT)
+
+    def test_build_prompt_fills_template(self, tmp_path):
+        """Test that topic, duration and --set variables reach the template"""
+        # Given
+        pipeline = make_pipeline(tmp_path, podcast_type="news", topic="Solar storms", duration=6,
+                                 variables=(("tone", "investigative"),), source_content="Notes")
+
+        # When
+        prompt = pipeline.build_prompt()
+
+        # Then
+        assert '6-minute news podcast script discussing: "Solar storms"' in prompt
+        assert "**Tone:** Probing, curious, uncovers details" in prompt
+        assert "approximately 1000 words" in prompt
+        assert prompt.endswith("SOURCE CONTENT TO CONVERT:\nNotes")
+
+    def test_unknown_type_rejected(self, tmp_path):
+        """Test that unknown podcast types fail before any work is done"""
+        with pytest.raises(ValueError):
+            make_pipeline(tmp_path, podcast_type="opera")
+
+
+class TestPodcastPipeline:
+    """Test the stages running together in one process"""
+
+    def test_full_run(self, tmp_path, server):
+        """Test that a topic becomes a saved script and a WAV file"""
+        # Given
+        pipeline = make_pipeline(tmp_path, server)
+
+        # When
+        result = pipeline.run()
+
+        # Then
+        assert Path(result.script_file).read_text(encoding="utf-8") == result.script
+        assert result.audio_file == str(tmp_path / "out" / "episode.wav")
+        assert read_wav_info(result.audio_file).duration > 1
+        assert list(result.stage_seconds) == ["build_prompt", "generate_script", "synthesize", "encode"]
+        assert server.stats["requests"] == 2
+
+    def test_two_speakers_get_their_voices(self, tmp_path):
+        """Test that the first two labels are mapped to voice 1 and voice 2"""
+        # Given
+        pipeline = make_pipeline(tmp_path, voices=("Charon", "Kore"), style="science show")
+
+        # When
+        text, speaker_configs = pipeline.tts_script(SCRIPT)
+
+        # Then
+        assert speaker_configs == [{"speaker": "Host", "voice": "Charon"},
+                                   {"speaker": "Guest", "voice": "Kore"}]
+        assert text.splitlines()[0] == ("Read aloud the following podcast in a professional yet "
+                                        "conversational tone, as a science show:")
+        assert text.splitlines()[1] == "Host: Welcome back to the show. Today is a big one."
+
+    def test_third_label_read_as_text(self, tmp_path):
+        """Test that a label beyond the template's speakers does not abort a two-speaker run"""
+        # Given
+        pipeline = make_pipeline(tmp_path)
+
+        # When
+        text, speaker_configs = pipeline.tts_script(SCRIPT + "Caller: Hi!\n")
+
+        # Then
+        assert [config["speaker"] for config in speaker_configs] == ["Host", "Guest"]
+        assert text.endswith("Host: Let's get started. Caller: Hi!")
+
+    def test_script_only_with_cli_needs_no_api_client(self, tmp_path):
+        """Test that a CLI-generated script never builds a GeminiTTS client"""
+        # Given
+        config = PodcastConfig(topic="Tide pools", ai="claude", script_only=True, output_name="cli")
+        pipeline = PodcastPipeline(config, tts_factory=pytest.fail, script_dir=str(tmp_path))
+        completed = subprocess.CompletedProcess(["claude", "-p"], 0, stdout=SCRIPT)
+
+        # When
+        with patch.object(podcast_pipeline.shutil, "which", return_value="/usr/bin/claude"), \
+             patch.object(podcast_pipeline.subprocess, "run", return_value=completed) as run:
+            result = pipeline.run()
+
+        # Then
+        assert run.call_args.kwargs["input"].startswith("Generate a 15-minute podcast interview")
+        assert result.script == SCRIPT and result.audio_file is None
+        assert "synthesize" not in result.stage_seconds
+
+    def test_mp3_needs_ffmpeg(self, tmp_path):
+        """Test a clear error when ffmpeg is missing"""
+        with patch.object(podcast_pipeline.shutil, "which", return_value=None):
+            with pytest.raises(RuntimeError, match="ffmpeg not found"):
+                encode_mp3(None, "audio/L16;rate=24000", str(tmp_path / "x.mp3"))
+
+    def test_minimax_only_with_script_only(self, tmp_path):
+        """Test that MiniMax is accepted for scripts but refused for audio up front"""
+        with pytest.raises(ValueError, match="minimax TTS is not available"):
+            make_pipeline(tmp_path, tts="minimax")
+        assert make_pipeline(tmp_path, tts="minimax", script_only=True).config.tts == "minimax"
+
+
+class TestStreamingPipeline:
+    """Test synthesizing turns while the script is still being generated"""
+
+    def test_streamed_run(self, tmp_path, server):
+        """Test that a streamed script is saved whole and each turn gets its own request"""
+        # Given
+        pipeline = make_pipeline(tmp_path, server, stream=True)
+
+        # When
+        result = pipeline.run()
+
+        # Then
+        assert Path(result.script_file).read_text(encoding="utf-8") == result.script
+        assert len(parse_turns(result.script)) == 5
+        assert read_wav_info(result.audio_file).duration > 1
+        assert list(result.stage_seconds) == ["build_prompt", "generate_script", "synthesize", "encode"]
+        assert server.stats["requests"] == 1 + 5
+
+    def test_turns_synthesized_before_script_ends(self, tmp_path, server):
+        """Test that closed turns are requested while later lines are still being written"""
+        # Given a script source that waits for TTS traffic before its last line
+        pipeline = make_pipeline(tmp_path, server, stream=True, voices=("Charon", "Kore"))
+        requested_mid_script = []
+
+        def slow_script(prompt):
+            lines = SCRIPT.splitlines(keepends=True)
+            yield from lines[:-1]
+            deadline = time.monotonic() + 5
+            while server.stats["requests"] == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            requested_mid_script.append(server.stats["requests"])
+            yield lines[-1]
+
+        # When
+        with patch.object(pipeline, "stream_script", slow_script), \
+             patch.object(GeminiTTS, "synthesize_speech", autospec=True,
+                          side_effect=GeminiTTS.synthesize_speech) as synthesize:
+            result = pipeline.run()
+
+        # Then
+        assert requested_mid_script[0] >= 1
+        assert [call.args[2] for call in synthesize.call_args_list] == ["Charon", "Kore", "Charon"]
+        assert synthesize.call_args_list[0].args[1].endswith("\nWelcome back to the show. Today is a big one.")
+        assert result.script == SCRIPT
+
+    def test_cli_output_streamed(self, tmp_path, server):
+        """Test that an AI CLI's stdout is read as it is written"""
+        # Given a CLI that reads the prompt and prints a one-line script
+        cli = [sys.executable, "-c", "import sys; sys.stdin.read(); print('Host: Hello there.')"]
+        pipeline = make_pipeline(tmp_path, server, stream=True, ai="claude")
+
+        # When
+        with patch.dict(podcast_pipeline.CLI_COMMANDS, {"claude": cli}):
+            result = pipeline.run()
+
+        # Then
+        assert result.script == "Host: Hello there.\n"
+        assert server.stats["requests"] == 1
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the podcast_cli profiling mode
+"""
+
+import pstats
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+# Import the system under test
+SCRIPTS_DIR = Path(__file__).parent.parent.parent / "scripts"
+sys.path.append(str(SCRIPTS_DIR))
+from profiling import run_profiled
+from wav_io import build_wav_header
+
+
+def busy_work() -> int:
+    return sum(i * i for i in range(20000))
+
+
+class TestRunProfiled:
+    """Test the cpu and mem profilers"""
+
+    def test_cpu_profile_writes_pstats(self, tmp_path, capsys):
+        """Test that the result is returned and hotspots are reported"""
+        # Given
+        output = tmp_path / "run.prof"
+
+        # When
+        result = run_profiled("cpu", busy_work, output=str(output), top=5)
+
+        # Then
+        assert result == busy_work()
+        stats = pstats.Stats(str(output))
+        assert any(func[2] == "busy_work" for func in stats.stats)
+        report = capsys.readouterr().err
+        assert "busy_work" in report
+        assert f"CPU profile saved to: {output}" in report
+
+    def test_mem_profile_reports_peak_site(self, tmp_path, capsys):
+        """Test that the allocation held at the peak is the top site"""
+        # Given
+        output = tmp_path / "run.tracemalloc"
+
+        def allocate():
+            blocks = [bytearray(1 << 20) for _ in range(20)]
+            time.sleep(0.2)
+            del blocks
+            return "done"
+
+        # When
+        result = run_profiled("mem", allocate, output=str(output), top=3)
+
+        # Then
+        assert result == "done"
+        assert not tracemalloc.is_tracing()
+        snapshot = tracemalloc.Snapshot.load(str(output))
+        assert sum(stat.size for stat in snapshot.statistics("filename")) >= 20 << 20
+        report = capsys.readouterr().err
+        assert "Peak traced memory: 20." in report
+        top_site = report.splitlines()[2]
+        assert "20.0 MiB" in top_site and "test_profiling_unit.py" in top_site
+
+    def test_stats_written_when_command_fails(self, tmp_path):
+        """Test that a failing command still leaves its profile behind"""
+        # Given
+        output = tmp_path / "fail.prof"
+
+        def fail():
+            raise RuntimeError("boom")
+
+        # When
+        with pytest.raises(RuntimeError):
+            run_profiled("cpu", fail, output=str(output))
+
+        # Then
+        assert output.exists()
+
+    def test_unknown_mode_rejected(self):
+        """Test that only cpu and mem are accepted"""
+        with pytest.raises(ValueError):
+            run_profiled("io", busy_work)
+
+
+class TestCliProfile:
+    """Test --profile on a podcast_cli subcommand"""
+
+    def test_profile_wraps_subcommand(self, tmp_path):
+        """Test that the command runs normally and the report goes to stderr"""
+        # Given
+        segment = tmp_path / "a.wav"
+        segment.write_bytes(build_wav_header(4800) + b"\x00" * 4800)
+        output = tmp_path / "concat.prof"
+
+        # When
+        result = subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / "podcast_cli.py"), "--profile", "cpu",
+             "--profile-output", str(output), "--profile-top", "10",
+             "concat", str(tmp_path / "out.wav"), str(segment), str(segment)],
+            capture_output=True, text=True, check=True)
+
+        # Then
+        assert "Joined 2 segments" in result.stdout
+        assert "concat_wav" in result.stderr
+        assert (tmp_path / "out.wav").exists()
+        assert output.exists()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the parsed, cached prompt-template library
+"""
+
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+import prompt_library
+from prompt_library import PLACEHOLDER, PromptError, load
+
+PROMPTS = """
+podcast_types:
+  chat:
+    name: "Chat"
+    speakers: 2
+    prompt_template: |
+      A {duration}-minute chat about "{topic}" in a {tone} tone, {word_count} words. {Note}
+    variables:
+      duration: "10"
+      word_count: "1600"
+      tone: "relaxed"
+specialized_prompts:
+  rewrite:
+    prompt_template: "Rewrite: {original_script}"
+tone_presets:
+  casual: "Relaxed, conversational, friendly"
+"""
+
+
+@pytest.fixture
+def prompts_file(tmp_path, monkeypatch):
+    """A small prompts file with its own cache, and an empty in-process cache"""
+    monkeypatch.setenv(prompt_library.PROMPT_CACHE_ENV, str(tmp_path / "cache.json"))
+    monkeypatch.setattr(prompt_library, "_loaded", {})
+    path = tmp_path / "prompts.yaml"
+    path.write_text(PROMPTS, encoding="utf-8")
+    return str(path)
+
+
+class TestRendering:
+    """Test variable filling and validation"""
+
+    def test_every_shipped_template_renders(self, tmp_path, monkeypatch):
+        """Test that no placeholder is left in any template of the real prompts file"""
+        # Given
+        monkeypatch.setenv(prompt_library.PROMPT_CACHE_ENV, str(tmp_path / "cache.json"))
+        library = load()
+        values = {"topic": "Tide pools", "source_content": "Paper text",
+                  "original_script": "Host: Hi"}
+
+        # When / Then
+        assert len(library.names("podcast_types")) == 6
+        for name, template in library.templates.items():
+            prompt = library.render(name, {k: v for k, v in values.items() if k in template.fields})
+            assert not PLACEHOLDER.search(prompt), name
+        assert library.get("interview").speaker_names == ("Host", "Guest")
+        assert library.get("debate").speaker_names == ("Position A", "Position B")
+
+    def test_defaults_overrides_and_presets(self, prompts_file):
+        """Test that caller values win and preset names expand"""
+        prompt = load(prompts_file).render("chat", topic="Bees", tone="casual", word_count=900)
+        assert prompt == ('A 10-minute chat about "Bees" in a Relaxed, conversational, friendly tone, '
+                          '900 words. {Note}\n')
+
+    def test_duration_rescales_default_word_count(self, prompts_file):
+        """Test that a shorter episode asks for proportionally fewer words"""
+        assert "800 words" in load(prompts_file).render("chat", topic="Bees", duration=5)
+
+    @pytest.mark.parametrize("values, message", [
+        ({}, "Missing variables for 'chat': topic"),
+        ({"topic": "Bees", "host": "x"}, "Unknown variables for 'chat': host"),
+        ({"topic": "Bees", "duration": "ten"}, "duration must be a positive whole number"),
+    ])
+    def test_invalid_values_rejected(self, prompts_file, values, message):
+        """Test missing, unknown and malformed variables"""
+        with pytest.raises(PromptError, match=message):
+            load(prompts_file).render("chat", values)
+
+    def test_unknown_template(self, prompts_file):
+        """Test the error for a template that does not exist"""
+        with pytest.raises(PromptError, match="not found"):
+            load(prompts_file).get("opera")
+
+
+class TestCaching:
+    """Test that the YAML is parsed only when the file changes"""
+
+    def test_parsed_once_per_file_version(self, prompts_file):
+        """Test the in-process cache, the JSON cache and reparsing after an edit"""
+        parse = prompt_library._parse_yaml
+        with patch.object(prompt_library, "_parse_yaml", side_effect=parse) as parser:
+            # Given a first load that parses the YAML
+            first = load(prompts_file)
+            assert load(prompts_file) is first
+            assert parser.call_count == 1
+
+            # When a new process loads the same file version
+            prompt_library._loaded.clear()
+            again = load(prompts_file)
+
+            # Then the JSON cache is used
+            assert parser.call_count == 1
+            assert again.render("chat", topic="Bees") == first.render("chat", topic="Bees")
+
+            # When the file changes
+            Path(prompts_file).write_text(PROMPTS.replace("relaxed", "lively"), encoding="utf-8")
+            stat = os.stat(prompts_file)
+            os.utime(prompts_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+            # Then it is parsed again
+            assert "lively" in load(prompts_file).render("chat", topic="Bees")
+            assert parser.call_count == 2
+
+    def test_corrupt_cache_ignored(self, prompts_file, tmp_path):
+        """Test that an unreadable cache file falls back to parsing"""
+        (tmp_path / "cache.json").write_text("{not json", encoding="utf-8")
+        assert load(prompts_file).names() == ["chat", "rewrite"]
+
+
+class TestCommandLine:
+    """Test the single-call shell interface"""
+
+    def test_render_prints_prompt(self, prompts_file, capsys):
+        """Test that render prints only the filled prompt"""
+        code = prompt_library.main(["--prompts", prompts_file, "render", "chat", "-t", "Bees",
+                                    "--set", "tone=casual", "-d", "20"])
+        assert code == 0
+        assert capsys.readouterr().out == ('A 20-minute chat about "Bees" in a Relaxed, conversational, '
+                                           'friendly tone, 3200 words. {Note}\n')
+
+    def test_errors_go_to_stderr(self, prompts_file, capsys):
+        """Test that validation errors fail the call without printing a prompt"""
+        code = prompt_library.main(["--prompts", prompts_file, "render", "rewrite"])
+        captured = capsys.readouterr()
+        assert code == 1 and captured.out == ""
+        assert "original_script" in captured.err
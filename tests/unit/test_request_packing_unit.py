@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Unit tests for silence detection and request packing
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+from silence import find_silences
+from request_packing import PACK_SEPARATOR, plan_packs, split_packed_audio
+from gemini_tts import GeminiTTS
+
+RATE = 24000
+
+
+def tone(seconds: float, amplitude: int = 8000) -> bytes:
+    """16-bit sine tone at 440Hz"""
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * 440 * t)).astype("<i2").tobytes()
+
+
+def silence(seconds: float) -> bytes:
+    return bytes(int(seconds * RATE) * 2)
+
+
+def make_chunk(data: bytes) -> Mock:
+    """Build a mocked streaming chunk carrying inline audio"""
+    chunk = Mock()
+    chunk.candidates = [Mock()]
+    chunk.candidates[0].content.parts = [Mock()]
+    chunk.candidates[0].content.parts[0].inline_data.data = data
+    chunk.candidates[0].content.parts[0].inline_data.mime_type = "audio/L16;codec=pcm;rate=24000"
+    return chunk
+
+
+class TestFindSilences:
+    """Test windowed RMS silence detection"""
+
+    def test_detects_internal_gap(self):
+        """Test that a gap between tones is found at window resolution"""
+        # Given
+        pcm = tone(0.5) + silence(0.6) + tone(0.5)
+
+        # When
+        spans = find_silences(pcm, RATE, min_silence_seconds=0.2)
+
+        # Then
+        assert len(spans) == 1
+        start, end = spans[0]
+        assert abs(start - int(0.5 * RATE)) <= 240
+        assert abs(end - int(1.1 * RATE)) <= 240
+
+    def test_short_gaps_ignored(self):
+        """Test minimum silence duration"""
+        pcm = tone(0.3) + silence(0.05) + tone(0.3)
+        assert find_silences(pcm, RATE, min_silence_seconds=0.2) == []
+
+    def test_empty_input(self):
+        """Test that empty PCM has no silences"""
+        assert find_silences(b"", RATE) == []
+
+
+class TestPacking:
+    """Test pack planning and splitting"""
+
+    def test_plan_respects_item_and_char_limits(self):
+        """Test grouping by count and length"""
+        # Given
+        texts = ["short"] * 5 + ["x" * 200]
+
+        # When
+        packs = plan_packs(texts, max_items=3, max_chars=150)
+
+        # Then
+        assert packs == [[0, 1, 2], [3, 4], [5]]
+
+    def test_split_matches_item_count(self):
+        """Test that packed audio splits into one clip per item"""
+        # Given
+        pcm = tone(0.4) + silence(0.8) + tone(0.3) + silence(0.8) + tone(0.5)
+
+        # When
+        clips = split_packed_audio(pcm, 3, RATE)
+
+        # Then
+        assert clips is not None and len(clips) == 3
+        assert sum(len(c) for c in clips) == len(pcm)
+
+    def test_split_stereo_on_frame_boundaries(self):
+        """Test that stereo clips are cut at whole frames and each item keeps both channels"""
+        # Given
+        mono = tone(0.4) + silence(0.8) + tone(0.3) + silence(0.8) + tone(0.5)
+        samples = np.frombuffer(mono, dtype="<i2")
+        pcm = np.column_stack([samples, samples]).tobytes()
+
+        # When
+        clips = split_packed_audio(pcm, 3, RATE, num_channels=2)
+
+        # Then
+        assert clips is not None and len(clips) == 3
+        assert all(len(clip) % 4 == 0 for clip in clips)
+        mono_clips = split_packed_audio(mono, 3, RATE)
+        assert [len(clip) // 2 for clip in clips] == [len(clip) for clip in mono_clips]
+
+    def test_split_mismatch_returns_none(self):
+        """Test verification failure when a gap is missing"""
+        pcm = tone(0.4) + silence(0.8) + tone(0.5)
+        assert split_packed_audio(pcm, 3, RATE) is None
+
+
+class TestGeminiTTSBatch:
+    """Test packed batch generation in GeminiTTS"""
+
+    @pytest.fixture
+    def mock_service(self):
+        """Create service with mocked dependencies"""
+        with patch('gemini_tts.genai') as mock_genai, patch('gemini_tts.types') as mock_types:
+            mock_client = Mock()
+            mock_genai.Client.return_value = mock_client
+            service = GeminiTTS(api_key="test-key")
+            yield service, mock_client, mock_types
+
+    def test_packed_batch_uses_one_request(self, mock_service):
+        """Test that three texts are sent as one packed request"""
+        # Given
+        service, mock_client, mock_types = mock_service
+        packed = tone(0.3) + silence(0.8) + tone(0.3) + silence(0.8) + tone(0.3)
+        mock_client.models.generate_content_stream.return_value = [make_chunk(packed)]
+
+        # When
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files = service.generate_speech_batch(["One", "Two", "Three"], output_dir=tmpdir)
+            assert all(Path(f).exists() for f in files)
+
+        # Then
+        assert mock_client.models.generate_content_stream.call_count == 1
+        sent_text = mock_types.Part.from_text.call_args.kwargs['text']
+        assert sent_text == PACK_SEPARATOR.join(["One", "Two", "Three"])
+        assert [Path(f).name for f in files] == ["clip_0001.wav", "clip_0002.wav", "clip_0003.wav"]
+
+    def test_mismatched_split_falls_back_to_individual_requests(self, mock_service):
+        """Test verification fallback when the model merged two items"""
+        # Given
+        service, mock_client, _ = mock_service
+        mock_client.models.generate_content_stream.side_effect = [
+            [make_chunk(tone(0.6) + silence(0.8) + tone(0.3))],
+            [make_chunk(tone(0.3))],
+            [make_chunk(tone(0.3))],
+            [make_chunk(tone(0.3))],
+        ]
+
+        # When
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files = service.generate_speech_batch(["One", "Two", "Three"], output_dir=tmpdir)
+
+        # Then
+        assert mock_client.models.generate_content_stream.call_count == 4
+        assert len(files) == 3
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Unit tests for silence detection and trimming
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+from silence import detect_silence, trim_bounds, trim_silence
+from gemini_tts import GeminiTTS
+
+RATE = 24000
+
+
+def tone(seconds: float, amplitude: int = 8000) -> bytes:
+    """16-bit sine tone at 440Hz"""
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * 440 * t)).astype("<i2").tobytes()
+
+
+def silence(seconds: float) -> bytes:
+    return bytes(int(seconds * RATE) * 2)
+
+
+class TestDetectSilence:
+    """Test head/tail measurement and internal gap reporting"""
+
+    def test_head_tail_and_internal_spans(self):
+        """Test a clip with padding and one internal gap"""
+        # Given
+        pcm = silence(0.3) + tone(0.5) + silence(0.4) + tone(0.5) + silence(0.2)
+
+        # When
+        report = detect_silence(pcm, RATE, min_silence_seconds=0.2)
+
+        # Then
+        assert report.total_frames == len(pcm) // 2
+        assert report.head_frames == pytest.approx(0.3 * RATE, abs=240)
+        assert report.tail_frames == pytest.approx(0.2 * RATE, abs=240)
+        assert len(report.internal) == 1
+        gap_start, gap_end = report.internal[0]
+        assert gap_end - gap_start == pytest.approx(0.4 * RATE, abs=480)
+
+    def test_all_silent_clip(self):
+        """Test that pure silence is reported as silent"""
+        report = detect_silence(silence(0.5), RATE)
+        assert report.is_silent
+        assert report.internal == []
+
+
+class TestTrimSilence:
+    """Test trimming of leading and trailing silence"""
+
+    def test_trim_keeps_padding(self):
+        """Test trimmed length is speech plus keep_seconds on each side"""
+        # Given
+        pcm = silence(0.5) + tone(1.0) + silence(0.7)
+
+        # When
+        trimmed = trim_silence(pcm, RATE, keep_seconds=0.05)
+
+        # Then
+        assert len(trimmed) // 2 == pytest.approx(1.1 * RATE, abs=480)
+
+    def test_silent_clip_trims_to_empty(self):
+        """Test that a silent clip becomes empty"""
+        assert trim_silence(silence(0.3), RATE) == b""
+
+    def test_scan_limited_bounds_match_full_scan(self):
+        """Test that scanning only the ends finds the same bounds on a long clip"""
+        # Given
+        pcm = silence(0.4) + tone(3.0) + silence(0.6)
+
+        # When
+        full = trim_bounds(pcm, RATE, keep_seconds=0.05)
+        scanned = trim_bounds(pcm, RATE, keep_seconds=0.05, scan_seconds=1.0)
+
+        # Then
+        assert scanned == full
+        assert full[0] == pytest.approx(0.35 * RATE, abs=480)
+
+    def test_many_clips_per_second(self):
+        """Test throughput on short clips"""
+        import time
+
+        # Given
+        clip = silence(0.2) + tone(1.0) + silence(0.3)
+
+        # When
+        start = time.perf_counter()
+        for _ in range(200):
+            trim_silence(clip, RATE)
+        elapsed = time.perf_counter() - start
+
+        # Then - well above a thousand clips per second on any CI runner
+        assert elapsed < 1.0
+
+
+class TestSaveAudioFileTrimming:
+    """Test trimming as a post-stage of GeminiTTS.save_audio_file"""
+
+    def test_trim_applied_before_wav_header(self):
+        """Test that raw PCM is trimmed when saving"""
+        # Given
+        with patch('gemini_tts.genai'):
+            service = GeminiTTS(api_key="test-key", trim_silence=True)
+        pcm = silence(0.5) + tone(0.5) + silence(0.5)
+
+        # When
+        with tempfile.TemporaryDirectory() as tmpdir:
+            saved = service.save_audio_file(str(Path(tmpdir) / "clip"), pcm,
+                                            "audio/L16;codec=pcm;rate=24000")
+            size = Path(saved).stat().st_size
+
+        # Then
+        assert saved.endswith(".wav")
+        assert size - 44 == pytest.approx(0.6 * RATE * 2, abs=960)
+
+    def test_trim_disabled_by_default(self):
+        """Test that saving leaves audio untouched by default"""
+        # Given
+        with patch('gemini_tts.genai'):
+            service = GeminiTTS(api_key="test-key", trim_silence=False)
+        pcm = silence(0.5) + tone(0.5)
+
+        # When
+        with tempfile.TemporaryDirectory() as tmpdir:
+            saved = service.save_audio_file(str(Path(tmpdir) / "clip"), pcm,
+                                            "audio/L16;codec=pcm;rate=24000")
+            size = Path(saved).stat().st_size
+
+        # Then
+        assert size == 44 + len(pcm)
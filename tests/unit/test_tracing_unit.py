@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Unit tests for pipeline span tracing (tracing.py and trace.sh)
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Import the system under test
+SCRIPTS_DIR = Path(__file__).parent.parent.parent / "scripts"
+sys.path.append(str(SCRIPTS_DIR))
+import tracing
+from gemini_standin import GeminiStandIn, StandInConfig
+from gemini_tts import GeminiTTS
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv(tracing.TRACE_FILE_ENV, str(path))
+    monkeypatch.setenv(tracing.TRACE_ID_ENV, "t" * 32)
+    monkeypatch.delenv(tracing.TRACE_PARENT_ENV, raising=False)
+    return path
+
+
+class TestPythonSpans:
+    """Test spans recorded from Python"""
+
+    def test_disabled_without_trace_file(self, monkeypatch):
+        """Test that span() is a no-op when PODCAST_TRACE_FILE is unset"""
+        # Given
+        monkeypatch.delenv(tracing.TRACE_FILE_ENV, raising=False)
+
+        # When
+        with tracing.span("work") as span_id:
+            pass
+
+        # Then
+        assert span_id is None
+        assert not tracing.enabled()
+
+    def test_nested_spans_link_parents(self, trace_file):
+        """Test nesting, the env parent for child processes and its restoration"""
+        # Given / When
+        with tracing.span("outer") as outer:
+            with tracing.span("inner") as inner:
+                assert tracing.current_parent() == inner
+                assert os.environ[tracing.TRACE_PARENT_ENV] == inner
+        spans = {s["name"]: s for s in tracing.load_spans(str(trace_file))}
+
+        # Then
+        assert spans["inner"]["parent_id"] == outer
+        assert spans["outer"]["parent_id"] is None
+        assert spans["outer"]["trace_id"] == "t" * 32
+        assert spans["outer"]["start"] <= spans["inner"]["start"] <= spans["inner"]["end"] <= spans["outer"]["end"]
+        assert tracing.TRACE_PARENT_ENV not in os.environ
+
+    def test_error_status_is_recorded(self, trace_file):
+        """Test that an exception marks the span as failed and propagates"""
+        # When
+        with pytest.raises(ValueError):
+            with tracing.span("broken"):
+                raise ValueError("boom")
+
+        # Then
+        span, = tracing.load_spans(str(trace_file))
+        assert span["status"] == "error"
+
+    def test_tts_requests_become_spans(self, trace_file):
+        """Test that GeminiTTS records each request under the current span"""
+        # Given
+        config = StandInConfig(ttfc_seconds=0.01, bytes_per_second=1e9)
+        with GeminiStandIn(config) as server:
+            tts = GeminiTTS(api_key="test-key", backend="rest")
+            tts.api.base_url = server.url
+
+            # When
+            with tracing.span("job") as job:
+                b"".join(tts.stream_speech("Hello there"))
+
+        # Then
+        spans = {s["name"]: s for s in tracing.load_spans(str(trace_file))}
+        request = spans["gemini_tts.request"]
+        assert request["parent_id"] == job
+        assert request["attributes"]["backend"] == "rest"
+        assert request["attributes"]["bytes"] > 0
+
+
+class TestBashSpans:
+    """Test the trace.sh helpers and cross-process propagation"""
+
+    def test_bash_and_python_spans_share_a_trace(self, trace_file):
+        """Test that a Python child inherits the trace id and the bash parent"""
+        # Given
+        script = f"""
+            source {SCRIPTS_DIR / 'trace.sh'}
+            trace_init
+            trace_span_start root
+            trace_span py {sys.executable} -c "
+import sys; sys.path.insert(0, '{SCRIPTS_DIR}')
+import tracing
+with tracing.span('child'):
+    pass
+"
+            trace_span failing false || true
+            trace_finish 0
+        """
+
+        # When
+        subprocess.run(["bash", "-c", script], check=True)
+        spans = {s["name"]: s for s in tracing.load_spans(str(trace_file))}
+
+        # Then
+        assert {s["trace_id"] for s in spans.values()} == {"t" * 32}
+        assert spans["root"]["parent_id"] is None
+        assert spans["py"]["parent_id"] == spans["root"]["span_id"]
+        assert spans["child"]["parent_id"] == spans["py"]["span_id"]
+        assert spans["child"]["source"] == "python"
+        assert spans["failing"]["status"] == "error"
+        assert spans["failing"]["exit_code"] == 1
+        assert spans["root"]["end"] >= spans["failing"]["end"]
+
+
+class TestWaterfall:
+    """Test trace summaries and the waterfall view"""
+
+    def test_waterfall_orders_and_indents(self):
+        """Test tree layout, offsets and error marks"""
+        # Given
+        spans = [
+            {"trace_id": "a", "span_id": "2", "parent_id": "1", "name": "tts", "start": 101.0, "end": 104.0, "status": "error"},
+            {"trace_id": "a", "span_id": "1", "parent_id": None, "name": "pipeline", "start": 100.0, "end": 104.0, "status": "ok"},
+            {"trace_id": "a", "span_id": "3", "parent_id": "1", "name": "script", "start": 100.0, "end": 101.0, "status": "ok"},
+        ]
+
+        # When
+        lines = tracing.format_waterfall(spans, width=8).splitlines()
+
+        # Then
+        assert lines[0] == "Trace a: 3 spans, 4.00s"
+        assert lines[2].startswith("pipeline") and "|████████|" in lines[2]
+        assert lines[3].startswith("  script") and "|██      |" in lines[3]
+        assert lines[4].startswith("  tts") and "1.000s" in lines[4] and lines[4].endswith("✗")
+
+    def test_list_traces_summarizes(self):
+        """Test one summary per trace with its root and error count"""
+        # Given
+        spans = [
+            {"trace_id": "b", "span_id": "1", "parent_id": None, "name": "late", "start": 5.0, "end": 6.0},
+            {"trace_id": "a", "span_id": "2", "parent_id": None, "name": "early", "start": 1.0, "end": 2.0},
+            {"trace_id": "a", "span_id": "3", "parent_id": "2", "name": "x", "start": 1.5, "end": 3.0, "status": "error"},
+        ]
+
+        # When
+        traces = tracing.list_traces(spans)
+
+        # Then
+        assert [t["trace_id"] for t in traces] == ["a", "b"]
+        assert traces[0]["root"] == "early"
+        assert traces[0]["spans"] == 2 and traces[0]["errors"] == 1
+        assert traces[0]["end"] == 3.0
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Unit tests for TTS record-and-replay cassettes
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+from gemini_api import GeminiAPIError
+from gemini_standin import GeminiStandIn, StandInConfig
+from gemini_tts import GeminiTTS, SpeechRequest
+from tts_cassette import CassetteMiss, CassettePlayer, CassetteRecorder
+
+
+def timed_chunks(*chunks, delay=0.05, error=None):
+    """Yield (data, mime) pairs with a fixed gap, optionally failing at the end"""
+    for data in chunks:
+        time.sleep(delay)
+        yield data, "audio/L16;codec=pcm;rate=24000"
+    if error:
+        raise error
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    return str(tmp_path / "session.cassette")
+
+
+class TestRecordAndReplay:
+    """Test cassette round trips"""
+
+    def test_chunks_and_mime_round_trip(self, cassette):
+        """Test that replay yields the recorded payloads in order"""
+        # Given
+        request = SpeechRequest(voice_name="Puck", temperature=0.5)
+        recorder = CassetteRecorder(cassette)
+        passed = list(recorder.record("tts", "Hello", request, timed_chunks(b"ab", b"cd", delay=0)))
+
+        # When
+        with CassettePlayer(cassette, time_scale=0) as player:
+            replayed = list(player.play("tts", "Hello", request))
+
+        # Then
+        assert replayed == passed == [(b"ab", "audio/L16;codec=pcm;rate=24000"),
+                                      (b"cd", "audio/L16;codec=pcm;rate=24000")]
+
+    def test_replay_keeps_recorded_pacing(self, cassette):
+        """Test real-time and scaled replay of inter-chunk gaps"""
+        # Given
+        request = SpeechRequest(voice_name="Puck")
+        list(CassetteRecorder(cassette).record("tts", "Hi", request,
+                                               timed_chunks(b"a", b"b", b"c", delay=0.05)))
+
+        def replay_seconds(scale):
+            with CassettePlayer(cassette, time_scale=scale) as player:
+                start = time.monotonic()
+                list(player.play("tts", "Hi", request))
+                return time.monotonic() - start
+
+        # When / Then
+        assert replay_seconds(1.0) >= 0.15
+        assert replay_seconds(0) < 0.05
+
+    def test_recorded_errors_are_replayed(self, cassette):
+        """Test that API failures replay with their status code"""
+        # Given
+        request = SpeechRequest(voice_name="Puck")
+        chunks = timed_chunks(b"a", delay=0, error=GeminiAPIError("quota", status_code=429))
+        with pytest.raises(GeminiAPIError):
+            list(CassetteRecorder(cassette).record("tts", "Hi", request, chunks))
+
+        # When / Then
+        with CassettePlayer(cassette, time_scale=0) as player:
+            with pytest.raises(GeminiAPIError) as exc_info:
+                list(player.play("tts", "Hi", request))
+        assert exc_info.value.status_code == 429
+
+    def test_unknown_request_is_a_miss(self, cassette):
+        """Test that requests differing in any field are not matched"""
+        # Given
+        list(CassetteRecorder(cassette).record("tts", "Hi", SpeechRequest(voice_name="Puck"),
+                                               timed_chunks(b"a", delay=0)))
+
+        # When / Then
+        with CassettePlayer(cassette, time_scale=0) as player:
+            with pytest.raises(CassetteMiss):
+                list(player.play("tts", "Hi", SpeechRequest(voice_name="Kore")))
+
+    def test_abandoned_stream_is_not_recorded(self, cassette):
+        """Test that a consumer stopping early leaves no partial recording"""
+        # Given
+        stream = CassetteRecorder(cassette).record("tts", "Hi", SpeechRequest(),
+                                                   timed_chunks(b"a", b"b", delay=0))
+
+        # When
+        next(stream)
+        stream.close()
+
+        # Then
+        with CassettePlayer(cassette) as player:
+            assert len(player) == 0
+
+
+class TestGeminiTTSCassettes:
+    """Test recording and replay through GeminiTTS"""
+
+    def test_record_live_then_replay_offline(self, cassette, tmp_path):
+        """Test that a replayed session produces the same audio without an API"""
+        # Given
+        config = StandInConfig(ttfc_seconds=0.0, bytes_per_second=1e9)
+        with GeminiStandIn(config) as server:
+            live = GeminiTTS(api_key="test-key", backend="rest", record=cassette)
+            live.api.base_url = server.url
+            recorded = live.generate_speech("Recorded line", output_file=str(tmp_path / "live"))
+
+        # When
+        replay = GeminiTTS(api_key=None, backend="replay", cassette=cassette, replay_time_scale=0)
+        replayed = replay.generate_speech("Recorded line", output_file=str(tmp_path / "replay"))
+
+        # Then
+        assert Path(replayed).read_bytes() == Path(recorded).read_bytes()
+
+    def test_replay_requires_cassette(self, monkeypatch):
+        """Test a clear error when no cassette is configured"""
+        monkeypatch.delenv("GEMINI_TTS_CASSETTE", raising=False)
+        with pytest.raises(ValueError, match="cassette"):
+            GeminiTTS(backend="replay")
+
+    def test_close_releases_cassette(self, cassette):
+        """Test that closing the client closes the cassette it replays from"""
+        # Given
+        CassetteRecorder(cassette)
+
+        # When
+        with GeminiTTS(api_key=None, backend="replay", cassette=cassette) as tts:
+            fd = tts.player.fd
+
+        # Then
+        assert tts.player is None
+        with pytest.raises(OSError):
+            os.fstat(fd)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Unit tests for structured logging and the result channel
+"""
+
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Import the system under test
+SCRIPTS_DIR = Path(__file__).parent.parent.parent / "scripts"
+sys.path.append(str(SCRIPTS_DIR))
+import tts_logging
+from gemini_standin import GeminiStandIn, StandInConfig
+from gemini_tts import GeminiTTS
+from tts_logging import configure_logging, emit_result, get_logger, log_context, read_results
+from wav_io import build_wav_header
+
+
+@pytest.fixture
+def log_stream(monkeypatch):
+    monkeypatch.delenv("PODCAST_TRACE_ID", raising=False)
+    stream = io.StringIO()
+    yield stream
+    configure_logging(level="info", fmt="text")
+
+
+class TestStructuredLogging:
+    """Test levels, formats and context fields"""
+
+    def test_json_records_carry_context_and_fields(self, log_stream):
+        """Test that bound context and extra fields reach the JSON record"""
+        # Given
+        configure_logging(level="info", fmt="json", stream=log_stream)
+        logger = get_logger("test")
+
+        # When
+        with log_context(job="job-1", voice="Puck"):
+            with log_context(clip=3):
+                logger.info("saved %s", "a.wav", extra={"output": "a.wav"})
+        logger.info("outside")
+
+        # Then
+        inside, outside = [json.loads(line) for line in log_stream.getvalue().splitlines()]
+        assert inside["msg"] == "saved a.wav"
+        assert inside["level"] == "info" and inside["logger"] == "gemini_tts.test"
+        assert (inside["job"], inside["voice"], inside["clip"], inside["output"]) == ("job-1", "Puck", 3, "a.wav")
+        assert "job" not in outside
+
+    def test_trace_id_is_added(self, log_stream, monkeypatch):
+        """Test that the pipeline trace id joins every record"""
+        # Given
+        monkeypatch.setenv("PODCAST_TRACE_ID", "abc123")
+        configure_logging(fmt="json", stream=log_stream)
+
+        # When
+        get_logger("test").warning("careful")
+
+        # Then
+        assert json.loads(log_stream.getvalue())["trace_id"] == "abc123"
+
+    def test_levels_and_quiet(self, log_stream):
+        """Test level filtering and that quiet drops even errors"""
+        # Given
+        logger = get_logger("test")
+
+        # When
+        configure_logging(level="warning", stream=log_stream)
+        logger.info("hidden")
+        logger.warning("shown")
+        configure_logging(level="quiet", stream=log_stream)
+        logger.error("also hidden")
+
+        # Then
+        assert log_stream.getvalue() == "shown\n"
+        assert tts_logging.is_quiet()
+
+    def test_invalid_settings_rejected(self):
+        """Test that unknown levels and formats raise"""
+        with pytest.raises(ValueError):
+            configure_logging(level="loud")
+        with pytest.raises(ValueError):
+            configure_logging(fmt="xml")
+
+    def test_tts_logs_saved_file(self, log_stream, tmp_path):
+        """Test that GeminiTTS reports saved files as structured records"""
+        # Given
+        configure_logging(level="info", fmt="json", stream=log_stream)
+        with GeminiStandIn(StandInConfig(ttfc_seconds=0.01, bytes_per_second=1e9)) as server:
+            tts = GeminiTTS(api_key="test-key", backend="rest")
+            tts.api.base_url = server.url
+
+            # When
+            with log_context(job="j7"):
+                saved = tts.generate_speech("Hello there", voice_name="Puck",
+                                            output_file=str(tmp_path / "hello"))
+
+        # Then
+        record = json.loads(log_stream.getvalue().splitlines()[-1])
+        assert record["output"] == saved
+        assert record["voice"] == "Puck" and record["job"] == "j7"
+
+
+class TestResultChannel:
+    """Test result records for wrappers"""
+
+    def test_emit_result_without_file_is_noop(self, monkeypatch):
+        """Test that nothing is written unless a result file is configured"""
+        monkeypatch.delenv(tts_logging.RESULT_FILE_ENV, raising=False)
+        assert emit_result("success", output="x.wav") is None
+
+    def test_emit_and_read_back(self, tmp_path, monkeypatch):
+        """Test appending records and reading a field of the last one"""
+        # Given
+        path = tmp_path / "result.jsonl"
+        monkeypatch.setenv(tts_logging.RESULT_FILE_ENV, str(path))
+        monkeypatch.delenv("PODCAST_TRACE_ID", raising=False)
+
+        # When
+        emit_result("failure", error="boom")
+        with log_context(job="j1"):
+            emit_result("success", output="final.wav")
+
+        # Then
+        first, last = read_results(str(path))
+        assert first["status"] == "failure" and first["error"] == "boom"
+        assert last == {**last, "status": "success", "output": "final.wav", "job": "j1"}
+        result = subprocess.run([sys.executable, str(SCRIPTS_DIR / "tts_logging.py"), str(path), "output"],
+                                capture_output=True, text=True)
+        assert result.returncode == 0 and result.stdout == "final.wav\n"
+
+    def test_quiet_cli_writes_only_the_result(self, tmp_path):
+        """Test that -q prints nothing while the result file records the outcome"""
+        # Given
+        segment = tmp_path / "a.wav"
+        segment.write_bytes(build_wav_header(4800) + b"\x00" * 4800)
+        results = tmp_path / "results.jsonl"
+
+        # When
+        ok = subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / "podcast_cli.py"), "-q", "--result-file", str(results),
+             "--job-id", "batch-42", "concat", str(tmp_path / "out.wav"), str(segment)],
+            capture_output=True, text=True)
+        failed = subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / "podcast_cli.py"), "-q", "--result-file", str(results),
+             "concat", str(tmp_path / "bad.wav"), str(tmp_path / "missing.wav")],
+            capture_output=True, text=True)
+
+        # Then
+        assert (ok.returncode, ok.stdout, ok.stderr) == (0, "", "")
+        assert (failed.returncode, failed.stdout, failed.stderr) == (1, "", "")
+        success, failure = read_results(str(results))
+        assert success["status"] == "success" and success["job"] == "batch-42"
+        assert success["command"] == "concat" and success["output"] == str(tmp_path / "out.wav")
+        assert failure["status"] == "failure" and failure["error"]
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Prometheus metrics exporter
+"""
+
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+from gemini_api import GeminiAPIError, speech_payload_template
+from gemini_standin import GeminiStandIn, StandInConfig
+from gemini_tts import GeminiTTS
+from tts_metrics import TTSMetrics, parse_samples, serve_metrics
+
+CONFIG = StandInConfig(ttfc_seconds=0.0, bytes_per_second=1e9)
+
+
+def sample(text, name, **labels):
+    return parse_samples(text).get((name, tuple(sorted(labels.items()))))
+
+
+@pytest.fixture
+def server():
+    with GeminiStandIn(CONFIG) as standin:
+        yield standin
+
+
+def make_tts(server, metrics):
+    tts = GeminiTTS(api_key="test-key", backend="rest")
+    tts.api.base_url = server.url
+    tts.enable_metrics(metrics)
+    return tts
+
+
+class TestTTSMetrics:
+    """Test metrics fed by GeminiTTS"""
+
+    def test_successful_requests(self, server):
+        """Test request, byte, audio-seconds and histogram series"""
+        # Given
+        metrics = TTSMetrics()
+        tts = make_tts(server, metrics)
+
+        # When
+        for _ in range(2):
+            b"".join(tts.stream_speech("x" * 15))
+        text = metrics.render()
+
+        # Then
+        assert "# TYPE gemini_tts_request_duration_seconds histogram" in text
+        assert sample(text, "gemini_tts_requests_total", backend="rest", model=tts.model) == 2
+        assert sample(text, "gemini_tts_audio_seconds_total", backend="rest") == pytest.approx(2.0)
+        assert sample(text, "gemini_tts_request_duration_seconds_count", backend="rest") == 2
+        assert sample(text, "gemini_tts_request_duration_seconds_bucket", backend="rest", le="+Inf") == 2
+        assert sample(text, "gemini_tts_in_flight_requests") == 0
+
+    def test_errors_by_class(self):
+        """Test that failures are counted by exception class"""
+        metrics = TTSMetrics()
+        with GeminiStandIn(CONFIG._replace(rate_limit_rate=1.0)) as standin:
+            tts = make_tts(standin, metrics)
+            with pytest.raises(GeminiAPIError):
+                list(tts.stream_speech("Hello"))
+        assert sample(metrics.render(), "gemini_tts_errors_total",
+                      backend="rest", error="GeminiAPIError") == 1
+
+    def test_in_flight_gauge_while_streaming(self, server):
+        metrics = TTSMetrics()
+        tts = make_tts(server, metrics)
+        stream = tts.stream_speech("Hello there")
+        next(stream)
+        assert sample(metrics.render(), "gemini_tts_in_flight_requests") == 1
+        stream.close()
+        assert sample(metrics.render(), "gemini_tts_in_flight_requests") == 0
+
+
+    def test_request_config_cache_hits(self, server):
+        """Test that the per-voice request cache reports a miss, then hits"""
+        # Given
+        metrics = TTSMetrics()
+        tts = make_tts(server, metrics)
+        speech_payload_template.cache_clear()
+
+        # When
+        for _ in range(3):
+            b"".join(tts.stream_speech("Hello", voice_name="Kore"))
+        text = metrics.render()
+
+        # Then
+        assert sample(text, "gemini_tts_cache_misses_total", cache="rest_payload") == 1
+        assert sample(text, "gemini_tts_cache_hits_total", cache="rest_payload") == 2
+
+
+    def test_sdk_config_cache_hits(self):
+        """Test that the SDK request-config cache reports per voice setup"""
+        # Given an SDK client that returns one audio chunk per request
+        metrics = TTSMetrics()
+        tts = GeminiTTS(api_key="test-key", backend="sdk")
+        inline_data = SimpleNamespace(data=b"\0\0", mime_type="audio/L16;rate=24000")
+        chunk = SimpleNamespace(candidates=[SimpleNamespace(
+            content=SimpleNamespace(parts=[SimpleNamespace(inline_data=inline_data)]))])
+        tts.client = SimpleNamespace(models=SimpleNamespace(generate_content_stream=lambda **kw: [chunk]))
+        tts.enable_metrics(metrics)
+
+        # When
+        for voice in ("Kore", "Kore", "Puck"):
+            b"".join(tts.stream_speech("Hello", voice_name=voice))
+        text = metrics.render()
+
+        # Then
+        assert sample(text, "gemini_tts_cache_misses_total", cache="sdk_config") == 2
+        assert sample(text, "gemini_tts_cache_hits_total", cache="sdk_config") == 1
+
+
+class TestExport:
+    """Test textfile and HTTP exposition"""
+
+    def test_textfile_accumulates_across_processes(self, tmp_path):
+        """Test that separate metric sets add up in one textfile"""
+        # Given
+        path = str(tmp_path / "gemini_tts.prom")
+        first, second = TTSMetrics(textfile=path), TTSMetrics(textfile=path)
+
+        # When
+        first.retry("tts-manager")
+        first.retry("tts-manager")
+        second.retry("tts-manager")
+        first.flush()
+        second.flush()
+
+        # Then
+        text = Path(path).read_text()
+        assert sample(text, "gemini_tts_retries_total", source="tts-manager") == 3
+
+    def test_textfile_flushed_on_a_timer(self, tmp_path):
+        """Test that requests leave the file alone until the flush timer fires"""
+        # Given
+        path = tmp_path / "gemini_tts.prom"
+        metrics = TTSMetrics(textfile=str(path))
+
+        # When
+        metrics.retry("tts-manager")
+        written_by_request = path.exists()
+        metrics.flush_periodically(0.01)
+        deadline = time.monotonic() + 5
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        metrics.close()
+
+        # Then
+        assert not written_by_request
+        assert sample(path.read_text(), "gemini_tts_retries_total", source="tts-manager") == 1
+
+    def test_metrics_endpoint(self):
+        """Test /metrics over HTTP"""
+        metrics = TTSMetrics()
+        metrics.cache_lookup("voices", hit=True)
+        httpd = serve_metrics(metrics, port=0)
+        try:
+            url = f"http://127.0.0.1:{httpd.server_address[1]}/metrics"
+            with urllib.request.urlopen(url) as response:
+                body = response.read().decode()
+                assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+        assert sample(body, "gemini_tts_cache_hits_total", cache="voices") == 1
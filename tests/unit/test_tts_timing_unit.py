@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Unit tests for per-request TTS timing instrumentation
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+from gemini_api import GeminiAPIError
+from gemini_standin import GeminiStandIn, StandInConfig
+from gemini_tts import GeminiTTS, SpeechRequest
+from tts_timing import RequestTiming, TimingStats, timing_log_line
+
+CONFIG = StandInConfig(ttfc_seconds=0.05, bytes_per_second=1e9, chunk_seconds=0.25)
+
+
+@pytest.fixture
+def tts():
+    with GeminiStandIn(CONFIG) as server:
+        service = GeminiTTS(api_key="test-key", backend="rest")
+        service.api.base_url = server.url
+        yield service
+
+
+class TestRequestTiming:
+    """Test timings reported through hooks"""
+
+    def test_hook_receives_stream_timings(self, tts):
+        """Test build time, TTFC, gaps, bytes and audio duration"""
+        # Given
+        timings = []
+        tts.add_timing_hook(timings.append)
+
+        # When
+        audio = b"".join(tts.stream_speech("x" * 30))
+
+        # Then
+        timing, = timings
+        assert timing.backend == "rest"
+        assert timing.chars == 30
+        assert 0 <= timing.build_seconds <= timing.ttfc_seconds
+        assert timing.ttfc_seconds >= 0.05
+        assert timing.chunks == 8 and len(timing.gaps) == 7
+        assert timing.bytes == len(audio)
+        assert timing.audio_seconds == pytest.approx(2.0)
+        assert timing.real_time_factor == pytest.approx(timing.total_seconds / 2.0)
+
+    def test_failed_request_is_reported(self):
+        """Test that errors reach hooks before propagating"""
+        # Given
+        stats = TimingStats()
+        with GeminiStandIn(CONFIG._replace(error_rate=1.0)) as server:
+            tts = GeminiTTS(api_key="test-key", backend="rest")
+            tts.api.base_url = server.url
+            tts.add_timing_hook(stats)
+
+            # When
+            with pytest.raises(GeminiAPIError):
+                list(tts.stream_speech("Hello"))
+
+        # Then
+        assert stats.summary()["errors"] == 1
+        assert stats.timings[0].error == "GeminiAPIError"
+
+    def test_broken_hook_does_not_break_synthesis(self, tts):
+        def broken(timing):
+            raise RuntimeError("sink down")
+
+        tts.add_timing_hook(broken)
+        assert b"".join(tts.stream_speech("Hello"))
+
+    def test_no_hooks_means_no_wrapping(self, tts):
+        """Test the disabled path returns the backend stream untouched"""
+        chunks = tts._stream_chunks("Hello", SpeechRequest(voice_name="Zephyr"))
+        assert chunks.__name__ == "_live_chunks"
+
+    def test_log_line_format(self):
+        timing = RequestTiming("m", "sdk", 10, 0.001, 0.2, 1.0, 2, (0.3,), 48000, 1.0)
+        line = timing_log_line(timing)
+        assert line.startswith("tts_timing model=m backend=sdk")
+        assert "ttfc_ms=200.0" in line and "max_gap_ms=300.0" in line and "rtf=1.000" in line
+
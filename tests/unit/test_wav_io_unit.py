@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Unit tests for memory-mapped WAV I/O
+"""
+
+import errno
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+# Import the system under test
+sys.path.append(str(Path(__file__).parent.parent.parent / "scripts"))
+import wav_io
+from wav_io import MappedWav, WAV_HEADER_SIZE, build_wav_header, concat_wav, read_wav_info
+
+
+@pytest.fixture
+def wav_path():
+    """Path to a one-second 24kHz mono 16-bit WAV with a ramp signal"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "ramp.wav"
+        pcm = np.arange(24000, dtype="<i2").tobytes()
+        path.write_bytes(build_wav_header(len(pcm)) + pcm)
+        yield path
+
+
+class TestWavHeader:
+    """Test header building and parsing"""
+
+    def test_header_matches_canonical_layout(self):
+        """Test the 44-byte header fields"""
+        # When
+        header = build_wav_header(1000, sample_rate=16000, bits_per_sample=16, num_channels=2)
+
+        # Then
+        assert len(header) == WAV_HEADER_SIZE == 44
+        fields = struct.unpack("<4sI4s4sIHHIIHH4sI", header)
+        assert fields[0] == b"RIFF" and fields[1] == 1036
+        assert fields[6:11] == (2, 16000, 64000, 4, 16)
+        assert fields[12] == 1000
+
+    def test_info_from_header_alone(self, wav_path):
+        """Test duration and format reporting"""
+        # When
+        info = read_wav_info(wav_path)
+
+        # Then
+        assert (info.sample_rate, info.bits_per_sample, info.num_channels) == (24000, 16, 1)
+        assert info.data_offset == 44
+        assert info.data_size == 48000
+        assert info.duration == pytest.approx(1.0)
+
+    def test_extra_chunks_are_skipped(self):
+        """Test that LIST chunks before data are walked over"""
+        # Given
+        header = build_wav_header(4)
+        list_chunk = b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+        data = header[:36] + list_chunk + header[36:] + b"\x00\x01\x00\x02"
+
+        with tempfile.NamedTemporaryFile(suffix=".wav") as f:
+            f.write(data)
+            f.flush()
+
+            # When
+            info = read_wav_info(f.name)
+
+        # Then
+        assert info.data_offset == 36 + len(list_chunk) + 8
+        assert info.data_size == 4
+
+    def test_unset_data_size_read_from_file(self):
+        """Test that a streamed header with a zero data size covers the rest of the file"""
+        # Given
+        with tempfile.NamedTemporaryFile(suffix=".wav") as f:
+            f.write(build_wav_header(0) + b"\x00\x01" * 100)
+            f.flush()
+
+            # When
+            info = read_wav_info(f.name)
+
+        # Then
+        assert info.data_offset == 44
+        assert info.data_size == 200
+
+    def test_non_wav_rejected(self):
+        """Test that garbage input raises ValueError"""
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b"not a wav file at all")
+            f.flush()
+            with pytest.raises(ValueError, match="RIFF"):
+                read_wav_info(f.name)
+
+
+class TestMappedWav:
+    """Test mapped access, appending and header patching"""
+
+    def test_samples_are_a_view(self, wav_path):
+        """Test zero-copy NumPy view of the data chunk"""
+        # When
+        with MappedWav(wav_path) as wav:
+            samples = wav.samples
+
+            # Then
+            assert samples.shape == (24000,)
+            assert samples[100] == 100
+            assert not samples.flags.owndata
+            del samples
+
+    def test_append_patches_header_in_place(self, wav_path):
+        """Test appending PCM updates both RIFF and data sizes"""
+        # When
+        with MappedWav(wav_path, writable=True) as wav:
+            wav.append(b"\x01\x00" * 12000)
+            assert wav.duration == pytest.approx(1.5)
+
+        # Then
+        info = read_wav_info(wav_path)
+        raw = wav_path.read_bytes()
+        assert info.data_size == 72000
+        assert struct.unpack("<I", raw[4:8])[0] == 36 + 72000
+        assert len(raw) == 44 + 72000
+
+    def test_create_then_append(self):
+        """Test building a file incrementally from an empty header"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "new.wav"
+
+            # When
+            with MappedWav.create(path, sample_rate=8000) as wav:
+                wav.append(bytes(1600))
+                wav.append(bytes(1600))
+
+            # Then
+            assert read_wav_info(path).duration == pytest.approx(0.2)
+
+    def test_partial_frame_rejected(self, wav_path):
+        """Test that appends must be whole frames"""
+        with MappedWav(wav_path, writable=True) as wav:
+            with pytest.raises(ValueError, match="whole number of frames"):
+                wav.append(b"\x01")
+
+    def test_read_only_cannot_patch(self, wav_path):
+        """Test that read-only maps refuse writes"""
+        with MappedWav(wav_path) as wav:
+            with pytest.raises(PermissionError):
+                wav.patch_header()
+
+
+class TestConcatWav:
+    """Test zero-copy WAV concatenation"""
+
+    @pytest.fixture
+    def segments(self):
+        """Three short segments with distinct content"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for i in range(3):
+                path = Path(tmpdir) / f"seg_{i}.wav"
+                pcm = np.full(1000 * (i + 1), i + 1, dtype="<i2").tobytes()
+                path.write_bytes(build_wav_header(len(pcm)) + pcm)
+                paths.append(path)
+            yield Path(tmpdir), paths
+
+    @pytest.mark.parametrize("method", [None, "buffered", "sendfile", "copy_file_range"])
+    def test_concat_copies_data_chunks(self, segments, method):
+        """Test that every method produces the same combined file"""
+        # Given
+        tmpdir, paths = segments
+        if method in ("sendfile", "copy_file_range") and not hasattr(os, method):
+            pytest.skip(f"os.{method} not available")
+        output = tmpdir / "joined.wav"
+
+        # When
+        info = concat_wav(paths, output, method=method)
+
+        # Then
+        expected = b"".join(p.read_bytes()[44:] for p in paths)
+        assert info.data_size == len(expected)
+        assert output.read_bytes()[44:] == expected
+
+    def test_mismatched_format_rejected(self, segments):
+        """Test header validation before any data is copied"""
+        # Given
+        tmpdir, paths = segments
+        odd = tmpdir / "odd.wav"
+        odd.write_bytes(build_wav_header(4, sample_rate=44100) + bytes(4))
+
+        # When/Then
+        with pytest.raises(ValueError, match="odd.wav"):
+            concat_wav(paths + [odd], tmpdir / "joined.wav")
+
+    def test_buffered_fallback_when_kernel_copy_unsupported(self, segments):
+        """Test that unsupported kernel copies fall back transparently"""
+        # Given
+        tmpdir, paths = segments
+        unsupported = OSError(errno.EXDEV, "cross-device")
+
+        # When
+        with patch("os.copy_file_range", side_effect=unsupported, create=True), \
+                patch("os.sendfile", side_effect=unsupported, create=True):
+            info = concat_wav(paths, tmpdir / "joined.wav")
+
+        # Then
+        assert info.data_size == sum(2000 * (i + 1) for i in range(3))
+
+    @pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="os.copy_file_range not available")
+    def test_kernel_copy_failing_partway_resumes(self, tmp_path):
+        """Test that bytes copied before an unsupported error are not copied again"""
+        # Given a copy_file_range that moves 100 bytes and then fails
+        data = bytes(range(256)) * 8
+        source = tmp_path / "source.bin"
+        source.write_bytes(data)
+        real_copy = os.copy_file_range
+        calls = []
+
+        def copy_then_fail(src_fd, dst_fd, count, offset):
+            calls.append(count)
+            if len(calls) > 1:
+                raise OSError(errno.EXDEV, "cross-device")
+            return real_copy(src_fd, dst_fd, 100, offset)
+
+        # When
+        with open(source, "rb") as src, open(tmp_path / "out.bin", "wb") as dst, \
+                patch("os.copy_file_range", side_effect=copy_then_fail):
+            method = wav_io.copy_range(src.fileno(), dst.fileno(), 512, 1024)
+
+        # Then the next method picks up at byte 612
+        assert method != "copy_file_range"
+        assert (tmp_path / "out.bin").read_bytes() == data[512:1536]